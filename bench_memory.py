@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+파싱 결과 메모리 벤치마크 (tracemalloc, 합성 데이터)
+
+parse_marathon 결과를 dict 목록으로 들고 있을 때와 Marathon(__slots__) 목록으로 들고 있을 때의
+메모리 사용량을 레코드 수별로 비교한다. 앞 측정에서 만든 번역 캐시나 인터닝된 문자열이
+뒤 측정에서 빠지지 않도록, 방식마다 새 프로세스에서 같은 준비 과정을 거쳐 측정한다.
+
+    python bench_memory.py                  # 5천 / 10만 개
+    python bench_memory.py --sizes 5000
+"""
+
+import argparse
+import gc
+import multiprocessing
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from bench_parse import make_records, prepare_translations
+from crawl_global import parse_marathons
+from marathon_record import compact
+
+
+def measure(build: Callable[[], List]) -> int:
+    """build()가 만든 객체가 유지하는 메모리 (바이트)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def measure_fresh(size: int, slots: bool) -> Tuple[int, int]:
+    """새 프로세스에서 실행: 합성 레코드 size개 파싱 결과(slots면 Marathon 목록)의 메모리 → (바이트, 레코드 수)"""
+    records = make_records(size)
+    prepare_translations(records)
+    kept = []
+
+    def build():
+        parsed = parse_marathons(records, progress=False)
+        kept.append(len(parsed))
+        return compact(parsed) if slots else parsed
+
+    return measure(build), kept[0]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='파싱 결과 메모리 벤치마크')
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[5_000, 100_000])
+    args = arg_parser.parse_args()
+
+    print(f"{'레코드':>10} | {'dict':>10} | {'Marathon':>10} | {'절감':>6} | {'레코드당':>14}")
+    for size in args.sizes:
+        results = []
+        for slots in (False, True):
+            with multiprocessing.get_context('spawn').Pool(1) as pool:
+                results.append(pool.apply(measure_fresh, (size, slots)))
+        (dict_bytes, kept), (slots_bytes, _) = results
+        print(f"{size:>10,} | {dict_bytes / 2**20:>8.1f}MB | {slots_bytes / 2**20:>8.1f}MB | "
+              f"{1 - slots_bytes / dict_bytes:>5.0%} | "
+              f"{dict_bytes // kept:>5}B → {slots_bytes // kept:>4}B")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+해외 대회 파싱 벤치마크 (합성 데이터, 네트워크 사용 안 함)
+
+직렬 parse_marathons와 프로세스 풀 parse_marathons_parallel의 처리 시간을 레코드 수별로 비교한다.
+
+    python bench_parse.py                      # 5천 / 5만 / 50만 개
+    python bench_parse.py --sizes 5000 50000 --workers 4
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+import crawl_global
+from crawl_global import MarathonParser, parse_marathons, parse_marathons_parallel
+
+TAG_LABELS = ['city', 'coastal', 'scenic', 'flat', 'beginner-friendly', 'premium',
+              '1000-4999-participants', 'boston-marathon-qualifier', 'nature', 'fast']
+SURFACES = ['road', 'trail', 'mixed', 'track', '']
+DIFFICULTIES = ['easy', 'moderate', 'hard', '']
+
+
+def make_records(n: int, seed: int = 0) -> List[Dict]:
+    """worldsmarathons 검색 API 결과와 같은 모양의 합성 레코드 n개"""
+    rnd = random.Random(seed)
+    countries = list(MarathonParser.COUNTRY_CONTINENT_KR)
+    race_types = list(MarathonParser.RACE_TYPE_KR)
+    today = date.today()
+    records = []
+    for i in range(n):
+        race_date = today + timedelta(days=rnd.randint(-30, 700))
+        price = rnd.choice([0, rnd.randint(10, 300)])
+        records.append({
+            'id': f'bench-{i}',
+            'title': f'Bench Marathon {i}',
+            'dateNextRace': f'{race_date.isoformat()}T00:00:00',
+            'strDateNextRace': race_date.strftime('%d %b %Y'),
+            'strDateRangeNextRaceWeekDay': race_date.strftime('%a, %d %b %Y'),
+            'firstRaceDate': race_date.isoformat(),
+            'lastRaceDate': race_date.isoformat(),
+            'city': f'City {i % 2000}',
+            'country': rnd.choice(countries),
+            'countryCode': 'XX',
+            'startPoint': [rnd.uniform(-180, 180), rnd.uniform(-90, 90)],
+            'raceType': rnd.choice(race_types),
+            'distance': '42.195 km',
+            'uniqueDistances': ['42.195 km', '21.0975 km'],
+            'raceDistances': [{'distance': 42.195}, {'distance': 21.0975}],
+            'image': f'https://img.example/{i}.jpg',
+            'imageSmall': f'https://img.example/{i}_s.jpg',
+            'imageExtraSmall': '',
+            'minPrice': price,
+            'minPriceFormatted': f'€{price}' if price else '',
+            'surface': rnd.choice(SURFACES),
+            'courseDifficulty': rnd.choice(DIFFICULTIES),
+            'tags': [{'label': label} for label in rnd.sample(TAG_LABELS, 3)],
+            'rating': round(rnd.uniform(0, 5), 1),
+            'reviewsCount': rnd.randint(0, 200),
+            'selfLink': f'/marathon/bench-{i}',
+            'website': '',
+            'registerPossible': rnd.random() < 0.8,
+            'isSoldOut': rnd.random() < 0.1,
+            'isRaceDayPassed': False,
+            'earlyBirdDaysLeft': rnd.choice([None, 0, rnd.randint(1, 60)]),
+        })
+    return records
+
+
+def prepare_translations(records: List[Dict]):
+    """번역 API를 타지 않도록 도시명 번역을 캐시에 미리 채움 (저장소 사용 안 함)"""
+    MarathonParser.TRANSLATION_STORE_PATH = None
+    MarathonParser._store_loaded = False
+    MarathonParser.load_translation_store()
+    for city in crawl_global.collect_cities(records):
+        MarathonParser._translation_cache.setdefault(city, f'{city}(한)')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='해외 대회 파싱 벤치마크')
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[5_000, 50_000, 500_000])
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    arg_parser.add_argument('--chunk-size', type=int, default=crawl_global.PARSE_CHUNK_SIZE)
+    args = arg_parser.parse_args()
+
+    print(f"CPU {os.cpu_count()}개 | 프로세스 {args.workers}개 | 청크 {args.chunk_size}개")
+    print(f"{'레코드':>10} | {'직렬':>8} | {'병렬':>8} | {'배율':>6}")
+    for size in args.sizes:
+        records = make_records(size)
+        prepare_translations(records)
+
+        started = time.perf_counter()
+        serial = parse_marathons(records, progress=False)
+        serial_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        parallel = parse_marathons_parallel(records, workers=args.workers, chunk_size=args.chunk_size)
+        parallel_time = time.perf_counter() - started
+
+        assert parallel == serial, "병렬 파싱 결과가 직렬 결과와 다름"
+        print(f"{size:>10,} | {serial_time:>7.2f}s | {parallel_time:>7.2f}s | "
+              f"{serial_time / parallel_time:>5.2f}x")
+        del records, serial, parallel
+
+
+if __name__ == '__main__':
+    main()
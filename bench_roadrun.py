@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+마라톤온라인(roadrun.co.kr) 페이지 파싱 벤치마크 (네트워크 사용 안 함)
+
+기존 파서(html.parser 전체 트리 + 링크/행마다 트리 검색, 이 파일의 reference_*_html)와
+crawl_korea.parse_*_html(행 단위 캐시, 상세 행은 앞 두 td만, 미리 컴파일한 정규식)의 처리 시간을 비교하고,
+모든 페이지에서 두 파서 결과가 같은지 확인한다.
+--soup-parser lxml은 트리를 만드는 규칙이 html.parser와 달라서, 실제 페이지(--pages)로 결과가 같은지
+확인한 뒤에만 크롤러에서 사용한다.
+
+- 기본: 목록/상세 페이지 구조(너비 18/19/30% 칸, color="#990000" 종목, 라벨/값 행, 바깥 레이아웃 표)를
+  흉내 낸 합성 EUC-KR 페이지
+- --pages: 저장해 둔 실제 페이지 디렉터리 (list.html = list.php, view_<번호>.html = view.php?no=<번호>)
+
+    python bench_roadrun.py                       # 합성 목록 300개 대회 + 상세 300개
+    python bench_roadrun.py --events 1000
+    python bench_roadrun.py --pages fixtures/roadrun
+    python bench_roadrun.py --pages fixtures/roadrun --soup-parser lxml   # pip install lxml
+"""
+
+import argparse
+import gc
+import glob
+import os
+import random
+import re
+import time
+from typing import Callable, List, Tuple
+
+from bs4 import BeautifulSoup
+
+import crawl_korea
+from crawl_korea import parse_detail_html, parse_list_html
+
+TITLES = ['제{}회 서울 국제 마라톤', '{} 해맞이 &amp; 달리기', '부산 바다 하프마라톤 {}', '']
+DISTANCES = ['풀,하프,10km,5km', '10km,5km', '하프,10km,3km', '울트라 100km', '']
+LOCATIONS = ['서울 여의도공원', '부산 광안리', '춘천 공지천', '대구 스타디움 &nbsp;앞']
+ORGANIZERS = ['서울마라톤클럽', '2026 춘천 조직위원회', '(사)한국마라톤협회 &amp; 러닝', '대구시체육회', '']
+DESCRIPTIONS = [
+    '참가비 : 풀코스 50,000원 / 하프 40,000원<br>기념품: 티셔츠 &amp; 메달<br><br>문의 &lt;사무국&gt;',
+    '<p>대회 안내</p><b>접수</b> 선착순 2,000명<br/>참가비&nbsp;30,000 원<!-- 수정 -->',
+    '상금 총 10,000,000원<br>\n  &nbsp;참가 기념품 제공 <a href="http://x.kr">자세히</a>',
+    '시상: 1위 트로피<br clear="all">기록증 발급 5000원<script>var n = "<b>";</script>',
+    '',
+]
+
+
+def _layout(body: str, title: str) -> str:
+    """바깥 레이아웃 (상단 메뉴, 왼쪽 메뉴, 스크립트, 푸터 표)"""
+    menu = ''.join(f'<td><a href="/menu{i}.php"><img src="/img/menu{i}.gif"></a></td>' for i in range(12))
+    side = ''.join(f"<tr><td><a href='/side{i}.php'>메뉴 {i}</a></td></tr>" for i in range(30))
+    return (f'<html><head><meta http-equiv="Content-Type" content="text/html; charset=euc-kr">'
+            f'<title>{title}</title><script>function pop(u){{window.open(u,"p","width=400");}}</script></head>'
+            f'<body><table width="100%"><tr>{menu}</tr></table>'
+            f'<table width="900"><tr><td width="170" valign="top"><table>{side}</table></td>'
+            f'<td valign="top">{body}</td></tr></table>'
+            f'<table width="100%"><tr><td align=center>Copyright &copy; 마라톤온라인</td></tr></table></body></html>')
+
+
+def make_events(n: int, seed: int = 0) -> List[dict]:
+    """합성 대회 n개 (일부는 제목 없음 / 종목 없음 / 홈페이지 없음 / 썸네일 링크 먼저)"""
+    rnd = random.Random(seed)
+    return [{
+        'no': 40000 + i, 'month': rnd.randint(1, 12), 'day': rnd.randint(1, 28), 'weekday': rnd.choice('월화수목금토일'),
+        'title': rnd.choice(TITLES).format(i), 'distances': rnd.choice(DISTANCES),
+        'location': rnd.choice(LOCATIONS), 'organizer': rnd.choice(ORGANIZERS),
+        'phone': rnd.choice(['010-1234-5678', '02-555-1234', '']),
+        'website': rnd.choice([f'http://www.run{i}.co.kr', f'https://race{i}.kr/main', '']),
+        'thumbnail': rnd.random() < 0.1, 'description': rnd.choice(DESCRIPTIONS),
+    } for i in range(n)]
+
+
+def make_list_page(events: List[dict]) -> bytes:
+    """목록 페이지 (list.php 구조)"""
+    rows = []
+    for ev in events:
+        link = f'view.php?no={ev["no"]}'
+        thumbnail = f'<a href="{link}"><img src="/img/thumb.gif"></a>' if ev['thumbnail'] else ''
+        distances = f'<br><font size="2" color="#990000">{ev["distances"]}</font>' if ev['distances'] else ''
+        phone = f'<br>☎{ev["phone"]}' if ev['phone'] else ''
+        home = f' <a href="{ev["website"]}" target="_new"><img src="/img/home.gif"></a>' if ev['website'] else ''
+        rows.append(
+            f'<tr bgcolor="#FFFFFF">\n'
+            f' <td width="18%" align="center"><font size="2"><b>{ev["month"]}/{ev["day"]}</b><br>'
+            f'<font color="#666666">({ev["weekday"]})</font></font></td>\n'
+            f' <td width="33%">{thumbnail}<font size="3"><a href="{link}"><b>{ev["title"]}</b></a></font>{distances}</td>\n'
+            f' <td width="19%" align="center"><font size="2">{ev["location"]}</font></td>\n'
+            f' <td width="30%" align="center"><font size="2">{ev["organizer"]}{phone}</font>{home}</td>\n'
+            f'</tr>\n<tr><td colspan="4" height="1" bgcolor="#DDDDDD"></td></tr>\n')
+    body = f'<table width="100%" cellpadding=2 cellspacing=1 bgcolor="#CCCCCC">{"".join(rows)}</table>'
+    return _layout(body, '대회일정').encode('euc-kr', errors='replace')
+
+
+def make_detail_page(ev: dict) -> bytes:
+    """상세 페이지 (view.php 구조, 라벨/값 행)"""
+    def row(label, value):
+        return (f'<tr><td width="20%" bgcolor="#EEEEEE"><font size="2"><b>{label}</b></font></td>'
+                f'<td width="80%" bgcolor="#FFFFFF"><font size="2">{value}</font></td></tr>\n')
+
+    mail = f'run{ev["no"]}@test.kr'
+    website = f'<a href="{ev["website"]}" target="_new">{ev["website"]}</a>' if ev['website'] else ''
+    rows = [
+        row('대회명', ev['title'] or '무제 대회'), row('대표자명', '홍길동'),
+        row('E-mail', f'<a href="javascript:pop(\'mail.php?mail_url={mail}\')">{mail}</a>'),
+        row('대회일시', f'2026년{ev["month"]}월{ev["day"]}일 출발시간:{7 + ev["no"] % 3}:00'),
+        row('전화번호', ev['phone']), row('대회종목', ev['distances']), row('대회지역', '서울'),
+        row('대회장소', ev['location']), row('주최단체', ev['organizer']),
+        row('접수기간', f'2025년10월{ev["day"]}일~2026년{ev["month"]}월{ev["day"]}일'),
+        row('홈페이지', website), row('기타소개', ev['description']),
+    ]
+    body = (f'<table width="100%" cellpadding=4 cellspacing=1 bgcolor="#CCCCCC">{"".join(rows)}</table>'
+            f'<table><tr><td><a href="list.php">목록</a></td></tr></table>')
+    return _layout(body, '대회 상세').encode('euc-kr', errors='replace')
+
+
+def reference_list_html(html):
+    """기존 parse_list_page (html.parser 전체 트리, 링크마다 find_parent/find)"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    events = []
+    seen_ids = set()
+
+    # view.php?no=XXXXX 링크에서 ID와 대회명 추출
+    for a_tag in soup.find_all("a", href=re.compile(r"view\.php\?no=\d+")):
+        href = a_tag["href"]
+        m = re.search(r"no=(\d+)", href)
+        if not m:
+            continue
+        eid = m.group(1)
+        if eid in seen_ids:
+            continue
+        seen_ids.add(eid)
+
+        title = a_tag.get_text(strip=True)
+        if not title:
+            continue
+
+        # 종목: 대회명 바로 다음 <font size="2" color="#990000">
+        distances = ""
+        next_font = a_tag.find_next("font", attrs={"color": "#990000"})
+        if next_font:
+            distances = next_font.get_text(strip=True)
+
+        # 날짜: 이 행 위쪽의 날짜 셀 (M/D 형식)
+        tr = a_tag.find_parent("tr")
+        date_str = ""
+        day_of_week = ""
+        if tr:
+            # 같은 tr 내 첫 td에 날짜가 있거나, 이전 tr에 있음
+            date_td = tr.find("td", width="18%")
+            if date_td:
+                date_text = date_td.get_text(strip=True)
+                dm = re.search(r"(\d{1,2}/\d{1,2})", date_text)
+                if dm:
+                    date_str = dm.group(1)
+                dw = re.search(r"\((.)\)", date_text)
+                if dw:
+                    day_of_week = dw.group(1)
+
+        # 장소: width="19%" td
+        location = ""
+        if tr:
+            loc_td = tr.find("td", width="19%")
+            if loc_td:
+                location = loc_td.get_text(strip=True)
+
+        # 주최 / 전화: width="30%" td
+        organizer = ""
+        phone = ""
+        if tr:
+            org_td = tr.find("td", width="30%")
+            if org_td:
+                org_text = org_td.get_text(" ", strip=True)
+                # 전화번호 추출
+                pm = re.search(r"☎?([\d\-]+)", org_text)
+                if pm:
+                    phone = pm.group(1)
+                # 주최: 전화 앞 텍스트
+                org_parts = org_text.split("☎")[0].strip()
+                if org_parts:
+                    organizer = org_parts
+
+        # 홈페이지 링크
+        website = ""
+        if tr:
+            home_a = tr.find("a", href=re.compile(r"^http"), target="_new")
+            if home_a:
+                website = home_a["href"]
+
+        events.append({
+            "id": eid,
+            "title": title,
+            "date": date_str,
+            "dayOfWeek": day_of_week,
+            "distances": distances,
+            "location": location,
+            "organizer": organizer,
+            "phone": phone,
+            "website": website,
+        })
+
+    return events
+
+
+def reference_detail_html(html):
+    """기존 parse_detail_page (html.parser 전체 트리, 행마다 모든 하위 td 수집)"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    detail = {}
+    field_map = {
+        "대회명": "title",
+        "대표자명": "representative",
+        "E-mail": "email",
+        "대회일시": "datetime",
+        "전화번호": "phone",
+        "대회종목": "distances",
+        "대회지역": "region",
+        "대회장소": "venue",
+        "주최단체": "organizer",
+        "접수기간": "registrationPeriod",
+        "홈페이지": "website",
+        "기타소개": "description",
+    }
+
+    rows = soup.find_all("tr")
+    for row in rows:
+        cells = row.find_all("td")
+        if len(cells) < 2:
+            continue
+        label = cells[0].get_text(strip=True)
+        if label in field_map:
+            key = field_map[label]
+            if key == "description":
+                # HTML 줄바꿈 보존
+                value = cells[1].decode_contents()
+                value = re.sub(r"<br\s*/?>", "\n", value)
+                value = re.sub(r"<[^>]+>", "", value)
+                value = re.sub(r"&nbsp;", " ", value)
+                value = value.strip()
+            elif key == "website":
+                a = cells[1].find("a", href=True)
+                value = a["href"] if a else cells[1].get_text(strip=True)
+            elif key == "email":
+                a = cells[1].find("a", href=True)
+                if a:
+                    em = re.search(r"mail_url=([^'\"&]+)", a.get("href", ""))
+                    value = em.group(1) if em else cells[1].get_text(strip=True)
+                else:
+                    value = cells[1].get_text(strip=True)
+            else:
+                value = cells[1].get_text(strip=True)
+            detail[key] = value
+
+    # 기타소개에서 가격 추출
+    desc = detail.get("description", "")
+    if desc:
+        # "참가비" 주변 금액 우선 탐색
+        price_section = re.search(r"참가비[^\d]{0,30}([\d,]+)\s*원", desc)
+        if price_section:
+            detail["price"] = price_section.group(1).replace(",", "") + "원"
+        else:
+            # 그 외 "XX,XXX원" 패턴 중 첫 번째
+            price_match = re.search(r"([\d,]+)\s*원", desc)
+            if price_match:
+                raw_price = price_match.group(1).replace(",", "")
+                # 너무 큰 수(날짜 등 오탐)나 너무 작은 수 제외
+                if raw_price.isdigit() and 1000 <= int(raw_price) <= 1000000:
+                    detail["price"] = raw_price + "원"
+
+    return detail
+
+
+def decode_page(content: bytes) -> str:
+    """EUC-KR 바이트 → 문자열 (crawl_korea.fetch_html과 같은 디코딩)"""
+    return content.decode("euc-kr", errors="replace")
+
+
+def load_pages(directory: str) -> Tuple[List[bytes], List[bytes]]:
+    """저장된 페이지 → (목록 페이지들, 상세 페이지들)"""
+    def read(path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    lists = [read(path) for path in sorted(glob.glob(os.path.join(directory, 'list*.html')))]
+    details = [read(path) for path in sorted(glob.glob(os.path.join(directory, 'view_*.html')))]
+    return lists, details
+
+
+def timed(parse: Callable, pages: List[str]) -> Tuple[float, list]:
+    """pages 전체 파싱 시간 + 결과"""
+    gc.collect()  # 이전 측정에서 남은 트리(순환 참조)를 치우는 시간이 섞이지 않도록
+    started = time.perf_counter()
+    results = [parse(page) for page in pages]
+    return time.perf_counter() - started, results
+
+
+def compare(reference: Callable, fast: Callable, pages: List[str], repeat: int) -> Tuple[float, float, list, list]:
+    """두 파서를 번갈아 repeat회 실행 (먼저 실행한 쪽이 유리하지 않도록 순서도 교대) → 각 최소 시간 + 결과"""
+    best = {reference: float('inf'), fast: float('inf')}
+    results = {}
+    for i in range(repeat):
+        for parse in ((reference, fast) if i % 2 == 0 else (fast, reference)):
+            elapsed, results[parse] = timed(parse, pages)
+            best[parse] = min(best[parse], elapsed)
+    return best[reference], best[fast], results[reference], results[fast]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='roadrun.co.kr 페이지 파싱 벤치마크')
+    arg_parser.add_argument('--events', type=int, default=300, help='합성 목록 페이지 대회 수 (기본 300)')
+    arg_parser.add_argument('--pages', help='저장된 페이지 디렉터리 (list*.html, view_*.html)')
+    arg_parser.add_argument('--repeat', type=int, default=4, help='반복 횟수 (파서 실행 순서를 번갈아 바꿈)')
+    arg_parser.add_argument('--soup-parser', choices=['html.parser', 'lxml'], default='html.parser',
+                            help='crawl_korea 파서의 BeautifulSoup 빌더 (기존 파서는 항상 html.parser)')
+    args = arg_parser.parse_args()
+    crawl_korea.SOUP_FEATURES = args.soup_parser
+
+    if args.pages:
+        list_pages, detail_pages = load_pages(args.pages)
+        print(f"저장된 페이지: 목록 {len(list_pages)}개 | 상세 {len(detail_pages)}개 ({args.pages})")
+    else:
+        events = make_events(args.events)
+        list_pages = [make_list_page(events)]
+        detail_pages = [make_detail_page(ev) for ev in events]
+        print(f"합성 페이지: 목록 1개 ({len(list_pages[0]) / 1024:,.0f}KB, {args.events}개 대회) | "
+              f"상세 {len(detail_pages)}개")
+
+    print(f"BeautifulSoup 빌더: 기존 html.parser | 현재 {args.soup_parser}")
+    print(f"{'페이지':>6} | {'개수':>5} | {'기존':>9} | {'현재':>9} | {'배율':>6}")
+    for name, pages, reference, fast in (('목록', list_pages, reference_list_html, parse_list_html),
+                                         ('상세', detail_pages, reference_detail_html, parse_detail_html)):
+        if not pages:
+            continue
+        texts = [decode_page(page) for page in pages]
+        reference_time, fast_time, expected, actual = compare(reference, fast, texts, args.repeat)
+        assert actual == expected, f"{name} 페이지 파싱 결과가 기존 파서와 다름"
+        print(f"{name:>6} | {len(pages):>5} | {reference_time * 1000:>7.1f}ms | {fast_time * 1000:>7.1f}ms | "
+              f"{reference_time / fast_time:>5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+대회 목록 id → 바이트 위치 인덱스 (JSON Lines 데이터 옆에 두는 sidecar 파일)
+
+marathons_global.jsonl / marathons_korea.jsonl 옆에 `<파일>.idx`를 만들어
+id 하나를 찾을 때 전체 파일을 파싱하지 않고 해당 줄만 읽어 디코딩한다.
+
+- 인덱스는 고정 크기 슬롯(id 해시, 오프셋, 길이)의 열린 주소 해시 테이블 → mmap으로 열어 O(1) 조회
+- 데이터 파일도 mmap으로 열어 요청한 레코드 바이트만 복사/디코딩 (카탈로그 크기와 무관한 메모리)
+- 인덱스에 데이터 파일 크기를 기록해 두고, 다르면 오래된 인덱스로 보고 ValueError
+
+    python catalogue_index.py build data/marathons_korea.json   # JSON → .jsonl + .idx
+    python catalogue_index.py get data/marathons_global.jsonl <id>
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dataset_io import MANIFEST_KEY, JsonlWriter, atomic_open, iter_records, write_json_array
+
+INDEX_SUFFIX = '.idx'
+_MAGIC = b'MRIX'
+_VERSION = 1
+_HEADER = struct.Struct('<4sIQQQ')  # magic, 버전, 슬롯 수, 레코드 수, 데이터 파일 크기
+_SLOT = struct.Struct('<QQI')       # id 해시(0이면 빈 슬롯), 오프셋, 길이
+
+
+def index_path(jsonl_path: str) -> str:
+    """데이터 파일의 인덱스 경로"""
+    return jsonl_path + INDEX_SUFFIX
+
+
+def jsonl_path_of(path: str) -> str:
+    """데이터 파일(.json 등)의 JSON Lines 형태 경로"""
+    return os.path.splitext(path)[0] + '.jsonl'
+
+
+def _key(record_id) -> int:
+    """id → 0이 아닌 64비트 해시 (실행마다 같은 값)"""
+    digest = hashlib.blake2b(str(record_id).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+def write_index(jsonl_path: str, entries: List[Tuple[str, int, int]], source_size: Optional[int] = None):
+    """
+    (id, 오프셋, 길이) 목록 → 인덱스 파일 저장 (임시 파일 → rename)
+    슬롯 수는 레코드 수의 2배 이상인 2의 거듭제곱 (선형 탐사 길이를 짧게 유지)
+    """
+    slots = 8
+    while slots < len(entries) * 2:
+        slots *= 2
+    table = bytearray(_SLOT.size * slots)
+    mask = slots - 1
+    for record_id, offset, length in entries:
+        key = _key(record_id)
+        slot = key & mask
+        while _SLOT.unpack_from(table, slot * _SLOT.size)[0]:
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(table, slot * _SLOT.size, key, offset, length)
+    if source_size is None:
+        source_size = os.path.getsize(jsonl_path)
+    with atomic_open(index_path(jsonl_path), 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, slots, len(entries), source_size))
+        f.write(table)
+
+
+class IndexedJsonlWriter(JsonlWriter):
+    """JsonlWriter + 쓰는 동안 레코드 위치를 모아 close 시 인덱스도 저장"""
+
+    def __init__(self, path: str, id_field: str = 'id'):
+        super().__init__(path)
+        self.id_field = id_field
+        self.entries: List[Tuple[str, int, int]] = []
+
+    def write(self, record: Dict) -> Tuple[int, int]:
+        offset, length = super().write(record)
+        self.entries.append((record.get(self.id_field, ''), offset, length))
+        return offset, length
+
+    def close(self, manifest: Optional[Dict] = None):
+        if self._file is None:
+            return
+        super().close(manifest)
+        write_index(self.path, self.entries, source_size=self.offset)
+        self.entries = []
+
+
+def save_catalogue(path: str, metadata: Dict, records: Iterable[Dict],
+                   compact: bool = False, index: bool = True):
+    """
+    metadata + marathons 구조로 저장
+    - path가 .jsonl이면 JSON Lines(마지막 줄 manifest=metadata)로 저장
+    - .json이면 기존 JSON 구조로 저장하고, index=True면 같은 순회에서 .jsonl 형태도 함께 저장
+    index=True면 .jsonl 옆에 id 인덱스(.idx) 생성
+    """
+    if path.endswith('.jsonl'):
+        writer_class = IndexedJsonlWriter if index else JsonlWriter
+        with writer_class(path) as writer:
+            for record in records:
+                writer.write(record)
+            writer.close(metadata)
+        return
+    if not index:
+        write_json_array(path, {'metadata': metadata}, 'marathons', records, compact=compact)
+        return
+
+    with IndexedJsonlWriter(jsonl_path_of(path)) as writer:
+        def tee() -> Iterator[Dict]:
+            for record in records:
+                writer.write(record)
+                yield record
+        write_json_array(path, {'metadata': metadata}, 'marathons', tee(), compact=compact)
+        writer.close(metadata)
+
+
+def build_index(path: str) -> str:
+    """
+    기존 데이터 파일로 인덱스 생성 → .jsonl 경로
+    .jsonl이면 줄 위치만 스캔, .json(metadata + marathons)이면 .jsonl 형태로 변환하며 생성
+    """
+    if not path.endswith('.jsonl'):
+        with open(path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f).get('metadata', {})
+        jsonl_path = jsonl_path_of(path)
+        with IndexedJsonlWriter(jsonl_path) as writer:
+            for record in iter_records(path, 'marathons'):
+                writer.write(record)
+            writer.close(metadata)
+        return jsonl_path
+
+    entries = []
+    offset = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            length = len(line.rstrip(b'\n'))
+            if length:
+                record = json.loads(line)
+                if not (MANIFEST_KEY in record and len(record) == 1):
+                    entries.append((record.get('id', ''), offset, length))
+            offset += len(line)
+    write_index(path, entries, source_size=offset)
+    return path
+
+
+class CatalogueIndex:
+    """
+    인덱스로 JSON Lines 데이터에서 레코드 하나씩 조회
+
+        with CatalogueIndex('data/marathons_global.jsonl') as catalogue:
+            race = catalogue.get('some-id')
+    """
+
+    def __init__(self, jsonl_path: str):
+        self.path = jsonl_path
+        self._data = self._index = self._index_file = None
+        self._data_file = open(jsonl_path, 'rb')
+        try:
+            self._index_file = open(index_path(jsonl_path), 'rb')
+            self._data = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self._slots, self._count, source_size = _HEADER.unpack_from(self._index, 0)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"인덱스 형식이 아님: {index_path(jsonl_path)}")
+            if source_size != len(self._data):
+                raise ValueError(f"인덱스가 데이터 파일과 맞지 않음 (다시 생성 필요): {index_path(jsonl_path)}")
+        except BaseException:
+            self.close()
+            raise
+
+    def _locate(self, record_id) -> Iterator[Tuple[int, int]]:
+        """id 해시가 같은 슬롯의 (오프셋, 길이) — 빈 슬롯을 만나면 종료"""
+        key = _key(record_id)
+        mask = self._slots - 1
+        slot = key & mask
+        while True:
+            stored, offset, length = _SLOT.unpack_from(self._index, _HEADER.size + slot * _SLOT.size)
+            if not stored:
+                return
+            if stored == key:
+                yield offset, length
+            slot = (slot + 1) & mask
+
+    def get(self, record_id, default: Optional[Dict] = None) -> Optional[Dict]:
+        """id로 레코드 조회 (해당 줄만 디코딩, 없으면 default)"""
+        for offset, length in self._locate(record_id):
+            record = json.loads(self._data[offset:offset + length])
+            if str(record.get('id', '')) == str(record_id):
+                return record
+        return default
+
+    def __contains__(self, record_id) -> bool:
+        return self.get(record_id) is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self):
+        for name in ('_data', '_index'):
+            view = getattr(self, name)
+            if view is not None:
+                view.close()
+                setattr(self, name, None)
+        self._data_file.close()
+        if self._index_file is not None:
+            self._index_file.close()
+
+    def __enter__(self) -> 'CatalogueIndex':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='대회 목록 id 인덱스')
+    subparsers = arg_parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help='데이터 파일(.json/.jsonl)로 .jsonl + .idx 생성')
+    build_parser.add_argument('path')
+    get_parser = subparsers.add_parser('get', help='id로 레코드 하나 조회')
+    get_parser.add_argument('path', help='.jsonl 데이터 파일')
+    get_parser.add_argument('id')
+    args = arg_parser.parse_args()
+
+    if args.command == 'build':
+        jsonl_path = build_index(args.path)
+        with CatalogueIndex(jsonl_path) as catalogue:
+            print(f"✅ {index_path(jsonl_path)} 생성 완료 ({len(catalogue)}개)")
+    else:
+        with CatalogueIndex(args.path) as catalogue:
+            record = catalogue.get(args.id)
+        if record is None:
+            print(f"❌ {args.id} 없음")
+            raise SystemExit(1)
+        print(json.dumps(record, ensure_ascii=False, indent=2))
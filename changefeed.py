@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+실행별 변경 피드 (추가 / 삭제 / 필드 단위 변경)
+
+크롤링 결과 전체를 다시 받지 않고 바뀐 부분만 동기화할 수 있도록,
+실행할 때마다 이전 버전과 비교한 delta 파일을 만든다.
+
+    data/changefeed/global/feed.json              # 현재 버전, 스냅샷, delta 목록
+    data/changefeed/global/snapshots/000042.jsonl # 버전 42 전체 (마지막 줄 manifest에 version)
+    data/changefeed/global/deltas/000042.json     # 버전 41 → 42 변경분
+
+delta 파일:
+    {"version": 42, "base_version": 41, "created_at": "...",
+     "added": [{레코드}], "removed": ["id", ...],
+     "changed": [{"id": "...", "set": {"isSoldOut": true, "minPriceKRW": 72500}, "unset": ["visa"]}]}
+
+클라이언트 (버전 N):
+- feed.json의 version == N → 최신
+- plan_sync(feed, N)이 'deltas'면 delta N+1..M을 순서대로 적용
+- delta가 이미 정리되었거나(체인이 max_chain보다 김) delta 합계가 스냅샷보다 크면 'snapshot' → feed의 스냅샷 전체
+
+변경이 없는 실행은 버전을 올리지 않음. 기록 순서: delta → 새 버전 스냅샷 → feed.json → 이전 스냅샷 삭제
+feed.json 교체가 커밋 시점이라, 그 전에 중단되면 feed.json과 이전 버전 스냅샷이 그대로 남아
+다음 실행이 같은 기준으로 다시 비교한다 (새 버전 파일은 다음 실행에서 덮어씀).
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dataset_io import JsonlWriter, atomic_open, iter_jsonl, read_jsonl_manifest
+
+FEED_NAME = 'feed.json'
+MAX_CHAIN = 30  # 보관할 delta 수 (이보다 오래된 버전의 클라이언트는 스냅샷 사용)
+
+_MISSING = object()
+
+
+def diff_record(old: Dict, new: Dict) -> Optional[Dict]:
+    """레코드 필드 단위 변경 → {'id', 'set', 'unset'} (같으면 None)"""
+    changed = {name: value for name, value in new.items() if old.get(name, _MISSING) != value}
+    removed = [name for name in old if name not in new]
+    if not changed and not removed:
+        return None
+    patch = {'id': new.get('id'), 'set': changed}
+    if removed:
+        patch['unset'] = removed
+    return patch
+
+
+def apply_delta(records: Dict[str, Dict], delta: Dict) -> Dict[str, Dict]:
+    """{id: 레코드}에 delta 적용 (클라이언트 동기화 로직과 같은 규칙, 검증용)"""
+    for record_id in delta.get('removed', []):
+        records.pop(record_id, None)
+    for patch in delta.get('changed', []):
+        record = dict(records[patch['id']])
+        record.update(patch.get('set', {}))
+        for name in patch.get('unset', []):
+            record.pop(name, None)
+        records[patch['id']] = record
+    for record in delta.get('added', []):
+        records[record['id']] = record
+    return records
+
+
+def plan_sync(feed: Dict, client_version: Optional[int]) -> Tuple[str, List[str]]:
+    """
+    클라이언트 버전 → ('latest', []) / ('deltas', [delta 경로...]) / ('snapshot', [스냅샷 경로])
+    delta가 끊겼거나 합계 크기가 스냅샷보다 크면 스냅샷
+    """
+    version = feed.get('version', 0)
+    if client_version == version:
+        return 'latest', []
+    snapshot = ('snapshot', [feed['snapshot']['path']])
+    if client_version is None or client_version > version:
+        return snapshot
+    needed = [delta for delta in feed.get('deltas', []) if delta['version'] > client_version]
+    if not needed or needed[0]['base_version'] != client_version:
+        return snapshot  # 필요한 delta가 이미 정리됨
+    if sum(delta['bytes'] for delta in needed) > feed['snapshot']['bytes']:
+        return snapshot
+    return 'deltas', [delta['path'] for delta in needed]
+
+
+class Changefeed:
+    """데이터셋 하나의 변경 피드 디렉터리"""
+
+    def __init__(self, directory: str, max_chain: int = MAX_CHAIN):
+        self.directory = directory
+        self.max_chain = max_chain
+        self.feed_path = os.path.join(directory, FEED_NAME)
+
+    def load_feed(self) -> Dict:
+        """현재 feed.json (없거나 깨졌으면 빈 dict)"""
+        try:
+            with open(self.feed_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load_snapshot(self, feed: Dict) -> Optional[Dict[str, Dict]]:
+        """feed.json이 가리키는 버전 전체 {id: 레코드} (없거나 버전이 다르면 None → 비교 기준 없음)"""
+        version = feed.get('version', 0)
+        path = os.path.join(self.directory, feed.get('snapshot', {}).get('path', ''))
+        if not version or not os.path.isfile(path):
+            return None
+        manifest = read_jsonl_manifest(path) or {}
+        if manifest.get('version') != version:
+            return None
+        return {record['id']: record for record in iter_jsonl(path)}
+
+    def publish(self, records: Iterable) -> Dict:
+        """
+        이번 실행 결과와 이전 버전 비교 → delta/스냅샷/feed.json 저장 → 요약
+        요약: {'version', 'mode': 'delta' | 'snapshot' | 'unchanged', 'added', 'removed', 'changed'}
+        """
+        current: Dict[str, Dict] = {}
+        for record in records:
+            record = record.to_dict() if hasattr(record, 'to_dict') else record
+            current[record['id']] = record
+
+        feed = self.load_feed()
+        base_version = feed.get('version', 0)
+        previous = self._load_snapshot(feed)
+        previous_snapshot = feed.get('snapshot', {}).get('path')
+        deltas = feed.get('deltas', [])
+        summary = {'version': base_version, 'mode': 'unchanged', 'added': 0, 'removed': 0, 'changed': 0}
+
+        if previous is not None:
+            added = [record for record_id, record in current.items() if record_id not in previous]
+            removed = [record_id for record_id in previous if record_id not in current]
+            changed = [patch for record_id, record in current.items() if record_id in previous
+                       for patch in (diff_record(previous[record_id], record),) if patch]
+            summary.update(added=len(added), removed=len(removed), changed=len(changed))
+            if not (added or removed or changed):
+                return summary  # 변경 없음 → 버전 유지
+            version = base_version + 1
+            summary['mode'] = 'delta'
+            relative_path = f"deltas/{version:06d}.json"
+            delta = {'version': version, 'base_version': base_version,
+                     'created_at': datetime.now().isoformat(),
+                     'added': added, 'removed': removed, 'changed': changed}
+            body = json.dumps(delta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            with atomic_open(os.path.join(self.directory, relative_path), 'wb') as f:
+                f.write(body)
+            deltas = deltas + [{'version': version, 'base_version': base_version, 'path': relative_path,
+                                'added': len(added), 'removed': len(removed), 'changed': len(changed),
+                                'bytes': len(body)}]
+        else:
+            version = base_version + 1  # 첫 실행(또는 스냅샷 유실) → 스냅샷만, 이전 delta 체인은 끊김
+            summary['mode'] = 'snapshot'
+            deltas, broken = [], deltas
+
+        # 버전별 파일로 써서 feed.json이 바뀌기 전까지 이전 스냅샷은 그대로 둠
+        snapshot_path = f"snapshots/{version:06d}.jsonl"
+        with JsonlWriter(os.path.join(self.directory, snapshot_path)) as writer:
+            for record in current.values():
+                writer.write(record)
+            writer.close({'version': version, 'created_at': datetime.now().isoformat()})
+
+        expired, deltas = deltas[:-self.max_chain], deltas[-self.max_chain:]
+        if previous is None:
+            expired = broken
+        feed = {
+            'version': version,
+            'updated_at': datetime.now().isoformat(),
+            'snapshot': {'path': snapshot_path, 'version': version, 'count': len(current),
+                         'bytes': os.path.getsize(os.path.join(self.directory, snapshot_path))},
+            'max_chain': self.max_chain,
+            'deltas': deltas,
+        }
+        with atomic_open(self.feed_path) as f:
+            json.dump(feed, f, ensure_ascii=False, indent=2)
+        stale = [delta['path'] for delta in expired]
+        if previous_snapshot and previous_snapshot != snapshot_path:
+            stale.append(previous_snapshot)
+        for path in stale:
+            try:
+                os.remove(os.path.join(self.directory, path))
+            except FileNotFoundError:
+                pass
+        summary['version'] = version
+        return summary
+
+
+def print_changefeed(name: str, summary: Dict):
+    """변경 피드 결과 출력"""
+    if summary['mode'] == 'unchanged':
+        print(f"🔁 {name} 변경 피드: 변경 없음 (버전 {summary['version']} 유지)")
+    elif summary['mode'] == 'snapshot':
+        print(f"🔁 {name} 변경 피드: 버전 {summary['version']} 스냅샷 생성")
+    else:
+        print(f"🔁 {name} 변경 피드: 버전 {summary['version']} (추가 {summary['added']}개 | "
+              f"삭제 {summary['removed']}개 | 변경 {summary['changed']}개)")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+분할 쿼리 체크포인트 (JSON Lines, append-only)
+
+완료된 파티션마다 한 줄씩 {params, count, results}를 기록한다.
+--resume 실행 시 기록된 파티션은 요청 없이 체크포인트에서 결과를 재구성한다.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class PartitionCheckpoint:
+    """완료된 파티션 결과 저장소 (thread-safe)"""
+
+    def __init__(self, path: str = 'data/marathons_global_checkpoint.jsonl', resume: bool = False):
+        """
+        Args:
+            path: 체크포인트 파일 경로
+            resume: True면 기존 체크포인트를 읽어 이어서 진행, False면 새로 시작
+        """
+        self.path = path
+        self._done: Dict[str, Tuple[List[Dict], int]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if resume and os.path.exists(path):
+            self._load()
+        else:
+            open(path, 'w').close()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def make_key(params: Dict) -> str:
+        return json.dumps(params, sort_keys=True, ensure_ascii=False)
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 중단 시점에 쓰다 만 줄
+                self._done[self.make_key(entry['params'])] = (entry['results'], entry['count'])
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def get(self, params: Dict) -> Optional[Tuple[List[Dict], int]]:
+        """완료된 파티션이면 (results, count), 아니면 None"""
+        return self._done.get(self.make_key(params))
+
+    def save(self, params: Dict, results: List[Dict], count: int):
+        """파티션 완료 기록 (즉시 flush)"""
+        line = json.dumps({'params': params, 'count': count, 'results': results}, ensure_ascii=False)
+        with self._lock:
+            self._done[self.make_key(params)] = (results, count)
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def remove(self):
+        """수집이 끝까지 성공하면 체크포인트 삭제"""
+        with self._lock:
+            self._file.close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+스레드 동시성 도구 모음
+- SingleFlight: 같은 키의 동시 호출을 한 번의 실행으로 합침
+- AIMDLimiter: 지연/오류율에 따라 동시 요청 수를 AIMD로 조절
+- StagePipeline: 크기 제한 큐로 이어진 단계별 워커 (수집/번역/파싱 겹쳐 실행)
+- HostSlots: 호스트별 동시 요청 수 제한 (대회 홈페이지 등 작은 사이트 보호)
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class _Call:
+    """진행 중인 호출 하나 (완료 이벤트 + 결과/예외)"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출 중 첫 호출자만 fn을 실행하고,
+    나머지는 그 결과(또는 예외)를 기다려 공유
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Returns:
+            (결과, 공유 여부) — 다른 호출자의 결과를 받았으면 공유 여부 True
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                owner = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                owner = True
+
+        if not owner:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+class AIMDLimiter:
+    """
+    동시 실행(in-flight) 수 제한기 — additive increase / multiplicative decrease
+
+    - 성공 + 지연이 기준 이하: 한도를 한 "라운드"(현재 한도만큼의 성공)마다 +1
+    - 실패/타임아웃 또는 지연 초과: 한도를 decrease 배로 축소 (cooldown 동안 1회만)
+    """
+
+    def __init__(self, initial: int = 8, min_limit: int = 1, max_limit: int = 32,
+                 latency_threshold: float = 2.0, decrease: float = 0.5, cooldown: float = 1.0):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_threshold = latency_threshold
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.peak_limit = self.limit
+        self.successes = 0
+        self.failures = 0
+        self._inflight = 0
+        self._peak_inflight = 0
+        self._last_decrease = 0.0
+        self._last_change = time.monotonic()
+        self._inflight_area = 0.0  # in-flight 수의 시간 적분 (평균 동시성 계산용)
+        self._busy_time = 0.0  # in-flight가 1개 이상이던 시간 (여러 배치에 걸쳐 쓸 때 배치 사이 대기 제외)
+        self._cond = threading.Condition()
+
+    def _account(self, now: float):
+        self._inflight_area += self._inflight * (now - self._last_change)
+        if self._inflight:
+            self._busy_time += now - self._last_change
+        self._last_change = now
+
+    def acquire(self):
+        """현재 한도 안에서 슬롯이 날 때까지 대기"""
+        with self._cond:
+            while self._inflight >= int(self.limit):
+                self._cond.wait()
+            self._account(time.monotonic())
+            self._inflight += 1
+            self._peak_inflight = max(self._peak_inflight, self._inflight)
+
+    def release(self, latency: float, ok: bool):
+        """슬롯 반납 + 관측 결과(지연 초, 성공 여부)로 한도 조정"""
+        with self._cond:
+            now = time.monotonic()
+            self._account(now)
+            self._inflight -= 1
+            if ok:
+                self.successes += 1
+            else:
+                self.failures += 1
+            if ok and latency <= self.latency_threshold:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            elif now - self._last_decrease >= self.cooldown:
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+                self._last_decrease = now
+            self.peak_limit = max(self.peak_limit, self.limit)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, float]:
+        """평균(실행 중이던 시간 기준)/최대 동시 실행 수, 최종/최대 한도, 성공/실패 수"""
+        with self._cond:
+            self._account(time.monotonic())
+            return {
+                'avg_inflight': self._inflight_area / self._busy_time if self._busy_time > 0 else 0.0,
+                'peak_inflight': self._peak_inflight,
+                'final_limit': int(self.limit),
+                'peak_limit': int(self.peak_limit),
+                'successes': self.successes,
+                'failures': self.failures,
+            }
+
+
+_STOP = object()
+
+
+class StagePipeline:
+    """
+    크기 제한 큐로 이어진 단계별 워커 스레드 (생산자/소비자)
+
+    - put(item): 첫 단계 큐에 넣음, 큐가 가득 차면 대기 (backpressure → 메모리 일정)
+    - 각 단계 함수의 반환값이 다음 단계 입력 (None이면 전달하지 않음)
+    - 단계마다 스레드 1개라 단계 안에서는 입력 순서대로 처리
+    """
+
+    def __init__(self, stages: List[Tuple[str, Callable[[Any], Any]]], maxsize: int = 4):
+        """
+        Args:
+            stages: (단계 이름, 처리 함수) 리스트
+            maxsize: 단계 사이 큐에 쌓일 수 있는 최대 항목 수
+        """
+        self._queues = [queue.Queue(maxsize) for _ in stages]
+        self._error: Optional[BaseException] = None
+        self._aborted = False
+        self._closed = False
+        self.busy = {name: 0.0 for name, _ in stages}  # 단계별 실제 처리 시간 (초)
+        self.items = {name: 0 for name, _ in stages}
+        self._threads = [threading.Thread(target=self._run, args=(i, name, fn), daemon=True)
+                         for i, (name, fn) in enumerate(stages)]
+        for thread in self._threads:
+            thread.start()
+
+    def _run(self, index: int, name: str, fn: Callable[[Any], Any]):
+        inbox = self._queues[index]
+        outbox = self._queues[index + 1] if index + 1 < len(self._queues) else None
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                if outbox is not None:
+                    outbox.put(_STOP)
+                return
+            if self._error is not None or self._aborted:
+                continue  # 실패/중단 후에는 남은 항목만 비움 (앞 단계가 막히지 않도록)
+            started = time.monotonic()
+            try:
+                result = fn(item)
+            except BaseException as e:
+                self._error = self._error or e
+                continue
+            self.busy[name] += time.monotonic() - started
+            self.items[name] += 1
+            if outbox is not None and result is not None:
+                outbox.put(result)
+
+    def put(self, item: Any):
+        """첫 단계에 항목 추가 (큐가 가득 차면 대기), 이미 실패한 단계가 있으면 그 예외 발생"""
+        if self._error is not None:
+            raise self._error
+        self._queues[0].put(item)
+
+    def close(self):
+        """남은 항목을 모두 처리할 때까지 대기, 단계에서 난 예외는 다시 발생"""
+        if not self._closed:
+            self._closed = True
+            self._queues[0].put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        if self._error is not None and not self._aborted:
+            raise self._error
+
+    def abort(self):
+        """남은 항목은 처리하지 않고 종료 (수집 실패 시 정리용)"""
+        self._aborted = True
+        self.close()
+
+
+class HostSlots:
+    """
+    호스트별 동시 실행 수 제한 (호스트마다 BoundedSemaphore)
+
+        with slots.hold('example.com'):
+            ...  # 같은 호스트에 동시에 per_host개까지만
+    """
+
+    def __init__(self, per_host: int = 1):
+        self.per_host = max(1, per_host)
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return semaphore
+
+    @contextmanager
+    def hold(self, host: str):
+        semaphore = self._semaphore(host)
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
@@ -6,18 +6,42 @@ World's Marathons API 데이터 수집 및 파싱 스크립트
 
 import requests
 import json
+import os
 import time
-from datetime import datetime
-from typing import List, Dict, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 import threading
 
+import http_client
+from catalogue_index import save_catalogue
+from changefeed import Changefeed, print_changefeed
+from checkpoint import PartitionCheckpoint
+from concurrency import AIMDLimiter, SingleFlight, StagePipeline
+from dataset_io import JsonlWriter, iter_records, write_json_array
+from marathon_record import Marathon, compact
+from merge_visa_data import apply_visa, load_visa_index
+from query_planner import QueryPlanner
+from race_filter import RaceFilter, parse_list
+from rate_limiter import configure_host, get_limiter
+from record_delta import RecordDelta, data_fingerprint, merge_in_order
+from response_cache import ResponseCache
+from shard_export import export_shards
+from translation_store import TranslationStore
+
 class MarathonParser:
     """마라톤 데이터 파싱 클래스"""
 
     # 번역 캐시 (같은 도시명을 여러 번 번역하지 않도록)
     _translation_cache = {}
-    _cache_lock = threading.Lock()  # 스레드 안전성을 위한 락
+    _cache_lock = threading.Lock()  # 캐시 쓰기용 락 (읽기는 락 없이 dict 조회)
+    _translation_flight = SingleFlight()  # 같은 도시명 동시 번역 요청을 하나로 합침
+
+    # 번역 영구 저장소 (첫 조회 시 로드 + write-through, 경로가 None이면 비활성)
+    TRANSLATION_STORE_PATH = 'data/translations.sqlite'
+    _translation_store = None
+    _store_loaded = False
 
     # 대회 타입 한글 변환
     RACE_TYPE_KR = {
@@ -587,88 +611,167 @@ class MarathonParser:
         """국가명으로 한글 대륙명 반환"""
         return MarathonParser.COUNTRY_CONTINENT_KR.get(country, '')
 
+    @staticmethod
+    def load_translation_store():
+        """번역 저장소를 (최초 1회) 열고 저장된 번역을 캐시에 로드"""
+        if MarathonParser._store_loaded:
+            return
+        with MarathonParser._cache_lock:
+            if MarathonParser._store_loaded:
+                return
+            if MarathonParser.TRANSLATION_STORE_PATH:
+                store = TranslationStore(MarathonParser.TRANSLATION_STORE_PATH)
+                for source, translated in store.load_all().items():
+                    MarathonParser._translation_cache.setdefault(source, translated)
+                MarathonParser._translation_store = store
+            MarathonParser._store_loaded = True
+
+    @staticmethod
+    def fetch_translation(text: str) -> str:
+        """
+        MyMemory Translation API 호출 (영어 → 한국어)
+        HTTP/API 오류시 예외 발생, 번역 결과가 비어있으면 원본 반환
+        """
+        url = "https://api.mymemory.translated.net/get"
+        params = {
+            'q': text,
+            'langpair': 'en|ko'
+        }
+
+        # 재시도는 하지 않음 (타임아웃/오류는 translate_cities_batch의 AIMD가 동시성으로 대응)
+        response = http_client.get(url, params=params, max_retries=0)
+        response.raise_for_status()
+        data = response.json()
+        # 할당량 초과 등은 HTTP 200 + responseStatus로 전달됨
+        status = data.get('responseStatus', 200)
+        if str(status) != '200':
+            raise RuntimeError(f"MyMemory responseStatus {status}")
+        translated = data.get('responseData', {}).get('translatedText', text)
+        return translated or text
+
     @staticmethod
     def translate_with_api(text: str) -> str:
         """
         MyMemory Translation API를 사용한 영어 → 한국어 번역
-        무료, 빠르고 안정적
+        translate_and_store와 같이 캐시/저장소에 기록 (API 오류시 원본 유지)
         """
-        try:
-            url = "https://api.mymemory.translated.net/get"
-            params = {
-                'q': text,
-                'langpair': 'en|ko'
-            }
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
-
-            response = requests.get(url, params=params, headers=headers, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                translated = data.get('responseData', {}).get('translatedText', text)
-
-                # 번역 결과가 원본과 같거나 비어있으면 원본 유지
-                if translated and translated != text:
-                    return translated
-
-            return text
+        translated, _ = MarathonParser.translate_and_store(text)
+        return translated
+
+    @staticmethod
+    def translate_and_store(text: str) -> Tuple[str, bool]:
+        """
+        API 번역 후 캐시 + 저장소에 기록 (Thread-safe)
+        실패시 원본을 이번 실행의 캐시에만 두고, 저장소에는 실패로 기록 (다음 실행에서 재시도)
 
+        Returns:
+            (번역, API 성공 여부)
+        """
+        store = MarathonParser._translation_store
+        try:
+            translated = MarathonParser.fetch_translation(text)
+            ok = True
         except Exception as e:
-            # API 오류시 원본 유지
-            return text
+            translated = text
+            ok = False
+            if store:
+                store.record_failure(text, str(e) or type(e).__name__)
+        else:
+            if store:
+                store.save(text, translated)
+
+        with MarathonParser._cache_lock:
+            MarathonParser._translation_cache[text] = translated
+        return translated, ok
+
+    @staticmethod
+    def translate_once(text: str) -> Tuple[str, Optional[bool]]:
+        """
+        캐시에 없을 때만 API 번역 (single-flight)
+        같은 원문을 여러 스레드가 동시에 요청하면 첫 호출자만 API를 호출하고 나머지는 결과를 기다림
+
+        Returns:
+            (번역, API 성공 여부) — 이 호출자가 API를 호출하지 않았으면 성공 여부는 None
+        """
+        def load():
+            cached = MarathonParser._translation_cache.get(text)
+            if cached is not None:
+                return cached, None
+            return MarathonParser.translate_and_store(text)
+
+        (translated, ok), shared = MarathonParser._translation_flight.do(text, load)
+        return translated, None if shared else ok
+
+    @staticmethod
+    def known_city_kr(city: str) -> Optional[str]:
+        """
+        API 호출 없이 알 수 있는 도시명 한글 (CITY_KR 딕셔너리 → 캐시, 없으면 None)
+        dict 단일 조회는 GIL 하에서 원자적이므로 락을 잡지 않음
+        """
+        if city in MarathonParser.CITY_KR:
+            return MarathonParser.CITY_KR[city]
+        MarathonParser.load_translation_store()  # 최초 조회 시 저장소 로드
+        return MarathonParser._translation_cache.get(city)
 
     @staticmethod
     def get_city_kr(city: str, verbose: bool = False) -> str:
         """
         도시명을 한글로 변환 (Thread-safe)
         1. CITY_KR 딕셔너리에서 매핑 확인
-        2. 매핑 없으면 MyMemory Translation API로 번역
-        3. API 실패시 원본 유지
+        2. 캐시 (영구 저장소 포함) 확인
+        3. 없으면 MyMemory Translation API로 번역
+        4. API 실패시 원본 유지
         """
         if not city or not city.strip():
             return city
 
-        # 1. 딕셔너리에서 매핑 확인
-        if city in MarathonParser.CITY_KR:
-            return MarathonParser.CITY_KR[city]
-
-        # 2. 캐시에서 확인 (thread-safe)
-        with MarathonParser._cache_lock:
-            if city in MarathonParser._translation_cache:
-                return MarathonParser._translation_cache[city]
+        # 1~2. 딕셔너리 → 캐시 확인
+        known = MarathonParser.known_city_kr(city)
+        if known is not None:
+            return known
 
-        # 3. MyMemory Translation API로 번역
+        # 3. MyMemory Translation API로 번역 (같은 도시명 동시 요청은 한 번만 호출)
         if verbose:
             print(f"      🌐 API 번역 중: '{city}'", end=' ', flush=True)
 
-        translated = MarathonParser.translate_with_api(city)
+        translated, _ = MarathonParser.translate_once(city)
 
         if verbose:
             print(f"→ '{translated}'")
 
-        # 캐시에 저장 (thread-safe)
-        with MarathonParser._cache_lock:
-            MarathonParser._translation_cache[city] = translated
+        return translated
 
-        # API 호출 간격 단축 (0.05초 → 0.015초)
-        time.sleep(0.015)
+    @staticmethod
+    def translation_limiter(max_workers: int = 32, min_workers: int = 2,
+                            initial_workers: int = 15, latency_threshold: float = 2.0) -> AIMDLimiter:
+        """
+        번역 API 동시 요청 수 제한기 — 실행당 하나를 만들어 여러 translate_cities_batch 호출에 넘기면
+        앞 배치에서 조절된 한도를 다음 배치가 이어받음
 
-        return translated
+        Args:
+            max_workers: 동시 요청 수 상한 (스레드 수)
+            min_workers: 동시 요청 수 하한
+            initial_workers: 시작 동시 요청 수
+            latency_threshold: 이 시간(초)을 넘는 응답은 과부하 신호로 보고 동시 요청 수를 줄임
+        """
+        return AIMDLimiter(initial=initial_workers, min_limit=min_workers, max_limit=max_workers,
+                           latency_threshold=latency_threshold)
 
     @staticmethod
-    def translate_cities_batch(cities: List[str], max_workers: int = 15) -> Dict[str, str]:
+    def translate_cities_batch(cities: List[str], limiter: Optional[AIMDLimiter] = None) -> Dict[str, str]:
         """
         여러 도시명을 병렬로 번역
+        동시 요청 수는 지연/오류율에 따라 AIMD로 조절 (limiter.min_limit~max_limit)
 
         Args:
             cities: 번역할 도시명 리스트
-            max_workers: 동시 처리 스레드 수
+            limiter: 동시 요청 수 제한기 (None이면 기본 설정으로 이번 호출용 생성)
 
         Returns:
             {원본: 번역} 딕셔너리
         """
         results = {}
+        MarathonParser.load_translation_store()
 
         # 이미 번역된 도시명 제외
         cities_to_translate = []
@@ -685,16 +788,25 @@ class MarathonParser:
         if not cities_to_translate:
             return results
 
-        print(f"   🚀 병렬 번역 시작: {len(cities_to_translate)}개 (동시 {max_workers}개)")
+        aimd = limiter or MarathonParser.translation_limiter()
+        failures_before = aimd.failures
+        print(f"   🚀 병렬 번역 시작: {len(cities_to_translate)}개 "
+              f"(동시 {int(aimd.limit)}개에서 시작, {aimd.min_limit}~{aimd.max_limit}개 자동 조절)")
 
         def translate_single(city: str) -> tuple:
-            """단일 도시명 번역"""
-            translated = MarathonParser.translate_with_api(city)
-            time.sleep(0.015)  # API rate limit 방지
+            """단일 도시명 번역 (AIMD 슬롯 안에서 실행, 지연/성공 여부를 피드백)"""
+            aimd.acquire()
+            started = time.monotonic()
+            ok = None
+            try:
+                translated, ok = MarathonParser.translate_once(city)
+            finally:
+                # 다른 스레드 결과를 공유받은 경우(ok=None)는 성공으로 간주
+                aimd.release(time.monotonic() - started, ok is not False)
             return (city, translated)
 
-        # ThreadPoolExecutor로 병렬 번역
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # ThreadPoolExecutor로 병렬 번역 (실제 동시 요청 수는 aimd가 제한)
+        with ThreadPoolExecutor(max_workers=aimd.max_limit) as executor:
             futures = {executor.submit(translate_single, city): city for city in cities_to_translate}
 
             completed = 0
@@ -703,20 +815,18 @@ class MarathonParser:
                     city, translated = future.result()
                     results[city] = translated
 
-                    # 캐시에 저장
-                    with MarathonParser._cache_lock:
-                        MarathonParser._translation_cache[city] = translated
-
                     completed += 1
                     if completed % 50 == 0:
-                        print(f"   [{completed}/{len(cities_to_translate)}] 번역 진행 중...")
+                        print(f"   [{completed}/{len(cities_to_translate)}] 번역 진행 중... "
+                              f"(현재 동시 {int(aimd.limit)}개)")
 
                 except Exception as e:
                     city = futures[future]
                     print(f"   ⚠️  번역 실패: {city} - {e}")
                     results[city] = city
 
-        print(f"   ✅ 병렬 번역 완료: {len(cities_to_translate)}개")
+        print(f"   ✅ 병렬 번역 완료: {len(cities_to_translate)}개 "
+              f"(실패 {aimd.failures - failures_before}개, 현재 동시 한도 {int(aimd.limit)}개)")
         return results
 
     # 태그 한글 변환 (자연스러운 것만)
@@ -932,10 +1042,11 @@ class MarathonParser:
         return None
     
     @staticmethod
-    def parse_marathon(raw: Dict) -> Dict:
+    def parse_marathon(raw: Dict, today: Optional[date] = None) -> Dict:
         """
         원본 API 데이터를 앱용 포맷으로 파싱
         필드 요약표 기준
+        today: 지난 대회 판정 기준일 (기본: 오늘, 여러 개를 파싱할 때는 한 번 구해서 넘김)
         """
         
         # 오늘 이전 대회 필터링
@@ -943,7 +1054,7 @@ class MarathonParser:
         if date_next_race:
             try:
                 race_date = datetime.fromisoformat(date_next_race)
-                if race_date.date() < datetime.now().date():
+                if race_date.date() < (today or date.today()):
                     return None
             except (ValueError, TypeError):
                 pass
@@ -1006,6 +1117,7 @@ class MarathonParser:
         
         # 선택 필드 (가격)
         early_bird_days_left = raw.get('earlyBirdDaysLeft')
+        min_price_krw = round(int(min_price * 1450), -2) if min_price else 0
         
         # 파싱된 데이터 구성
         parsed = {
@@ -1048,9 +1160,9 @@ class MarathonParser:
             
             # 가격
             'minPriceEUR': min_price,  # 원본 EUR 가격
-            'minPriceKRW': round(int(min_price * 1450), -2) if min_price else 0,  # 원화 변환
-            'minPrice': round(int(min_price * 1450), -2) if min_price else 0,  # 하위 호환성
-            'minPriceFormatted': f"약 {round(int(min_price * 1450), -2):,}원" if min_price else '',
+            'minPriceKRW': min_price_krw,  # 원화 변환
+            'minPrice': min_price_krw,  # 하위 호환성
+            'minPriceFormatted': f"약 {min_price_krw:,}원" if min_price else '',
             'earlyBirdDaysLeft': early_bird_days_left,
             'hasEarlyBird': early_bird_days_left is not None and early_bird_days_left > 0,
             
@@ -1086,102 +1198,253 @@ class MarathonParser:
         return parsed
 
 
-def fetch_marathon_data():
-    """마라톤 데이터 가져오기 및 파싱 (API 1000개 제한 우회)"""
-
-    url = "https://worldsmarathons.com/api/search"
+SEARCH_API_URL = "https://worldsmarathons.com/api/search"
+RAW_PATH = 'data/marathons_global_raw.json'
+PARSED_PATH = 'data/marathons_global.json'
+SHARDS_DIR = 'data/shards'  # 대륙 × 월 샤드 + manifest.json
+CHANGEFEED_DIR = 'data/changefeed/global'  # 실행별 변경분 (feed.json, deltas/)
+VISA_PATH = 'data/visa.json'
+DELTA_HASHES_PATH = 'data/marathons_global_hashes.json'  # 레코드별 내용 해시 (증분 처리용)
+PARSER_VERSION = 1  # parse_marathon 출력 형식/규칙을 바꾸면 올림 → 증분 처리의 이전 결과 무효화
+PARSE_CHUNK_SIZE = 2000  # 병렬 파싱 시 워커 프로세스에 한 번에 넘기는 레코드 수
+PIPELINE_QUEUE_SIZE = 4  # 수집 → 번역 → 파싱 단계 사이에 쌓아 둘 최대 파티션 묶음 수
+
+# worldsmarathons.com 검색 API의 continent 파라미터 → 한글 대륙명 (국가 보충 쿼리용)
+API_CONTINENT_KR = {
+    'europe': '유럽',
+    'North America': '북미',
+    'asia': '아시아',
+    'africa': '아프리카',
+    'South America': '남미',
+    'australia': '오세아니아',
+    'Antarctica': '남극',
+}
+KR_CONTINENT_API = {kr: api for api, kr in API_CONTINENT_KR.items()}
+
+
+def parser_fingerprint() -> str:
+    """증분 처리 지문: 파싱 결과에 영향을 주는 것만 (파서 버전, 변환 테이블, visa.json)"""
+    tables = [PARSER_VERSION, MarathonParser.RACE_TYPE_KR, MarathonParser.SURFACE_KR,
+              MarathonParser.DIFFICULTY_KR, MarathonParser.COUNTRY_KR, MarathonParser.CITY_KR,
+              MarathonParser.COUNTRY_CONTINENT_KR, MarathonParser.TAG_KR]
+    return data_fingerprint(tables, VISA_PATH)
+
+
+def dataset_path(path: str, output_format: str = 'json') -> str:
+    """저장 형식에 맞춘 경로 (jsonl이면 확장자를 .jsonl로)"""
+    if output_format == 'jsonl':
+        return os.path.splitext(path)[0] + '.jsonl'
+    return path
+
+
+def api_continent_of(raw: Dict) -> str:
+    """원본 레코드의 국가명 → API continent 값 (모르는 국가는 '')"""
+    return KR_CONTINENT_API.get(MarathonParser.get_continent_kr(raw.get('country', '')), '')
+
+
+def make_race_filter(date_from: Optional[date] = None, date_to: Optional[date] = None,
+                     continents: Optional[List[str]] = None, race_types: Optional[List[str]] = None,
+                     countries: Optional[List[str]] = None) -> RaceFilter:
+    """worldsmarathons 원본 레코드용 RaceFilter (대륙은 국가명으로 판정)"""
+    return RaceFilter(date_from=date_from, date_to=date_to, continents=continents,
+                      race_types=race_types, countries=countries, continent_of=api_continent_of)
+
+
+def fetch_marathon_data(concurrent: bool = False, max_workers: int = 8,
+                        requests_per_second: float = 1 / 0.3,
+                        use_cache: bool = True, cache_ttl_hours: float = 6,
+                        resume: bool = False, incremental: bool = True,
+                        race_filter: Optional[RaceFilter] = None, parse_workers: int = 1,
+                        output_format: str = 'json', compact_output: bool = False,
+                        build_index: bool = True, shards: bool = True, changefeed: bool = True):
+    """
+    마라톤 데이터 가져오기 및 파싱 (API 1000개 제한 우회)
+
+    Args:
+        concurrent: True면 같은 분할 단계의 쿼리를 병렬로 요청
+        max_workers: 병렬 모드의 동시 요청 스레드 수
+        requests_per_second: worldsmarathons.com 초당 요청 수 제한
+        use_cache: 검색 API 응답 디스크 캐시 사용 (data/http_cache.sqlite)
+        cache_ttl_hours: 캐시를 재검증 없이 그대로 쓰는 시간
+        resume: True면 이전 실행의 체크포인트에서 완료된 파티션을 건너뛰고 이어서 수집
+        incremental: True면 이전 실행과 내용 해시가 같은 레코드는 파싱 결과를 재사용하고
+            새로 생기거나 바뀐 레코드만 번역/파싱/비자 병합
+        race_filter: 수집 범위 (날짜 구간/대륙/종목/국가, 기본: 오늘 이후 전체)
+            — 분할 쿼리 시작 파티션을 좁히고, 범위 밖 레코드는 번역/파싱 전에 제외
+        parse_workers: 2 이상이면 수집/번역 후 ProcessPoolExecutor로 청크 단위 병렬 파싱
+        output_format: 'json'(기본) 또는 'jsonl' — jsonl이면 원본은 수신하는 대로 한 줄씩 기록
+        compact_output: True면 들여쓰기 없이 저장
+        build_index: True면 파싱 결과의 .jsonl 형태 옆에 id → 바이트 위치 인덱스(.idx) 저장
+        shards: True면 대륙 × 월 샤드와 manifest를 SHARDS_DIR에 저장
+        changefeed: True면 이전 실행 대비 추가/삭제/필드 변경분을 CHANGEFEED_DIR에 기록
+    """
+
+    url = SEARCH_API_URL
     base_params = {
         "sport": "running",
         "all": "true",
         "currency": "EUR"
     }
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        "Referer": "https://worldsmarathons.com/",
-        "Accept": "application/json"
-    }
-
+    race_filter = race_filter or make_race_filter()
     all_raw = {}  # id -> raw data (중복 제거용)
-
-    def fetch_and_add(extra_params, label):
-        """API 요청 후 결과를 all_raw에 추가, 중복 제거"""
-        params = {**base_params, **extra_params}
-        resp = requests.get(url, params=params, headers=headers, timeout=30)
+    all_raw_lock = threading.Lock()
+    configure_host(urlparse(url).netloc, requests_per_second)
+    cache = ResponseCache('data/http_cache.sqlite', ttl_seconds=cache_ttl_hours * 3600) if use_cache else None
+    checkpoint = PartitionCheckpoint('data/marathons_global_checkpoint.jsonl', resume=resume)
+    raw_path = dataset_path(RAW_PATH, output_format)
+    parsed_path = dataset_path(PARSED_PATH, output_format)
+    # jsonl: 신규 원본을 수신 즉시 임시 파일에 기록 → 수집 완료 시 manifest 추가 후 rename
+    raw_writer = JsonlWriter(raw_path) if output_format == 'jsonl' else None
+
+    def request_partition(params, label):
+        """API 요청만 수행 (캐시 우선) → (results, count), 실패시 (None, 0)"""
+        fresh = cache.get_fresh(url, params) if cache else None
+        if fresh:
+            data = json.loads(fresh.body)
+            return data.get('results', []), data.get('count', 0)
+        entry = cache.get(url, params) if cache else None  # TTL 지난 항목은 조건부 요청에 사용
+
+        resp = http_client.get(url, params=params, headers=ResponseCache.conditional_headers(entry))
+        if resp.status_code == 304 and entry:
+            # 서버 재검증 통과 → 캐시 본문 재사용
+            cache.touch(url, params)
+            data = json.loads(entry.body)
+            return data.get('results', []), data.get('count', 0)
         if resp.status_code != 200:
             print(f"  ⚠️  {label}: HTTP {resp.status_code}")
-            return []
+            return None, 0
         data = resp.json()
-        results = data.get('results', [])
-        api_count = data.get('count', 0)
-        new = 0
-        for r in results:
-            rid = r.get('id', '')
-            if rid and rid not in all_raw:
-                all_raw[rid] = r
-                new += 1
-        print(f"  {label}: 총{api_count}개 중 {len(results)}개 수신, 신규 {new}개 (누적 {len(all_raw)}개)")
-        time.sleep(0.3)
-        return results
+        if cache:
+            cache.put(url, params, resp.content,
+                      resp.headers.get('ETag'), resp.headers.get('Last-Modified'))
+        return data.get('results', []), data.get('count', 0)
+
+    def fetch_partition(extra_params, label):
+        """체크포인트 → 캐시 → API 순으로 조회, 완료된 파티션은 체크포인트에 기록"""
+        params = {**base_params, **extra_params}
+        done = checkpoint.get(params)
+        if done is not None:
+            return done
+        results, api_count = request_partition(params, label)
+        if results is not None:
+            checkpoint.save(params, results, api_count)
+        return results, api_count
+
+    def add_results(results, api_count, label):
+        """결과를 all_raw에 추가, 중복 제거 (thread-safe) → (results, count)"""
+        if results is None:
+            return None, api_count
+        with all_raw_lock:
+            new = []
+            for r in results:
+                rid = r.get('id', '')
+                if rid and rid not in all_raw:
+                    all_raw[rid] = r
+                    new.append(r)
+                    if raw_writer:
+                        raw_writer.write(r)
+            total = len(all_raw)
+        print(f"  {label}: 총{api_count}개 중 {len(results)}개 수신, 신규 {len(new)}개 (누적 {total}개)")
+        in_scope = race_filter.apply(new)  # 지난 대회/범위 밖 레코드는 번역 전에 제외
+        if in_scope:
+            pipeline.put(in_scope)  # 번역 단계가 밀려 있으면 여기서 대기 (backpressure)
+        return results, api_count
+
+    def fetch_and_add(extra_params, label):
+        """API 요청 후 결과를 all_raw에 추가, 중복 제거"""
+        return add_results(*fetch_partition(extra_params, label), label)
+
+    def fetch_many(queries):
+        """
+        여러 분할 쿼리 실행 → 쿼리별 (results, count) 리스트 (입력 순서 유지)
+        병렬 모드에서도 제출 순서대로 병합하므로 직렬 모드와 같은 중복 제거 결과
+        """
+        if not concurrent or len(queries) < 2:
+            return [fetch_and_add(extra_params, label) for extra_params, label in queries]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(fetch_partition, extra_params, label)
+                       for extra_params, label in queries]
+            return [add_results(*future.result(), label)
+                    for future, (_, label) in zip(futures, queries)]
 
     print("=" * 70)
     print("🏃 World's Marathons 전체 데이터 수집 시작")
+    if resume:
+        print(f"   ♻️  이어서 수집: 체크포인트에 완료된 파티션 {len(checkpoint)}개")
+    if concurrent:
+        print(f"   ⚡ 병렬 모드: 동시 {max_workers}개, 초당 {requests_per_second:.1f}회 제한")
+    print(f"   🔍 수집 범위: {race_filter.describe()}")
     print("=" * 70)
 
-    try:
-        # Phase 1: 소규모 대륙 (각 1000개 이하 → 전체 수신 가능)
-        print("\n📡 Phase 1: 소규모 대륙")
-        for cont in ['asia', 'africa', 'South America', 'australia', 'Antarctica']:
-            fetch_and_add({'continent': cont}, cont)
-
-        # Phase 2: 유럽 - raceType별 분할 (half_marathon만 1211개로 초과)
-        print("\n📡 Phase 2: 유럽 (raceType별)")
-        eu_countries = set()
-        for rt in ['full_marathon', 'ultra_marathon', 'custom']:
-            results = fetch_and_add({'continent': 'europe', 'raceType': rt}, f'europe/{rt}')
-            for r in results:
-                c = r.get('country', '')
-                if c:
-                    eu_countries.add(c)
-
-        # 유럽 half_marathon: 1211개 > 1000 제한 → 국가별 분할
-        print("\n📡 Phase 3: 유럽 half_marathon (국가별)")
-        seed = fetch_and_add({'continent': 'europe', 'raceType': 'half_marathon'}, 'europe/half(seed)')
-        for r in seed:
-            c = r.get('country', '')
-            if c:
-                eu_countries.add(c)
-        for country in sorted(eu_countries):
-            fetch_and_add({'country': country, 'raceType': 'half_marathon'}, f'  {country}/half')
-
-        # Phase 4: 북미 - raceType별 분할 (각각 1000 이하)
-        print("\n📡 Phase 4: 북미 (raceType별)")
-        na_countries = set()
-        for rt in ['full_marathon', 'half_marathon', 'ultra_marathon', 'custom']:
-            results = fetch_and_add({'continent': 'North America', 'raceType': rt}, f'NA/{rt}')
-            for r in results:
-                c = r.get('country', '')
-                if c:
-                    na_countries.add(c)
-
-        # Phase 5: 북미 국가별 개별 쿼리 (누락분 보충)
-        print("\n📡 Phase 5: 북미 국가별")
-        for country in sorted(na_countries):
-            fetch_and_add({'country': country}, f'  {country}')
-
-        # Phase 6: 유럽 국가별 전체 쿼리 (raceType 없이, 누락분 보충)
-        print("\n📡 Phase 6: 유럽 국가별 (전체)")
-        for country in sorted(eu_countries):
-            fetch_and_add({'country': country}, f'  {country}')
-
-        # Phase 7: 기본 쿼리로 누락분 보충
-        print("\n📡 Phase 7: 기본 쿼리 (누락분 보충)")
-        fetch_and_add({}, 'catch-all')
-        # 누락된 대륙/지역 추가 시도
-        for cont in ['Oceania', 'Central America', 'Middle East']:
-            fetch_and_add({'continent': cont}, f'  {cont}')
+    # 수집과 동시에 번역/파싱: 파티션 결과가 도착하는 대로 신규 레코드를 번역 → 파싱 단계로 흘려보냄
+    # 이전 실행과 내용 해시가 같은 레코드는 파싱 결과를 재사용
+    MarathonParser.load_translation_store()
+    translation_limiter = MarathonParser.translation_limiter()  # 파티션 배치 사이에도 조절된 한도 유지
+    cache_initial_size = len(MarathonParser._translation_cache)
+    delta = RecordDelta(DELTA_HASHES_PATH, parsed_path,
+                        fingerprint=parser_fingerprint(),
+                        incremental=incremental)
+    visa_index = load_visa_index(VISA_PATH) if os.path.exists(VISA_PATH) else None
+    reused_marathons, new_marathons = [], []
+    pending_raw = []  # 병렬 파싱 모드: 번역까지 끝난 변경 원본
+
+    def translate_stage(batch):
+        """변경분만 골라 아직 번역 안 된 도시명 번역 → (변경 원본, 재사용 결과)"""
+        changed, reused = delta.split(batch, MarathonParser.known_city_kr)
+        cities = [city for city in collect_cities(changed)
+                  if city not in MarathonParser._translation_cache and city not in MarathonParser.CITY_KR]
+        if cities:
+            MarathonParser.translate_cities_batch(cities, translation_limiter)
+        return changed, reused
+
+    def parse_stage(item):
+        """변경 원본 파싱 + 비자 정보 병합 (병렬 파싱 모드는 모아 두었다가 수집 후 한꺼번에)"""
+        changed, reused = item
+        reused_marathons.extend(reused)
+        if parse_workers > 1:
+            pending_raw.extend(changed)
+            return
+        parsed = parse_marathons(changed, progress=False)
+        if visa_index is not None:
+            apply_visa(parsed, visa_index)
+        new_marathons.extend(compact(parsed))  # 메모리 절약형 레코드로 보관
+
+    pipeline = StagePipeline([('번역', translate_stage), ('파싱', parse_stage)],
+                             maxsize=PIPELINE_QUEUE_SIZE)
 
+    try:
+        start_time = time.time()
+        if visa_index is None:
+            print(f"⚠️  {VISA_PATH} 없음 → 비자 정보 병합 생략")
+
+        # count > 수신 개수인 파티션만 continent → raceType → country → 날짜 구간으로 재귀 분할
+        print("\n📡 적응형 분할 쿼리")
+        countries_by_continent = {}
+        for country, continent_kr in MarathonParser.COUNTRY_CONTINENT_KR.items():
+            for api_continent, kr in API_CONTINENT_KR.items():
+                if kr == continent_kr:
+                    countries_by_continent.setdefault(api_continent, []).append(country)
+        planner = QueryPlanner(continents=race_filter.continents or list(API_CONTINENT_KR),
+                               race_types=race_filter.race_types or list(MarathonParser.RACE_TYPE_KR),
+                               countries_by_continent=countries_by_continent,
+                               roots=race_filter.partition_roots())
+        plan_stats = planner.plan(fetch_many)
+        print(f"\n📡 요청 {plan_stats['requests']}회 | 완전 수신 {plan_stats['complete']}개 | "
+              f"분할 {plan_stats['split']}개 | 실패 {plan_stats['failed']}개 | "
+              f"미수집 {plan_stats['uncovered']}개 (분할 불가 파티션 {plan_stats['unsplittable']}개, "
+              f"요청 상한으로 생략 {plan_stats['skipped']}개)")
+        throttled = get_limiter(urlparse(url).netloc).throttled
+        if throttled:
+            print(f"⏳ 서버 속도 제한(429/503) {throttled}회 → Retry-After 대기 후 재시도")
+        if cache:
+            print(f"💾 응답 캐시: 적중 {cache.stats['hits']}개 | "
+                  f"재검증(304) {cache.stats['revalidated']}개 | 신규 저장 {cache.stats['stored']}개")
+
+        fetch_time = time.time() - start_time
         all_results = list(all_raw.values())
         print(f"\n📊 최종 수집: {len(all_results)}개 (중복 제거 완료)")
+        print(f"   🔍 범위 내 {race_filter.stats['kept']}개 | "
+              f"범위 밖/지난 대회 {race_filter.stats['dropped']}개 (번역/파싱 생략)")
 
         if not all_results:
             print("⚠️  결과 데이터가 비어있습니다.")
@@ -1189,89 +1452,62 @@ def fetch_marathon_data():
 
         # 원본 데이터 저장
         print("\n💾 원본 데이터 저장 중...")
-        import os
-        os.makedirs('data', exist_ok=True)
-        raw_output = {'count': len(all_results), 'results': all_results}
-        with open("data/marathons_global_raw.json", "w", encoding="utf-8") as f:
-            json.dump(raw_output, f, ensure_ascii=False, indent=2)
-        print(f"✅ data/marathons_global_raw.json 저장 완료 ({len(all_results)}개)")
-
-        # 파싱 전 단계: 모든 도시명 수집 및 사전 번역 (병렬)
-        print("\n🔄 데이터 파싱 중...")
-        print(f"   총 {len(all_results)}개 처리 예정")
-
-        start_time = time.time()
-        cache_initial_size = len(MarathonParser._translation_cache)
-
-        # Step 1: 모든 도시명 수집
-        print("\n📍 Step 1: 도시명 수집 중...")
-        all_cities = set()
-        for raw in all_results:
-            city = raw.get('city', '')
-            if city and city.strip():
-                all_cities.add(city)
-
-        print(f"   총 {len(all_cities)}개 고유 도시명 발견")
-
-        # Step 2: 병렬 번역 (캐시에 없는 것만)
-        print("\n🌐 Step 2: 병렬 번역 시작...")
-        MarathonParser.translate_cities_batch(list(all_cities), max_workers=15)
-
-        translation_time = time.time() - start_time
+        if raw_writer:
+            raw_writer.close({'fetched_at': datetime.now().isoformat()})
+        else:
+            write_json_array(raw_path, {'count': len(all_results)}, 'results', all_results,
+                             compact=compact_output)
+        print(f"✅ {raw_path} 저장 완료 ({len(all_results)}개)")
+        checkpoint.remove()  # 원본 저장까지 끝났으므로 다음 실행은 처음부터
+        all_raw.clear()  # 이후로는 all_results만 사용
+
+        # 수집이 끝나면 남은 번역/파싱만 마무리
+        print("\n🔄 남은 번역/파싱 마무리 중...")
+        pipeline.close()
+        if pending_raw:
+            print(f"   🧮 병렬 파싱: {len(pending_raw)}개 (프로세스 {parse_workers}개)")
+            parsed = parse_marathons_parallel(pending_raw, workers=parse_workers)
+            if visa_index is not None:
+                apply_visa(parsed, visa_index)
+            new_marathons.extend(compact(parsed))
+            pending_raw.clear()
+        pipeline_time = time.time() - start_time
+        parsed_marathons = merge_in_order(all_results, reused_marathons, new_marathons)
         new_translations = len(MarathonParser._translation_cache) - cache_initial_size
-        print(f"   ⚡ 번역 완료: {new_translations}개 (소요 시간: {translation_time:.1f}초)")
-
-        # Step 3: 파싱 (이제 번역이 캐시에 있으므로 빠름)
-        print("\n📝 Step 3: 마라톤 데이터 파싱...")
-        parsed_marathons = []
-        parse_start = time.time()
-
-        for i, raw_marathon in enumerate(all_results, 1):
-            try:
-                parsed = MarathonParser.parse_marathon(raw_marathon)
-                if parsed is None:
-                    continue
-                parsed_marathons.append(parsed)
-
-                # 진행 상황 출력 (500개마다)
-                if i % 500 == 0:
-                    elapsed = time.time() - parse_start
-                    progress = (i / len(all_results)) * 100
-                    avg_time = elapsed / i
-                    eta = (len(all_results) - i) * avg_time
-                    print(f"   [{progress:5.1f}%] {i:4d}/{len(all_results)} 처리 완료 | "
-                          f"예상 남은 시간: {eta:5.1f}초")
-            except Exception as e:
-                print(f"   ⚠️  {i}번째 마라톤 파싱 실패: {e}")
-                continue
-
-        parse_time = time.time() - parse_start
-        total_time = time.time() - start_time
 
-        print(f"\n✅ 파싱 완료: {len(parsed_marathons)}개")
-        print(f"   🌐 신규 번역: {new_translations}개 (병렬 처리: {translation_time:.1f}초)")
-        print(f"   📝 데이터 파싱: {parse_time:.1f}초")
-        print(f"   ⏱️  총 소요 시간: {total_time:.1f}초")
+        print(f"\n✅ 파싱 완료: {len(parsed_marathons)}개 (새로 파싱 {len(new_marathons)}개, "
+              f"재사용 {len(reused_marathons)}개)")
+        print(f"   신규 {delta.stats['new']}개 | 변경 {delta.stats['changed']}개 | "
+              f"변경 없음 {delta.stats['unchanged']}개 (지난 대회 {delta.stats['expired']}개 제외)")
+        print(f"   🌐 신규 번역: {new_translations}개")
+        concurrency = translation_limiter.stats()
+        if concurrency['successes'] or concurrency['failures']:
+            print(f"   🔀 번역 동시성 (전체 배치): 평균 {concurrency['avg_inflight']:.1f}개 | "
+                  f"최대 {concurrency['peak_inflight']}개 | 최종 한도 {concurrency['final_limit']}개 | "
+                  f"요청 {concurrency['successes'] + concurrency['failures']}회 "
+                  f"(실패 {concurrency['failures']}회)")
+        stage_sum = fetch_time + sum(pipeline.busy.values())
+        print(f"   ⏱️  단계별: 수집 {fetch_time:.1f}초 | 번역 {pipeline.busy['번역']:.1f}초 | "
+              f"파싱 {pipeline.busy['파싱']:.1f}초 (합계 {stage_sum:.1f}초)")
+        print(f"   ⏱️  총 소요 시간: {pipeline_time:.1f}초 (수집/번역/파싱 동시 진행)")
         print(f"   📦 번역 캐시 크기: {len(MarathonParser._translation_cache)}개")
-        if new_translations > 0:
-            speed_improvement = (new_translations * 0.05) / translation_time
-            print(f"   ⚡ 속도 개선: 기존 대비 약 {speed_improvement:.1f}배 빠름!")
+        if MarathonParser._translation_store:
+            print(f"   💾 번역 저장소: {MarathonParser.TRANSLATION_STORE_PATH} "
+                  f"(실패 기록 {MarathonParser._translation_store.failure_count()}개, 다음 실행에서 재시도)")
 
         # 파싱된 데이터 저장
         print("\n💾 파싱된 데이터 저장 중...")
-        output = {
-            'metadata': {
-                'total_count': len(parsed_marathons),
-                'parsed_count': len(parsed_marathons),
-                'fetched_at': datetime.now().isoformat(),
-                'api_url': url,
-                'currency': base_params.get('currency', 'EUR')
-            },
-            'marathons': parsed_marathons
-        }
-        with open("data/marathons_global.json", "w", encoding="utf-8") as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
-        print(f"✅ data/marathons_global.json 저장 완료")
+        fetched_at = datetime.now().isoformat()
+        save_parsed_marathons(parsed_marathons, parsed_path, fetched_at=fetched_at,
+                              currency=base_params.get('currency', 'EUR'), compact=compact_output,
+                              index=build_index)
+        delta.save()
+        print(f"✅ {parsed_path} 저장 완료")
+        if shards:
+            print_shard_export(export_shards(parsed_marathons, SHARDS_DIR, fetched_at=fetched_at,
+                                             compact=compact_output))
+        if changefeed:
+            print_changefeed('해외 대회', Changefeed(CHANGEFEED_DIR).publish(parsed_marathons))
 
         # 통계 출력
         print_statistics(parsed_marathons)
@@ -1283,9 +1519,11 @@ def fetch_marathon_data():
 
     except requests.exceptions.Timeout:
         print("❌ 요청 타임아웃")
+        print_resume_hint(checkpoint)
         return []
     except requests.exceptions.RequestException as e:
         print(f"❌ 네트워크 오류: {e}")
+        print_resume_hint(checkpoint)
         return []
     except json.JSONDecodeError as e:
         print(f"❌ JSON 파싱 오류: {e}")
@@ -1293,6 +1531,211 @@ def fetch_marathon_data():
     except Exception as e:
         print(f"❌ 예상치 못한 오류: {e}")
         return []
+    finally:
+        pipeline.abort()  # 정상 종료 시에는 이미 비어 있음
+        if raw_writer:
+            raw_writer.discard()  # 중단 시 쓰다 만 원본은 버림 (정상 종료 시에는 이미 rename됨)
+
+
+def collect_cities(raw_marathons: Iterable[Dict]) -> Set[str]:
+    """원본 데이터에서 고유 도시명 수집"""
+    all_cities = set()
+    for raw in raw_marathons:
+        city = raw.get('city', '')
+        if city and city.strip():
+            all_cities.add(city)
+    return all_cities
+
+
+def parse_marathons(raw_marathons: Iterable[Dict], total: Optional[int] = None,
+                    progress: bool = True) -> List[Dict]:
+    """
+    원본 데이터를 순서대로 파싱 (지난 대회/파싱 실패는 제외)
+
+    Args:
+        raw_marathons: 원본 API 레코드 (리스트 또는 스트리밍 이터레이터)
+        total: 진행률 표시에 쓸 전체 개수 (모르면 None)
+        progress: 500개마다 진행 상황 출력
+    """
+    parsed_marathons = []
+    parse_start = time.time()
+    today = date.today()
+
+    for i, raw_marathon in enumerate(raw_marathons, 1):
+        try:
+            parsed = MarathonParser.parse_marathon(raw_marathon, today=today)
+            if parsed is None:
+                continue
+            parsed_marathons.append(parsed)
+
+            # 진행 상황 출력 (500개마다)
+            if progress and i % 500 == 0:
+                if total:
+                    elapsed = time.time() - parse_start
+                    progress = (i / total) * 100
+                    avg_time = elapsed / i
+                    eta = (total - i) * avg_time
+                    print(f"   [{progress:5.1f}%] {i:4d}/{total} 처리 완료 | "
+                          f"예상 남은 시간: {eta:5.1f}초")
+                else:
+                    print(f"   {i:4d}개 처리 완료")
+        except Exception as e:
+            print(f"   ⚠️  {i}번째 마라톤 파싱 실패: {e}")
+            continue
+
+    return parsed_marathons
+
+
+def _init_parse_worker(translations: Dict[str, str]):
+    """파싱 워커 프로세스 초기화: 번역 맵을 한 번만 받아 캐시로 사용 (저장소/API 사용 안 함)"""
+    MarathonParser._translation_cache = translations
+    MarathonParser._translation_store = None
+    MarathonParser._store_loaded = True
+
+
+def _parse_chunk(chunk: List[Dict]) -> List[Dict]:
+    return parse_marathons(chunk, progress=False)
+
+
+def parse_marathons_parallel(raw_marathons: Iterable[Dict], workers: Optional[int] = None,
+                             chunk_size: int = PARSE_CHUNK_SIZE) -> List[Dict]:
+    """
+    ProcessPoolExecutor로 청크 단위 병렬 파싱 (입력 순서 유지)
+    번역은 미리 끝나 있어야 함 — 캐시에 없는 도시명은 원본 유지 (워커에서 API 호출 안 함)
+
+    Args:
+        raw_marathons: 원본 API 레코드
+        workers: 프로세스 수 (기본: CPU 수)
+        chunk_size: 워커에 한 번에 넘기는 레코드 수
+    """
+    raw_marathons = list(raw_marathons)
+    if len(raw_marathons) < chunk_size * 2 or workers == 1:
+        return parse_marathons(raw_marathons, progress=False)
+
+    MarathonParser.load_translation_store()
+    translations = dict(MarathonParser._translation_cache)
+    for city in collect_cities(raw_marathons):
+        translations.setdefault(city, MarathonParser.CITY_KR.get(city, city))
+
+    chunks = [raw_marathons[i:i + chunk_size] for i in range(0, len(raw_marathons), chunk_size)]
+    parsed_marathons = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker,
+                             initargs=(translations,)) as executor:
+        for parsed in executor.map(_parse_chunk, chunks):
+            parsed_marathons.extend(parsed)
+    return parsed_marathons
+
+
+def save_parsed_marathons(parsed_marathons: List, path: str, fetched_at: str,
+                          currency: str = 'EUR', compact: bool = False, index: bool = True,
+                          **extra_metadata):
+    """
+    파싱된 데이터를 앱용 JSON 구조(metadata + marathons)로 저장
+    레코드(dict 또는 Marathon)를 하나씩 직렬화하므로 전체 dict 목록을 다시 만들지 않음
+    path가 .jsonl이면 레코드 한 줄씩 + 마지막 줄에 metadata(manifest)
+    index=True면 .jsonl 형태 옆에 id 인덱스(.idx)도 저장 (catalogue_index.CatalogueIndex로 조회)
+    """
+    metadata = {
+        'total_count': len(parsed_marathons),
+        'parsed_count': len(parsed_marathons),
+        'fetched_at': fetched_at,
+        'api_url': SEARCH_API_URL,
+        'currency': currency,
+        **extra_metadata,
+    }
+    records = (m.to_dict() if isinstance(m, Marathon) else m for m in parsed_marathons)
+    save_catalogue(path, metadata, records, compact=compact, index=index)
+
+
+def reparse_raw_data(raw_path: str = RAW_PATH,
+                     output_path: str = PARSED_PATH,
+                     visa_path: str = VISA_PATH,
+                     race_filter: Optional[RaceFilter] = None,
+                     parse_workers: int = 1, compact: bool = False,
+                     index: bool = True, shards: bool = True, changefeed: bool = True) -> List[Dict]:
+    """
+    저장된 원본 데이터로 번역 → 파싱 → 비자 병합만 다시 실행 (API 수집 없음)
+    SURFACE_KR, TAG_KR 등 변환 테이블 수정 후 marathons_global.json 재생성용
+    race_filter 범위 밖 레코드는 번역/파싱하지 않음 (기본: 오늘 이후 전체)
+    parse_workers가 2 이상이면 파싱을 프로세스 풀로 병렬 실행
+    원본/출력 형식은 확장자로 판단 (.jsonl이면 JSON Lines)
+    """
+    race_filter = race_filter or make_race_filter()
+
+    def in_scope_records():
+        return (raw for raw in iter_records(raw_path, 'results') if race_filter.matches(raw))
+
+    print("=" * 70)
+    print(f"♻️  원본 데이터 재파싱: {raw_path} → {output_path}")
+    print(f"   🔍 범위: {race_filter.describe()}")
+    print("=" * 70)
+
+    timings = []
+    total_start = time.time()
+
+    # 1) 도시명 수집 (원본 파일 스트리밍 1회차)
+    stage_start = time.time()
+    all_cities = collect_cities(in_scope_records())
+    timings.append(('도시명 수집', time.time() - stage_start))
+    print(f"\n📍 고유 도시명 {len(all_cities)}개")
+
+    # 2) 번역 (저장소/캐시에 없는 것만 API 호출)
+    stage_start = time.time()
+    MarathonParser.load_translation_store()
+    cache_initial_size = len(MarathonParser._translation_cache)
+    MarathonParser.translate_cities_batch(list(all_cities))
+    new_translations = len(MarathonParser._translation_cache) - cache_initial_size
+    timings.append((f'번역 (신규 {new_translations}개)', time.time() - stage_start))
+
+    # 3) 파싱 (원본 파일 스트리밍 2회차)
+    stage_start = time.time()
+    if parse_workers > 1:
+        parsed_marathons = parse_marathons_parallel(in_scope_records(), workers=parse_workers)
+    else:
+        parsed_marathons = parse_marathons(in_scope_records())
+    timings.append(('파싱', time.time() - stage_start))
+    print(f"\n📝 파싱 완료: {len(parsed_marathons)}개")
+
+    # 4) 비자 병합 (프로세스 내에서 바로 적용)
+    stage_start = time.time()
+    matched, unmatched, _ = apply_visa(parsed_marathons, load_visa_index(visa_path))
+    timings.append((f'비자 병합 (매칭 {matched}개 / 실패 {unmatched}개)', time.time() - stage_start))
+
+    # 5) 저장 (수집 시각은 원본 파일 기준)
+    stage_start = time.time()
+    fetched_at = datetime.fromtimestamp(os.path.getmtime(raw_path)).isoformat()
+    save_parsed_marathons(parsed_marathons, output_path, fetched_at=fetched_at, compact=compact,
+                          index=index, reparsed_at=datetime.now().isoformat())
+    timings.append(('저장', time.time() - stage_start))
+    if shards:
+        stage_start = time.time()
+        print_shard_export(export_shards(parsed_marathons, SHARDS_DIR, fetched_at=fetched_at, compact=compact))
+        timings.append(('샤드 내보내기', time.time() - stage_start))
+    if changefeed:
+        stage_start = time.time()
+        print_changefeed('해외 대회', Changefeed(CHANGEFEED_DIR).publish(parsed_marathons))
+        timings.append(('변경 피드', time.time() - stage_start))
+
+    print("\n⏱️  단계별 소요 시간:")
+    for stage, elapsed in timings:
+        print(f"   {stage}: {elapsed:.2f}초")
+    print(f"   총: {time.time() - total_start:.2f}초")
+    print(f"\n✅ {output_path} 저장 완료 ({len(parsed_marathons)}개)")
+    return parsed_marathons
+
+
+def print_shard_export(manifest: Dict):
+    """샤드 내보내기 결과 출력"""
+    stats = manifest['stats']
+    print(f"🗂️  샤드 {len(manifest['shards'])}개 → {SHARDS_DIR}/manifest.json "
+          f"(새로 씀 {stats['written']}개 | 변경 없음 {stats['unchanged']}개 | 삭제 {stats['removed']}개)")
+
+
+def print_resume_hint(checkpoint: PartitionCheckpoint):
+    """수집 중단 시 체크포인트 안내"""
+    if len(checkpoint):
+        print(f"   💾 완료된 파티션 {len(checkpoint)}개는 {checkpoint.path}에 저장됨 "
+              f"→ --resume 옵션으로 이어서 수집 가능")
 
 
 def print_statistics(marathons: List[Dict]):
@@ -1381,15 +1824,100 @@ def print_samples(marathons: List[Dict]):
 
 
 if __name__ == "__main__":
-    marathons = fetch_marathon_data()
+    import argparse
+
+    def shared_options(subcommand=False):
+        """
+        수집과 reparse 공용 옵션 (범위 필터, 파싱, 저장 형식) — 서브커맨드 앞/뒤 어디에 써도 됨
+        서브커맨드용은 기본값을 두지 않아 명령 앞에 준 값을 덮어쓰지 않음
+        """
+        def default(value):
+            return argparse.SUPPRESS if subcommand else value
+
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument('--from', dest='date_from', type=date.fromisoformat, default=default(None),
+                            help='이 날짜(YYYY-MM-DD) 이후 대회만 (기본: 오늘)')
+        parser.add_argument('--to', dest='date_to', type=date.fromisoformat, default=default(None),
+                            help='이 날짜(YYYY-MM-DD)까지의 대회만')
+        parser.add_argument('--continent', type=parse_list, default=default(None),
+                            help=f"대륙 (쉼표 구분, 예: europe,asia / 가능한 값: {', '.join(API_CONTINENT_KR)})")
+        parser.add_argument('--race-type', type=parse_list, default=default(None),
+                            help=f"종목 (쉼표 구분, 가능한 값: {', '.join(MarathonParser.RACE_TYPE_KR)})")
+        parser.add_argument('--country', type=parse_list, default=default(None),
+                            help='국가 영문명 (쉼표 구분, 예: Japan,France)')
+        parser.add_argument('--parse-workers', type=int, default=default(1),
+                            help='파싱 프로세스 수 (2 이상이면 청크 단위 병렬 파싱, 기본 1)')
+        parser.add_argument('--format', choices=['json', 'jsonl'], default=default('json'),
+                            help='저장 형식 (jsonl: 레코드 한 줄씩 + 마지막 줄 manifest, 기본 json)')
+        parser.add_argument('--compact', action='store_true', default=default(False),
+                            help='들여쓰기 없이 저장 (파일 크기/저장 시간 절약)')
+        parser.add_argument('--no-index', action='store_true', default=default(False),
+                            help='파싱 결과의 id 인덱스(.jsonl + .idx)를 만들지 않음')
+        parser.add_argument('--no-shards', action='store_true', default=default(False),
+                            help='대륙 × 월 샤드(data/shards)를 만들지 않음')
+        parser.add_argument('--no-changefeed', action='store_true', default=default(False),
+                            help='실행별 변경 피드(data/changefeed/global)를 기록하지 않음')
+        return parser
+
+    arg_parser = argparse.ArgumentParser(description="World's Marathons 해외 대회 수집",
+                                         parents=[shared_options()])
+    arg_parser.add_argument('--concurrent', action='store_true',
+                            help='분할 쿼리를 병렬로 요청')
+    arg_parser.add_argument('--workers', type=int, default=8,
+                            help='병렬 모드 동시 요청 수 (기본 8)')
+    arg_parser.add_argument('--rps', type=float, default=1 / 0.3,
+                            help='worldsmarathons.com 초당 요청 수 제한 (기본 약 3.3)')
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help='검색 API 응답 캐시를 사용하지 않음')
+    arg_parser.add_argument('--cache-ttl', type=float, default=6,
+                            help='응답 캐시를 재검증 없이 사용하는 시간 (기본 6시간)')
+    arg_parser.add_argument('--resume', action='store_true',
+                            help='중단된 수집을 체크포인트에서 이어서 진행')
+    arg_parser.add_argument('--full', action='store_true',
+                            help='이전 실행 결과를 재사용하지 않고 전체 레코드를 다시 번역/파싱')
+    subparsers = arg_parser.add_subparsers(dest='command')
+    reparse_parser = subparsers.add_parser(
+        'reparse', parents=[shared_options(subcommand=True)],
+        help='API 수집 없이 저장된 원본 데이터로 번역/파싱/비자 병합만 다시 실행')
+    reparse_parser.add_argument('--raw',
+                                help='원본 데이터 경로 (기본 data/marathons_global_raw.json, --format jsonl이면 .jsonl)')
+    reparse_parser.add_argument('--output',
+                                help='출력 경로 (기본 data/marathons_global.json, --format jsonl이면 .jsonl)')
+    args = arg_parser.parse_args()
+    race_filter = make_race_filter(date_from=args.date_from, date_to=args.date_to,
+                                   continents=args.continent, race_types=args.race_type,
+                                   countries=args.country)
+
+    if args.command == 'reparse':
+        args.raw = args.raw or dataset_path(RAW_PATH, args.format)
+        args.output = args.output or dataset_path(PARSED_PATH, args.format)
+        if not os.path.exists(args.raw):
+            print(f"❌ 원본 데이터가 없습니다: {args.raw}")
+            print("   먼저 python crawl_global.py 로 수집을 실행하세요.")
+            raise SystemExit(1)
+        reparse_raw_data(raw_path=args.raw, output_path=args.output, race_filter=race_filter,
+                         parse_workers=args.parse_workers, compact=args.compact,
+                         index=not args.no_index, shards=not args.no_shards,
+                         changefeed=not args.no_changefeed)
+        http_client.print_stats()
+        raise SystemExit(0)
+
+    marathons = fetch_marathon_data(concurrent=args.concurrent, max_workers=args.workers,
+                                    requests_per_second=args.rps,
+                                    use_cache=not args.no_cache, cache_ttl_hours=args.cache_ttl,
+                                    resume=args.resume, incremental=not args.full,
+                                    race_filter=race_filter, parse_workers=args.parse_workers,
+                                    output_format=args.format, compact_output=args.compact,
+                                    build_index=not args.no_index, shards=not args.no_shards,
+                                    changefeed=not args.no_changefeed)
 
     if marathons:
         print("\n" + "=" * 70)
         print("✅ 크롤링 완료!")
         print("=" * 70)
         print(f"\n저장된 파일:")
-        print(f"  1. data/marathons_global_raw.json - 원본 API 응답")
-        print(f"  2. data/marathons_global.json - 파싱된 데이터")
+        print(f"  1. {dataset_path(RAW_PATH, args.format)} - 원본 API 응답")
+        print(f"  2. {dataset_path(PARSED_PATH, args.format)} - 파싱된 데이터")
         print(f"\n총 {len(marathons)}개의 마라톤 데이터 수집 완료! 🎉")
 
         # visa 데이터 자동 병합
@@ -1399,10 +1927,10 @@ if __name__ == "__main__":
         try:
             import subprocess
 
-            # visa 데이터 병합 실행
+            # visa 데이터 병합 실행 (marathons_global.json은 파싱 단계에서 이미 병합됨)
             print("\n비자 정보 추가 중...")
             result = subprocess.run(
-                ['python3', 'merge_visa_data.py', 'marathons_global_raw.json'],
+                ['python3', 'merge_visa_data.py', os.path.basename(dataset_path(RAW_PATH, args.format))],
                 capture_output=True,
                 text=True
             )
@@ -1411,15 +1939,7 @@ if __name__ == "__main__":
             else:
                 print(f"⚠️  비자 데이터 병합 중 오류 발생:\n{result.stderr}")
 
-            result = subprocess.run(
-                ['python3', 'merge_visa_data.py', 'marathons_global.json'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                print(result.stdout)
-            else:
-                print(f"⚠️  비자 데이터 병합 중 오류 발생:\n{result.stderr}")
+            http_client.print_stats()
 
             print("\n" + "=" * 70)
             print("✅ 모든 작업 완료!")
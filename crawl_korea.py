@@ -4,40 +4,146 @@
 목록 + 상세페이지 → marathons_korea.json
 """
 
-import requests
-import json
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup, Tag
+
+import http_client
+from concurrency import HostSlots
+from hero_cache import STATUS_ERROR, STATUS_NONE, STATUS_OK, HeroImageCache
+from hero_extract import CHUNK_SIZE, MAX_PAGE_BYTES, charset_from_headers, stream_hero_candidates
+from image_probe import MAX_PROBES, MIN_HEIGHT, MIN_WIDTH, ImageValidator
+from catalogue_index import save_catalogue
+from changefeed import Changefeed, print_changefeed
 
 
 BASE_URL = "http://www.roadrun.co.kr/schedule"
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+SITE_SLOTS = HostSlots(per_host=1)  # 주최 사이트별 동시 요청 수
+HERO_CACHE = None  # 사이트별 대표 이미지 캐시 (main에서 생성, None이면 사용 안 함)
+IMAGE_MAX_BYTES = MAX_PAGE_BYTES  # head에 이미지가 없을 때 홈페이지 본문을 읽는 상한
+IMAGE_VALIDATOR = None  # 대표 이미지 후보 Range 요청 검증 (main에서 생성, None이면 확장자만 확인)
+# BeautifulSoup 빌더 (--soup-parser lxml: 더 빠르지만 닫히지 않은 태그 등 깨진 HTML은 트리가 달라질 수 있음)
+SOUP_FEATURES = "html.parser"
+
+VIEW_LINK = re.compile(r"view\.php\?no=\d+")
+EVENT_NO = re.compile(r"no=(\d+)")
+HTTP_LINK = re.compile(r"^http")
+LIST_DATE = re.compile(r"(\d{1,2}/\d{1,2})")
+LIST_WEEKDAY = re.compile(r"\((.)\)")
+LIST_PHONE = re.compile(r"☎?([\d\-]+)")
+LIST_CELL_WIDTHS = ["18%", "19%", "30%"]  # 날짜 / 장소 / 주최·전화
+MAIL_URL = re.compile(r"mail_url=([^'\"&]+)")
+PRICE_NEAR_FEE = re.compile(r"참가비[^\d]{0,30}([\d,]+)\s*원")
+PRICE = re.compile(r"([\d,]+)\s*원")
+
+# 상세 페이지 라벨 → 필드
+DETAIL_FIELDS = {
+    "대회명": "title",
+    "대표자명": "representative",
+    "E-mail": "email",
+    "대회일시": "datetime",
+    "전화번호": "phone",
+    "대회종목": "distances",
+    "대회지역": "region",
+    "대회장소": "venue",
+    "주최단체": "organizer",
+    "접수기간": "registrationPeriod",
+    "홈페이지": "website",
+    "기타소개": "description",
 }
 
 
 def fetch_html(url):
     """EUC-KR 페이지를 UTF-8 문자열로 반환"""
-    resp = requests.get(url, headers=HEADERS, timeout=15)
+    resp = http_client.get(url)
     resp.encoding = "euc-kr"
     return resp.text
 
 
-def parse_list_page():
-    """목록 페이지에서 대회 기본 정보 + ID 추출"""
-    html = fetch_html(f"{BASE_URL}/list.php")
-    soup = BeautifulSoup(html, "html.parser")
+def parse_list_row(tr):
+    """목록 행(tr)의 날짜/요일, 장소, 주최/전화, 홈페이지 — 같은 행의 링크(썸네일, 대회명)가 함께 사용"""
+    row = {"date": "", "dayOfWeek": "", "location": "", "organizer": "", "phone": "", "website": ""}
+    if not tr:
+        return row
+
+    # 너비별 첫 번째 td (tr.find(width=...)를 세 번 하는 대신 한 번에)
+    cells = {}
+    for td in tr.find_all("td", width=LIST_CELL_WIDTHS):
+        cells.setdefault(td["width"], td)
+
+    # 날짜: 같은 tr 내 width="18%" td (M/D 형식)
+    if "18%" in cells:
+        date_text = cells["18%"].get_text(strip=True)
+        dm = LIST_DATE.search(date_text)
+        if dm:
+            row["date"] = dm.group(1)
+        dw = LIST_WEEKDAY.search(date_text)
+        if dw:
+            row["dayOfWeek"] = dw.group(1)
+
+    # 장소: width="19%" td
+    if "19%" in cells:
+        row["location"] = cells["19%"].get_text(strip=True)
+
+    # 주최 / 전화: width="30%" td
+    if "30%" in cells:
+        org_text = cells["30%"].get_text(" ", strip=True)
+        pm = LIST_PHONE.search(org_text)
+        if pm:
+            row["phone"] = pm.group(1)
+        # 주최: 전화 앞 텍스트
+        org_parts = org_text.split("☎")[0].strip()
+        if org_parts:
+            row["organizer"] = org_parts
+
+    # 홈페이지 링크
+    home_a = tr.find("a", href=HTTP_LINK, target="_new")
+    if home_a:
+        row["website"] = home_a["href"]
+    return row
+
+
+def iter_list_tags(soup):
+    """
+    목록 트리를 문서 순서로 한 번 순회하며 대회 링크와 종목 font를 (종류, 태그, 가장 안쪽 tr)로 반환
+    링크마다 find_parent("tr") / find_next("font")로 트리를 다시 오르내리지 않기 위함
+    """
+    stack = [(soup, None)]
+    while stack:
+        node, tr = stack.pop()
+        if node.name == "tr":
+            tr = node
+        elif node.name == "a" and VIEW_LINK.search(node.get("href") or ""):
+            yield "link", node, tr
+        elif node.name == "font" and node.get("color") == "#990000":
+            yield "font", node, tr
+        stack.extend((child, tr) for child in reversed(node.contents) if isinstance(child, Tag))
+
+
+def parse_list_html(html):
+    """목록 페이지 HTML에서 대회 기본 정보 + ID 추출"""
+    soup = BeautifulSoup(html, SOUP_FEATURES)
 
     events = []
     seen_ids = set()
+    rows = {}      # id(tr) → parse_list_row 결과 (행마다 한 번)
+    waiting = []   # 종목 font를 기다리는 대회 (대회명 다음에 처음 나오는 font)
+
+    for kind, tag, tr in iter_list_tags(soup):
+        # 종목: 대회명 바로 다음 <font size="2" color="#990000">
+        if kind == "font":
+            if waiting:
+                distances = tag.get_text(strip=True)
+                for event in waiting:
+                    event["distances"] = distances
+                waiting = []
+            continue
 
-    # view.php?no=XXXXX 링크에서 ID와 대회명 추출
-    for a_tag in soup.find_all("a", href=re.compile(r"view\.php\?no=\d+")):
-        href = a_tag["href"]
-        m = re.search(r"no=(\d+)", href)
+        # view.php?no=XXXXX 링크에서 ID와 대회명 추출
+        m = EVENT_NO.search(tag["href"])
         if not m:
             continue
         eid = m.group(1)
@@ -45,137 +151,80 @@ def parse_list_page():
             continue
         seen_ids.add(eid)
 
-        title = a_tag.get_text(strip=True)
+        title = tag.get_text(strip=True)
         if not title:
             continue
 
-        # 종목: 대회명 바로 다음 <font size="2" color="#990000">
-        distances = ""
-        next_font = a_tag.find_next("font", attrs={"color": "#990000"})
-        if next_font:
-            distances = next_font.get_text(strip=True)
-
-        # 날짜: 이 행 위쪽의 날짜 셀 (M/D 형식)
-        tr = a_tag.find_parent("tr")
-        date_str = ""
-        day_of_week = ""
-        if tr:
-            # 같은 tr 내 첫 td에 날짜가 있거나, 이전 tr에 있음
-            date_td = tr.find("td", width="18%")
-            if date_td:
-                date_text = date_td.get_text(strip=True)
-                dm = re.search(r"(\d{1,2}/\d{1,2})", date_text)
-                if dm:
-                    date_str = dm.group(1)
-                dw = re.search(r"\((.)\)", date_text)
-                if dw:
-                    day_of_week = dw.group(1)
-
-        # 장소: width="19%" td
-        location = ""
-        if tr:
-            loc_td = tr.find("td", width="19%")
-            if loc_td:
-                location = loc_td.get_text(strip=True)
-
-        # 주최 / 전화: width="30%" td
-        organizer = ""
-        phone = ""
-        if tr:
-            org_td = tr.find("td", width="30%")
-            if org_td:
-                org_text = org_td.get_text(" ", strip=True)
-                # 전화번호 추출
-                pm = re.search(r"☎?([\d\-]+)", org_text)
-                if pm:
-                    phone = pm.group(1)
-                # 주최: 전화 앞 텍스트
-                org_parts = org_text.split("☎")[0].strip()
-                if org_parts:
-                    organizer = org_parts
-
-        # 홈페이지 링크
-        website = ""
-        if tr:
-            home_a = tr.find("a", href=re.compile(r"^http"), target="_new")
-            if home_a:
-                website = home_a["href"]
-
-        events.append({
+        if id(tr) not in rows:
+            rows[id(tr)] = parse_list_row(tr)
+        row = rows[id(tr)]
+
+        event = {
             "id": eid,
             "title": title,
-            "date": date_str,
-            "dayOfWeek": day_of_week,
-            "distances": distances,
-            "location": location,
-            "organizer": organizer,
-            "phone": phone,
-            "website": website,
-        })
+            "date": row["date"],
+            "dayOfWeek": row["dayOfWeek"],
+            "distances": "",
+            "location": row["location"],
+            "organizer": row["organizer"],
+            "phone": row["phone"],
+            "website": row["website"],
+        }
+        events.append(event)
+        waiting.append(event)
 
     return events
 
 
-def parse_detail_page(eid):
-    """상세 페이지에서 추가 정보 추출"""
-    html = fetch_html(f"{BASE_URL}/view.php?no={eid}")
-    soup = BeautifulSoup(html, "html.parser")
+def parse_list_page():
+    """목록 페이지에서 대회 기본 정보 + ID 추출"""
+    return parse_list_html(fetch_html(f"{BASE_URL}/list.php"))
 
-    detail = {}
-    field_map = {
-        "대회명": "title",
-        "대표자명": "representative",
-        "E-mail": "email",
-        "대회일시": "datetime",
-        "전화번호": "phone",
-        "대회종목": "distances",
-        "대회지역": "region",
-        "대회장소": "venue",
-        "주최단체": "organizer",
-        "접수기간": "registrationPeriod",
-        "홈페이지": "website",
-        "기타소개": "description",
-    }
 
-    rows = soup.find_all("tr")
-    for row in rows:
-        cells = row.find_all("td")
+def parse_detail_html(html):
+    """상세 페이지 HTML에서 추가 정보 추출"""
+    soup = BeautifulSoup(html, SOUP_FEATURES)
+
+    detail = {}
+    for row in soup.find_all("tr"):
+        # 라벨/값은 앞의 두 td만 필요 (레이아웃 행의 하위 td 전체를 모으지 않음)
+        cells = row.find_all("td", limit=2)
         if len(cells) < 2:
             continue
-        label = cells[0].get_text(strip=True)
-        if label in field_map:
-            key = field_map[label]
-            if key == "description":
-                # HTML 줄바꿈 보존
-                value = cells[1].decode_contents()
-                value = re.sub(r"<br\s*/?>", "\n", value)
-                value = re.sub(r"<[^>]+>", "", value)
-                value = re.sub(r"&nbsp;", " ", value)
-                value = value.strip()
-            elif key == "website":
-                a = cells[1].find("a", href=True)
-                value = a["href"] if a else cells[1].get_text(strip=True)
-            elif key == "email":
-                a = cells[1].find("a", href=True)
-                if a:
-                    em = re.search(r"mail_url=([^'\"&]+)", a.get("href", ""))
-                    value = em.group(1) if em else cells[1].get_text(strip=True)
-                else:
-                    value = cells[1].get_text(strip=True)
+        key = DETAIL_FIELDS.get(cells[0].get_text(strip=True))
+        if key is None:
+            continue
+        if key == "description":
+            # HTML 줄바꿈 보존
+            value = cells[1].decode_contents()
+            value = re.sub(r"<br\s*/?>", "\n", value)
+            value = re.sub(r"<[^>]+>", "", value)
+            value = re.sub(r"&nbsp;", " ", value)
+            value = value.strip()
+        elif key == "website":
+            a = cells[1].find("a", href=True)
+            value = a["href"] if a else cells[1].get_text(strip=True)
+        elif key == "email":
+            a = cells[1].find("a", href=True)
+            if a:
+                em = MAIL_URL.search(a.get("href", ""))
+                value = em.group(1) if em else cells[1].get_text(strip=True)
             else:
                 value = cells[1].get_text(strip=True)
-            detail[key] = value
+        else:
+            value = cells[1].get_text(strip=True)
+        detail[key] = value
 
     # 기타소개에서 가격 추출
     desc = detail.get("description", "")
     if desc:
         # "참가비" 주변 금액 우선 탐색
-        price_section = re.search(r"참가비[^\d]{0,30}([\d,]+)\s*원", desc)
+        price_section = PRICE_NEAR_FEE.search(desc)
         if price_section:
             detail["price"] = price_section.group(1).replace(",", "") + "원"
         else:
             # 그 외 "XX,XXX원" 패턴 중 첫 번째
-            price_match = re.search(r"([\d,]+)\s*원", desc)
+            price_match = PRICE.search(desc)
             if price_match:
                 raw_price = price_match.group(1).replace(",", "")
                 # 너무 큰 수(날짜 등 오탐)나 너무 작은 수 제외
@@ -185,69 +234,55 @@ def parse_detail_page(eid):
     return detail
 
 
-def is_image_url(url):
-    """URL이 이미지 파일 확장자인지 확인"""
-    return bool(re.search(r"\.(jpg|jpeg|png|webp|gif|bmp|svg)(\?|$|#)", url, re.I))
+def parse_detail_page(eid):
+    """상세 페이지에서 추가 정보 추출"""
+    return parse_detail_html(fetch_html(f"{BASE_URL}/view.php?no={eid}"))
 
 
 def fetch_hero_image(website_url):
-    """대회 홈페이지에서 대표 이미지 URL 추출 (이미지 파일만, main 우선)"""
+    """
+    대회 홈페이지에서 대표 이미지 URL 추출 (사이트별 캐시 사용)
+    HERO_CACHE가 있으면 TTL 이내 결과(실패/이미지 없음 포함)는 요청 없이, 지난 결과는 조건부 요청으로 재사용
+    """
     if not website_url:
         return ""
+    cache = HERO_CACHE
+    entry = None
+    if cache:
+        fresh = cache.get_fresh(website_url)
+        if fresh:
+            return fresh.image
+        entry = cache.get(website_url)
     try:
-        resp = requests.get(website_url, headers=HEADERS, timeout=10, allow_redirects=True)
-        resp.encoding = resp.apparent_encoding
-        html = resp.text
-        soup = BeautifulSoup(html, "html.parser")
-
-        # 페이지 내 모든 이미지 URL 수집
-        all_images = []
-
-        # og:image
-        og = soup.find("meta", property="og:image")
-        if og and og.get("content"):
-            all_images.append(urljoin(website_url, og["content"]))
-
-        # twitter:image
-        tw = soup.find("meta", attrs={"name": "twitter:image"})
-        if tw and tw.get("content"):
-            all_images.append(urljoin(website_url, tw["content"]))
-
-        # CSS background-image
-        for tag in soup.find_all(style=re.compile(r"background(-image)?\s*:")):
-            style = tag.get("style", "")
-            bg = re.search(r"url\(['\"]?([^'\")]+)['\"]?\)", style)
-            if bg:
-                all_images.append(urljoin(website_url, bg.group(1)))
-
-        # <img> 태그
-        for img in soup.find_all("img", src=True):
-            src = img["src"]
-            if re.search(r"(icon|btn|button|arrow|sprite|pixel|spacer|1x1|blank)", src, re.I):
-                continue
-            all_images.append(urljoin(website_url, src))
-
-        # 이미지 확장자 필터
-        all_images = [url for url in all_images if is_image_url(url)]
-        if not all_images:
-            return ""
-
-        # "main"이 포함된 이미지 우선
-        banners = [url for url in all_images if re.search(r"banner", url, re.I)]
-        mains = [url for url in all_images if re.search(r"main", url, re.I)]
-        logos = [url for url in all_images if re.search(r"logo", url, re.I)]
-
-        main_images = banners + mains + logos
-
-        if main_images:
-            return main_images[0]
-
-        # 그 외 첫 번째 이미지
-        return all_images[0]
-
+        resp = http_client.get(website_url, allow_redirects=True, stream=True,
+                               headers=HeroImageCache.conditional_headers(entry))
+        with resp:
+            if resp.status_code == 304 and entry:
+                cache.touch(website_url)
+                return entry.image
+            if resp.status_code != 200:
+                if cache:
+                    cache.put(website_url, "", STATUS_ERROR)
+                return ""
+            # head의 og/twitter 이미지를 찾으면 나머지 본문은 받지 않음
+            candidates, read = stream_hero_candidates(resp.iter_content(CHUNK_SIZE), website_url,
+                                                      charset_from_headers(resp.headers), IMAGE_MAX_BYTES)
+        http_client.count_bytes(website_url, read)
+        if IMAGE_VALIDATOR:
+            # HTTPS 후보만 앞부분을 받아 확인 → 깨진 링크/아이콘 제외, 가장 큰 이미지
+            image = IMAGE_VALIDATOR.best([url for url in candidates if url.startswith("https://")])
+        else:
+            image = candidates[0] if candidates else ""
     except Exception:
+        if cache:
+            cache.put(website_url, "", STATUS_ERROR)
         return ""
 
+    if cache:
+        status = STATUS_OK if image.startswith("https://") else STATUS_NONE
+        cache.put(website_url, image, status, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+    return image
+
 
 UNSPLASH_IMAGES = [
     "https://images.unsplash.com/photo-1452626038306-9aae5e071dd3?w=800&h=450&fit=crop&q=80",
@@ -393,9 +428,107 @@ def parse_registration_dates(period_str):
     return (start, end)
 
 
-def main():
+def _try(fn, *args):
+    """fn(*args) 결과, 실패하면 예외 객체 (목록 순회 중 한 대회 실패로 멈추지 않도록)"""
+    try:
+        return fn(*args)
+    except Exception as e:
+        return e
+
+
+def pick_image(ev, detail):
+    """홈페이지 대표 이미지 (HTTPS만 허용), 없으면 Unsplash 폴백 → (홈페이지 URL, 이미지 URL)"""
+    site_url = detail.get("website", ev["website"])
+    image = ""
+    if site_url:
+        # 같은 주최 사이트에는 동시에 SITE_SLOTS.per_host개까지만 요청
+        with SITE_SLOTS.hold(urlparse(site_url).netloc):
+            raw_image = fetch_hero_image(site_url)
+        if raw_image and raw_image.startswith("https://"):
+            image = raw_image
+
+    # HTTPS 이미지가 없으면 Unsplash 폴백
+    if not image:
+        image = get_fallback_image(ev["id"])
+    return site_url, image
+
+
+def build_event(ev, detail, site_url, image):
+    """목록 + 상세 + 이미지 → marathons_korea.json 레코드"""
+    # 상세에서 날짜 정규화
+    dt_raw = detail.get("datetime", "")
+    start_time = ""
+    tm = re.search(r"출발시간:\s*(\d{1,2}:\d{2})", dt_raw)
+    if tm:
+        start_time = tm.group(1)
+
+    return {
+        "id": ev["id"],
+        "title": detail.get("title", ev["title"]),
+        "date": ev.get("dateFormatted", ev["date"]),
+        "dayOfWeek": ev["dayOfWeek"],
+        "startTime": start_time,
+        "distances": filter_distances(detail.get("distances", ev["distances"])),
+        "region": detail.get("region", ""),
+        "venue": detail.get("venue", ev["location"]),
+        "organizer": detail.get("organizer", ev["organizer"]),
+        "representative": detail.get("representative", ""),
+        "phone": detail.get("phone", ev["phone"]),
+        "email": detail.get("email", ""),
+        "website": site_url,
+        "registrationStartDate": parse_registration_dates(detail.get("registrationPeriod", ""))[0],
+        "registrationEndDate": parse_registration_dates(detail.get("registrationPeriod", ""))[1],
+        "price": detail.get("price", ""),
+        "description": detail.get("description", ""),
+        "image": image,
+    }
+
+
+def crawl_event(ev):
+    """대회 하나: 상세 페이지 → 대표 이미지 (직렬)"""
+    # 요청 간격은 호스트별 limiter가 조절 (rate_limiter.HOST_LIMITS)
+    detail = parse_detail_page(ev["id"])
+    return build_event(ev, detail, *pick_image(ev, detail))
+
+
+def crawl_events_concurrent(events, detail_workers=4, image_workers=8):
+    """
+    상세 페이지와 홈페이지 이미지 추출을 겹쳐 실행 → (대회, 레코드 또는 예외) 목록 순서대로
+
+    상세 페이지 풀: roadrun.co.kr limiter 속도로 계속 요청
+    이미지 풀: 상세 페이지가 끝난 대회부터 주최 사이트 요청 (사이트별 속도/동시 요청 제한)
+    """
+    with ThreadPoolExecutor(max_workers=detail_workers) as detail_pool, \
+            ThreadPoolExecutor(max_workers=image_workers) as image_pool:
+
+        def detail_then_image(ev):
+            detail = parse_detail_page(ev["id"])
+            return detail, image_pool.submit(pick_image, ev, detail)
+
+        futures = [detail_pool.submit(detail_then_image, ev) for ev in events]
+        for ev, future in zip(events, futures):
+            try:
+                detail, image_future = future.result()
+                yield ev, build_event(ev, detail, *image_future.result())
+            except Exception as e:
+                yield ev, e
+
+
+def main(concurrent=False, detail_workers=4, image_workers=8,
+         use_image_cache=True, image_cache_ttl_hours=7 * 24, image_negative_ttl_hours=24,
+         validate_images=True, image_min_width=MIN_WIDTH, image_min_height=MIN_HEIGHT, image_probes=MAX_PROBES):
+    global HERO_CACHE, IMAGE_VALIDATOR
+    if use_image_cache:
+        HERO_CACHE = HeroImageCache("data/hero_images.sqlite",
+                                    ttl_seconds=image_cache_ttl_hours * 3600,
+                                    negative_ttl_seconds=image_negative_ttl_hours * 3600)
+    if validate_images:
+        IMAGE_VALIDATOR = ImageValidator(image_min_width, image_min_height, max_probes=image_probes)
     print("=" * 60)
     print("🏃 마라톤온라인 국내 대회 크롤링 시작")
+    if concurrent:
+        print(f"   ⚡ 병렬 모드: 상세 페이지 {detail_workers}개 / 홈페이지 {image_workers}개 동시 "
+              f"(사이트당 {SITE_SLOTS.per_host}개)")
     print("=" * 60)
 
     # 1) 목록 파싱
@@ -413,78 +546,43 @@ def main():
             filtered.append(ev)
     print(f"   오늘({today}) 이후 대회: {len(filtered)}개")
 
-    # 3) 상세 페이지 크롤링
+    # 3) 상세 페이지 + 대표 이미지 크롤링 (병렬 모드도 결과는 목록 순서)
     print(f"\n📡 상세 페이지 크롤링 중... (총 {len(filtered)}개)")
+    started = time.time()
+    if concurrent:
+        outcomes = crawl_events_concurrent(filtered, detail_workers, image_workers)
+    else:
+        outcomes = ((ev, _try(crawl_event, ev)) for ev in filtered)
     results = []
-    for i, ev in enumerate(filtered, 1):
-        try:
-            detail = parse_detail_page(ev["id"])
-            time.sleep(0.3)
-
-            # 상세에서 날짜 정규화
-            dt_raw = detail.get("datetime", "")
-            start_time = ""
-            tm = re.search(r"출발시간:\s*(\d{1,2}:\d{2})", dt_raw)
-            if tm:
-                start_time = tm.group(1)
-
-            # 홈페이지에서 대표 이미지 추출 (HTTPS만 허용)
-            site_url = detail.get("website", ev["website"])
-            image = ""
-            if site_url:
-                raw_image = fetch_hero_image(site_url)
-                if raw_image and raw_image.startswith("https://"):
-                    image = raw_image
-                time.sleep(0.3)
-
-            # HTTPS 이미지가 없으면 Unsplash 폴백
-            if not image:
-                image = get_fallback_image(ev["id"])
-
-            merged = {
-                "id": ev["id"],
-                "title": detail.get("title", ev["title"]),
-                "date": ev.get("dateFormatted", ev["date"]),
-                "dayOfWeek": ev["dayOfWeek"],
-                "startTime": start_time,
-                "distances": filter_distances(detail.get("distances", ev["distances"])),
-                "region": detail.get("region", ""),
-                "venue": detail.get("venue", ev["location"]),
-                "organizer": detail.get("organizer", ev["organizer"]),
-                "representative": detail.get("representative", ""),
-                "phone": detail.get("phone", ev["phone"]),
-                "email": detail.get("email", ""),
-                "website": site_url,
-                "registrationStartDate": parse_registration_dates(detail.get("registrationPeriod", ""))[0],
-                "registrationEndDate": parse_registration_dates(detail.get("registrationPeriod", ""))[1],
-                "price": detail.get("price", ""),
-                "description": detail.get("description", ""),
-                "image": image,
-            }
-            results.append(merged)
-
-            if i % 10 == 0:
-                print(f"   {i}/{len(filtered)} 완료")
-
-        except Exception as e:
-            print(f"   ⚠️ {ev['id']} ({ev['title']}) 실패: {e}")
+    for i, (ev, outcome) in enumerate(outcomes, 1):
+        if isinstance(outcome, Exception):
+            print(f"   ⚠️ {ev['id']} ({ev['title']}) 실패: {outcome}")
             continue
-
+        results.append(outcome)
+
+        if i % 10 == 0:
+            print(f"   {i}/{len(filtered)} 완료")
+
+    print(f"   ⏱️  {time.time() - started:.1f}초")
+    if HERO_CACHE:
+        cache_stats = HERO_CACHE.stats
+        print(f"   💾 대표 이미지 캐시: 적중 {cache_stats['hits']}개 | 실패/없음 건너뜀 {cache_stats['negative_hits']}개 | "
+              f"재검증(304) {cache_stats['revalidated']}개 | 신규 저장 {cache_stats['stored']}개")
+    if IMAGE_VALIDATOR:
+        probe_stats = IMAGE_VALIDATOR.stats
+        print(f"   🖼️  대표 이미지 검증: 후보 {probe_stats['probed']}개 확인 | 깨진 링크 {probe_stats['dead']}개 | "
+              f"작은 이미지 {probe_stats['small']}개 | 크기 미확인 {probe_stats['unsized']}개")
     print(f"✅ 크롤링 완료: {len(results)}개")
 
-    # 4) 저장
-    output = {
-        "metadata": {
-            "total_count": len(results),
-            "fetched_at": datetime.now().isoformat(),
-            "source": "http://www.marathon.pe.kr/index_calendar.html",
-        },
-        "marathons": results,
+    # 4) 저장 (marathons_korea.jsonl + id 인덱스도 함께)
+    metadata = {
+        "total_count": len(results),
+        "fetched_at": datetime.now().isoformat(),
+        "source": "http://www.marathon.pe.kr/index_calendar.html",
     }
-
-    with open("marathons_korea.json", "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-    print(f"\n💾 marathons_korea.json 저장 완료 ({len(results)}개)")
+    save_catalogue("marathons_korea.json", metadata, results)
+    print(f"\n💾 marathons_korea.json 저장 완료 ({len(results)}개, 인덱스 marathons_korea.jsonl.idx)")
+    print_changefeed("국내 대회", Changefeed("data/changefeed/korea").publish(results))
 
     # 샘플 출력
     print("\n📋 샘플 (처음 3개):")
@@ -497,6 +595,58 @@ def main():
         print(f"   홈페이지: {m['website']}")
         print(f"   이미지: {m['image']}")
 
+    http_client.print_stats()
+
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    from rate_limiter import configure_default, configure_host
+
+    arg_parser = argparse.ArgumentParser(description="마라톤온라인 국내 대회 크롤링")
+    arg_parser.add_argument("--concurrent", action="store_true",
+                            help="상세 페이지와 홈페이지 이미지 추출을 병렬로 실행")
+    arg_parser.add_argument("--workers", type=int, default=4,
+                            help="병렬 모드 상세 페이지 동시 요청 수 (기본 4)")
+    arg_parser.add_argument("--image-workers", type=int, default=8,
+                            help="병렬 모드 홈페이지 동시 요청 수 (기본 8)")
+    arg_parser.add_argument("--rps", type=float, default=1 / 0.3,
+                            help="roadrun.co.kr 초당 요청 수 제한 (기본 약 3.3)")
+    arg_parser.add_argument("--site-rps", type=float, default=1.0,
+                            help="주최 사이트별 초당 요청 수 제한 (기본 1)")
+    arg_parser.add_argument("--per-site", type=int, default=1,
+                            help="주최 사이트별 동시 요청 수 (기본 1)")
+    arg_parser.add_argument("--no-image-cache", action="store_true",
+                            help="사이트별 대표 이미지 캐시를 사용하지 않음")
+    arg_parser.add_argument("--image-cache-ttl", type=float, default=7 * 24,
+                            help="찾은 대표 이미지를 재확인 없이 쓰는 시간 (기본 168시간)")
+    arg_parser.add_argument("--image-negative-ttl", type=float, default=24,
+                            help="실패/이미지 없음 사이트를 다시 시도하지 않는 시간 (기본 24시간)")
+    arg_parser.add_argument("--image-max-kb", type=int, default=MAX_PAGE_BYTES // 1024,
+                            help="head에 대표 이미지가 없을 때 홈페이지 본문을 읽는 상한 (기본 256KB)")
+    arg_parser.add_argument("--no-image-check", action="store_true",
+                            help="대표 이미지 후보 Range 요청 검증을 하지 않음 (확장자만 확인)")
+    arg_parser.add_argument("--image-min-size", default=f"{MIN_WIDTH}x{MIN_HEIGHT}",
+                            help=f"이보다 작은 이미지는 아이콘으로 제외 (기본 {MIN_WIDTH}x{MIN_HEIGHT})")
+    arg_parser.add_argument("--image-probes", type=int, default=MAX_PROBES,
+                            help=f"홈페이지 하나당 확인할 이미지 후보 수 (기본 {MAX_PROBES})")
+    arg_parser.add_argument("--soup-parser", choices=["html.parser", "lxml"], default="html.parser",
+                            help="목록/상세 페이지 BeautifulSoup 빌더 (lxml은 선택 설치, "
+                                 "bench_roadrun.py --pages로 결과가 같은지 먼저 확인)")
+    args = arg_parser.parse_args()
+    if args.soup_parser == "lxml":
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            arg_parser.error("--soup-parser lxml: lxml이 설치되어 있지 않음 (pip install lxml)")
+
+    configure_host(urlparse(BASE_URL).netloc, args.rps)
+    configure_default(args.site_rps)
+    SITE_SLOTS = HostSlots(per_host=args.per_site)
+    IMAGE_MAX_BYTES = args.image_max_kb * 1024
+    SOUP_FEATURES = args.soup_parser
+    min_width, min_height = (int(value) for value in args.image_min_size.lower().split("x"))
+    main(concurrent=args.concurrent, detail_workers=args.workers, image_workers=args.image_workers,
+         use_image_cache=not args.no_image_cache, image_cache_ttl_hours=args.image_cache_ttl,
+         image_negative_ttl_hours=args.image_negative_ttl, validate_images=not args.no_image_check,
+         image_min_width=min_width, image_min_height=min_height, image_probes=args.image_probes)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+데이터셋 파일 입출력 도구
+- iter_json_array: {"...": ..., "results": [ {...}, ... ]} 형태 JSON에서 배열 원소를 스트리밍으로 읽기
+- write_json_array: 같은 형태 JSON을 원소 하나씩 직렬화해 쓰기 (json.dump(indent=2)와 같은 출력)
+- JsonlWriter / iter_jsonl: 한 줄에 레코드 하나 (JSON Lines) + 마지막 줄 manifest
+- 모든 쓰기는 임시 파일에 쓴 뒤 rename → 읽는 쪽은 쓰다 만 파일을 보지 않음
+"""
+
+import json
+import os
+import textwrap
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+MANIFEST_KEY = '_manifest'  # JSONL 마지막 줄 {"_manifest": {...}}
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = ',:]}' + _WHITESPACE
+
+
+class _Reader:
+    """청크 단위로 읽으며 JSON 값을 하나씩 디코딩하는 버퍼"""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """공백을 건너뛴 다음 문자 (파일 끝이면 '')"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"JSON 구조 오류: '{char}' 필요 (위치 {self.pos})")
+        self.pos += 1
+
+    def value(self):
+        """다음 JSON 값 하나 디코딩 (값이 청크 경계에 걸리면 더 읽어서 재시도)"""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 숫자는 청크 끝에서 잘렸을 수 있으므로 (예: "1" + ".5") 뒤에 구분자가 올 때만 확정
+            if (end == len(self.buf) or self.buf[end] not in _DELIMITERS) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_json_array(path: str, field: str, chunk_size: int = 1 << 16) -> Iterator[Dict]:
+    """
+    최상위 객체의 field 배열 원소를 하나씩 반환 (파일 전체를 메모리에 올리지 않음)
+
+    Args:
+        path: JSON 파일 경로
+        field: 스트리밍할 배열 키 (예: 'results', 'marathons')
+        chunk_size: 한 번에 읽을 문자 수
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f, chunk_size)
+        reader.expect('{')
+        while reader.peek() not in ('}', ''):
+            key = reader.value()
+            reader.expect(':')
+            if key != field:
+                reader.value()  # 다른 키의 값은 건너뜀
+            else:
+                reader.expect('[')
+                if reader.peek() == ']':
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield reader.value()
+                        if reader.peek() == ',':
+                            reader.pos += 1
+                            continue
+                        reader.expect(']')
+                        break
+            if reader.peek() == ',':
+                reader.pos += 1
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = 'w', encoding: Optional[str] = 'utf-8'):
+    """
+    path.tmp에 쓰고 정상 종료 시 path로 교체 (fsync 후 os.replace)
+    예외가 나면 임시 파일을 지우고 기존 파일은 그대로 둠
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    f = open(tmp_path, mode, encoding=None if 'b' in mode else encoding)
+    try:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+    except BaseException:
+        f.close()
+        os.remove(tmp_path)
+        raise
+    f.close()
+    os.replace(tmp_path, path)
+
+
+def write_json_array(path: str, header: Dict, field: str, items: Iterable[Dict], compact: bool = False):
+    """
+    {**header, field: [items...]}를 원소 하나씩 직렬화해 저장 (임시 파일 → rename)
+    compact=False면 json.dump(..., ensure_ascii=False, indent=2)와 같은 텍스트,
+    compact=True면 들여쓰기/공백 없는 한 줄 JSON
+
+    Args:
+        path: 저장 경로
+        header: 배열 앞에 오는 키들 (예: {'metadata': {...}})
+        field: 배열 키 (마지막 키로 기록)
+        items: 배열 원소 (dict)
+        compact: 들여쓰기 없이 저장
+    """
+    with atomic_open(path) as f:
+        if compact:
+            head = json.dumps(header, ensure_ascii=False, separators=(',', ':'))
+            f.write(head[:-1] + (',' if header else ''))
+            f.write(f'{json.dumps(field, ensure_ascii=False)}:[')
+            for i, item in enumerate(items):
+                f.write((',' if i else '') + json.dumps(item, ensure_ascii=False, separators=(',', ':')))
+            f.write(']}')
+            return
+
+        head = json.dumps(header, ensure_ascii=False, indent=2)
+        if header:
+            f.write(head[:-2] + ',\n')  # 닫는 "\n}" 제거
+        else:
+            f.write('{\n')
+        f.write(f'  {json.dumps(field, ensure_ascii=False)}: [')
+        count = 0
+        for item in items:
+            body = json.dumps(item, ensure_ascii=False, indent=2)
+            f.write((',\n' if count else '\n') + textwrap.indent(body, '    '))
+            count += 1
+        f.write('\n  ]\n}' if count else ']\n}')
+
+
+class JsonlWriter:
+    """
+    JSON Lines 스트리밍 쓰기 (레코드가 만들어지는 대로 한 줄씩)
+
+        with JsonlWriter('data/x.jsonl') as writer:
+            writer.write(record)
+            writer.close({'count': ...})   # 마지막 줄 manifest + rename
+
+    close 전에 예외가 나거나 discard()하면 임시 파일을 지우고 기존 파일은 유지
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.count = 0
+        self.offset = 0  # 지금까지 쓴 바이트 수 (다음 레코드의 시작 위치)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(self.tmp_path, 'wb')
+
+    def write(self, record: Dict) -> Tuple[int, int]:
+        """레코드 한 줄 쓰기 → (시작 바이트 위치, 바이트 길이 — 줄바꿈 제외)"""
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        start = self.offset
+        self._file.write(line + b'\n')
+        self.offset += len(line) + 1
+        self.count += 1
+        return start, len(line)
+
+    def close(self, manifest: Optional[Dict] = None):
+        """마지막 줄에 manifest({"_manifest": {...}}) 기록 후 최종 경로로 교체"""
+        if self._file is None:
+            return
+        manifest = {'count': self.count, **(manifest or {})}
+        line = json.dumps({MANIFEST_KEY: manifest}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self._file.write(line + b'\n')
+        self.offset += len(line) + 1  # close 후에는 파일 전체 크기
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self):
+        """쓰던 내용을 버림 (기존 파일 유지)"""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        os.remove(self.tmp_path)
+
+    def __enter__(self) -> 'JsonlWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.discard()
+        else:
+            self.close()
+
+
+def iter_jsonl(path: str) -> Iterator[Dict]:
+    """JSON Lines 레코드를 하나씩 반환 (manifest 줄은 건너뜀)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if MANIFEST_KEY in record and len(record) == 1:
+                continue
+            yield record
+
+
+def read_jsonl_manifest(path: str) -> Optional[Dict]:
+    """JSON Lines 파일 마지막 줄의 manifest (없으면 None)"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        f.seek(max(0, end - 65536))
+        lines = f.read().rstrip(b'\n').split(b'\n')
+    try:
+        record = json.loads(lines[-1])
+    except (json.JSONDecodeError, IndexError):
+        return None
+    return record.get(MANIFEST_KEY) if isinstance(record, dict) else None
+
+
+def iter_records(path: str, field: str) -> Iterator[Dict]:
+    """.jsonl이면 iter_jsonl, 아니면 iter_json_array(field)로 레코드 스트리밍"""
+    if path.endswith('.jsonl'):
+        return iter_jsonl(path)
+    return iter_json_array(path, field)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+대회 홈페이지 대표 이미지 캐시 (SQLite, 사이트별)
+
+여러 대회가 같은 주최/접수 사이트를 쓰므로 홈페이지를 대회마다 받아 파싱하지 않도록
+정규화한 사이트 URL별로 고른 이미지와 ETag / Last-Modified, 확인 시각을 저장한다.
+
+- TTL 이내: 요청 없이 저장된 이미지 사용
+- TTL 경과: ETag / Last-Modified가 있으면 조건부 요청 (304면 저장된 이미지 재사용)
+- 실패(접속 오류, HTTP 오류)나 HTTPS 이미지가 없던 사이트도 빈 결과로 저장 → negative TTL 동안 재시도 안 함
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+STATUS_OK = 'ok'        # HTTPS 이미지 찾음
+STATUS_NONE = 'none'    # 페이지는 받았지만 쓸 만한 이미지 없음 (negative)
+STATUS_ERROR = 'error'  # 접속/HTTP 오류 (negative)
+
+
+class HeroEntry(NamedTuple):
+    """사이트 하나의 캐시 항목"""
+    image: str
+    status: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    checked_at: float
+
+
+def normalize_site_url(url: str) -> str:
+    """
+    캐시 키용 사이트 URL 정규화
+    http/https, 대소문자, www., 기본 포트, 끝 '/', fragment 차이는 같은 사이트로 취급
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/')
+    return f"{host}{path}" + (f"?{parts.query}" if parts.query else '')
+
+
+class HeroImageCache:
+    """사이트별 대표 이미지 캐시 (thread-safe)"""
+
+    def __init__(self, path: str = 'data/hero_images.sqlite',
+                 ttl_seconds: float = 7 * 24 * 3600, negative_ttl_seconds: float = 24 * 3600):
+        """
+        Args:
+            path: SQLite 파일 경로
+            ttl_seconds: 이미지를 찾은 사이트를 재확인 없이 쓰는 시간
+            negative_ttl_seconds: 실패/이미지 없음 사이트를 다시 시도하지 않는 시간
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.stats = {'hits': 0, 'negative_hits': 0, 'revalidated': 0, 'stored': 0}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hero_images ("
+            " site TEXT PRIMARY KEY, url TEXT, image TEXT, status TEXT,"
+            " etag TEXT, last_modified TEXT, checked_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[HeroEntry]:
+        """캐시 항목 조회 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT image, status, etag, last_modified, checked_at FROM hero_images WHERE site = ?",
+                (normalize_site_url(url),)
+            ).fetchone()
+        return HeroEntry(*row) if row else None
+
+    def is_fresh(self, entry: HeroEntry) -> bool:
+        """상태별 TTL 이내인지 확인"""
+        ttl = self.ttl_seconds if entry.status == STATUS_OK else self.negative_ttl_seconds
+        return time.time() - entry.checked_at < ttl
+
+    def get_fresh(self, url: str) -> Optional[HeroEntry]:
+        """TTL 이내 항목만 반환 (적중 횟수 집계)"""
+        entry = self.get(url)
+        if entry is None or not self.is_fresh(entry):
+            return None
+        with self._lock:
+            self.stats['hits' if entry.status == STATUS_OK else 'negative_hits'] += 1
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: Optional[HeroEntry]) -> Dict[str, str]:
+        """재검증용 If-None-Match / If-Modified-Since 헤더 (오류 항목은 재검증하지 않음)"""
+        headers = {}
+        if entry is not None and entry.status != STATUS_ERROR:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def put(self, url: str, image: str, status: str,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """확인 결과 저장 (실패/이미지 없음도 빈 image로 저장)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hero_images VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_site_url(url), url, image, status, etag, last_modified, time.time())
+            )
+            self._conn.commit()
+            self.stats['stored'] += 1
+
+    def touch(self, url: str):
+        """304 Not Modified 수신 시 확인 시각만 갱신"""
+        with self._lock:
+            self._conn.execute("UPDATE hero_images SET checked_at = ? WHERE site = ?",
+                               (time.time(), normalize_site_url(url)))
+            self._conn.commit()
+            self.stats['revalidated'] += 1
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+대회 홈페이지 대표 이미지 추출 (스트리밍, 증분 HTML 파서)
+
+홈페이지 전체를 받아 BeautifulSoup 트리를 만드는 대신, 응답을 청크 단위로 읽어
+html.parser.HTMLParser에 바로 흘려보낸다.
+
+- <head>가 끝났을 때 og:image / twitter:image가 있으면 나머지 본문은 읽지 않음 (보통 수 KB)
+- 없을 때만 본문의 background-image / <img>를 max_bytes까지 스캔
+- 문자셋은 Content-Type 헤더 → 앞부분 <meta charset> 순으로 판단 (전체 본문 문자셋 추정 안 함)
+- 후보 수집 순서와 우선순위(banner → main → logo → 첫 이미지)는 기존 BeautifulSoup 방식과 같음
+- 우선순위 순 후보 목록을 돌려주고, 실제 선택(이미지 검증)은 image_probe.ImageValidator
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+CHUNK_SIZE = 8 * 1024
+MAX_PAGE_BYTES = 256 * 1024  # 본문 스캔 상한
+SNIFF_BYTES = 2048           # <meta charset> 탐색 범위
+
+_IMAGE_EXT = re.compile(r"\.(jpg|jpeg|png|webp|gif|bmp|svg)(\?|$|#)", re.I)
+_SKIP_IMAGE = re.compile(r"(icon|btn|button|arrow|sprite|pixel|spacer|1x1|blank)", re.I)
+_BG_STYLE = re.compile(r"background(-image)?\s*:")
+_BG_URL = re.compile(r"url\(['\"]?([^'\")]+)['\"]?\)")
+_BANNER = re.compile(r"banner", re.I)
+_MAIN = re.compile(r"main", re.I)
+_LOGO = re.compile(r"logo", re.I)
+_HEADER_CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.I)
+
+# 한국 사이트에서 자주 보이는 문자셋 → 상위 호환 코덱
+_CHARSET_ALIASES = {'euc-kr': 'cp949', 'euckr': 'cp949', 'ks_c_5601-1987': 'cp949', 'x-windows-949': 'cp949'}
+
+
+def is_image_url(url):
+    """URL이 이미지 파일 확장자인지 확인"""
+    return bool(_IMAGE_EXT.search(url))
+
+
+def rank_images(candidates: List[str]) -> List[str]:
+    """이미지 확장자 후보를 banner → main → logo 포함 URL → 나머지 순으로 정렬 (중복 제거)"""
+    images = list(dict.fromkeys(url for url in candidates if is_image_url(url)))
+    ranked = []
+    for pattern in (_BANNER, _MAIN, _LOGO):
+        ranked += [url for url in images if pattern.search(url) and url not in ranked]
+    return ranked + [url for url in images if url not in ranked]
+
+
+def choose_image(candidates: List[str]) -> str:
+    """우선순위가 가장 높은 이미지 후보 (없으면 '')"""
+    ranked = rank_images(candidates)
+    return ranked[0] if ranked else ""
+
+
+class HeroImageParser(HTMLParser):
+    """대표 이미지 후보 수집 (og:image, twitter:image, background-image, <img>)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.og_image: Optional[str] = None
+        self.twitter_image: Optional[str] = None
+        self.backgrounds: List[str] = []
+        self.images: List[str] = []
+        self.head_done = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'body':
+            self.head_done = True
+        if tag == 'meta':
+            content = attrs.get('content')
+            if attrs.get('property') == 'og:image' and self.og_image is None:
+                self.og_image = content or ''
+            elif attrs.get('name') == 'twitter:image' and self.twitter_image is None:
+                self.twitter_image = content or ''
+        style = attrs.get('style')
+        if style and _BG_STYLE.search(style):
+            bg = _BG_URL.search(style)
+            if bg:
+                self.backgrounds.append(bg.group(1))
+        if tag == 'img' and 'src' in attrs:
+            src = attrs['src'] or ''
+            if not _SKIP_IMAGE.search(src):
+                self.images.append(src)
+
+    handle_startendtag = handle_starttag
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.head_done = True
+
+    def head_candidates(self, base_url: str) -> List[str]:
+        return [urljoin(base_url, url) for url in (self.og_image, self.twitter_image) if url]
+
+    def candidates(self, base_url: str) -> List[str]:
+        """기존 방식과 같은 순서의 후보 목록"""
+        return self.head_candidates(base_url) + [urljoin(base_url, url) for url in self.backgrounds + self.images]
+
+
+def charset_from_headers(headers) -> Optional[str]:
+    """Content-Type 헤더의 charset (없으면 None)"""
+    match = _HEADER_CHARSET.search(headers.get('Content-Type', '') or '')
+    return match.group(1) if match else None
+
+
+def _decoder(charset: Optional[str]):
+    name = (charset or 'utf-8').lower()
+    name = _CHARSET_ALIASES.get(name, name)
+    try:
+        return codecs.getincrementaldecoder(name)(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+
+def extract_hero_image(html: str, base_url: str) -> str:
+    """HTML 문서 전체에서 대표 이미지 URL 추출"""
+    parser = HeroImageParser()
+    parser.feed(html)
+    parser.close()
+    return choose_image(parser.candidates(base_url))
+
+
+def stream_hero_candidates(chunks: Iterable[bytes], base_url: str, charset: Optional[str] = None,
+                           max_bytes: int = MAX_PAGE_BYTES) -> Tuple[List[str], int]:
+    """
+    응답 청크를 읽으며 대표 이미지 후보 수집 → (우선순위 순 이미지 URL 목록, 읽은 바이트 수)
+    <head>의 og/twitter 이미지가 있으면 head가 끝나는 즉시 중단, 없으면 max_bytes까지 본문 스캔
+    """
+    parser = HeroImageParser()
+    decoder = None
+    pending = b''
+    read = 0
+    for chunk in chunks:
+        read += len(chunk)
+        if decoder is None:
+            # 문자셋 판단용으로 앞부분을 모음
+            pending += chunk
+            if len(pending) < SNIFF_BYTES and read < max_bytes:
+                continue
+            meta = _META_CHARSET.search(pending[:SNIFF_BYTES])
+            decoder = _decoder(charset or (meta.group(1).decode('ascii') if meta else None))
+            chunk, pending = pending, b''
+        parser.feed(decoder.decode(chunk))
+        if parser.head_done and rank_images(parser.head_candidates(base_url)):
+            return rank_images(parser.head_candidates(base_url)), read
+        if read >= max_bytes:
+            return rank_images(parser.candidates(base_url)), read
+
+    if decoder is None:
+        meta = _META_CHARSET.search(pending[:SNIFF_BYTES])
+        decoder = _decoder(charset or (meta.group(1).decode('ascii') if meta else None))
+    parser.feed(decoder.decode(pending, final=True))
+    parser.close()
+    return rank_images(parser.candidates(base_url)), read
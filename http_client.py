@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+크롤러 공용 HTTP 클라이언트
+
+- 호스트별 keep-alive 세션 (커넥션 풀 재사용)
+- 호스트별 기본 헤더 / 타임아웃을 한 곳에서 관리
+- 연결 오류, 타임아웃, 5xx는 지터가 있는 지수 백오프로 제한 횟수만큼 재시도
+- 호스트 속도 제한(rate_limiter) 경유, 429/503은 Retry-After 대기 후 재시도
+- 호스트별 요청 수 / 수신 바이트 / 새 연결(TLS 핸드셰이크) 수 집계
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from rate_limiter import THROTTLE_STATUSES, get_limiter
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+}
+
+# 호스트별 추가 헤더
+HOST_HEADERS: Dict[str, Dict[str, str]] = {
+    'worldsmarathons.com': {
+        "Referer": "https://worldsmarathons.com/",
+        "Accept": "application/json",
+    },
+    'api.mymemory.translated.net': {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    },
+}
+
+# 호스트별 타임아웃 (초)
+HOST_TIMEOUTS: Dict[str, float] = {
+    'worldsmarathons.com': 30,
+    'api.mymemory.translated.net': 5,
+    'www.roadrun.co.kr': 15,
+}
+DEFAULT_TIMEOUT = 10
+
+RETRY_STATUSES = (500, 502, 504) + THROTTLE_STATUSES
+POOL_SIZE = 32  # 호스트별 최대 유지 연결 수 (병렬 스레드 수 이상)
+
+_sessions: Dict[str, requests.Session] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+_lock = threading.Lock()
+
+
+def _counting_pool_classes(host: str) -> Dict[str, type]:
+    """새 연결(connect)마다 host의 handshakes를 세는 urllib3 풀 클래스"""
+
+    class CountingHTTPConnection(HTTPConnection):
+        def connect(self):
+            super().connect()
+            _count(host, 'handshakes')
+
+    class CountingHTTPSConnection(HTTPSConnection):
+        def connect(self):
+            super().connect()
+            _count(host, 'handshakes')
+
+    class CountingHTTPPool(HTTPConnectionPool):
+        ConnectionCls = CountingHTTPConnection
+
+    class CountingHTTPSPool(HTTPSConnectionPool):
+        ConnectionCls = CountingHTTPSConnection
+
+    return {'http': CountingHTTPPool, 'https': CountingHTTPSPool}
+
+
+def _session_for(host: str) -> requests.Session:
+    """호스트별 공유 세션 (최초 호출 시 생성)"""
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+            adapter.poolmanager.pool_classes_by_scheme = _counting_pool_classes(host)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            session.headers.update(HOST_HEADERS.get(host, {}))
+            _sessions[host] = session
+            _stats[host] = {'requests': 0, 'retries': 0, 'bytes': 0, 'handshakes': 0}
+        return session
+
+
+def _count(host: str, key: str, amount: int = 1):
+    with _lock:
+        _stats[host][key] += amount
+
+
+def _backoff(attempt: int, base: float = 0.5, cap: float = 10.0) -> float:
+    """지터를 섞은 지수 백오프 (attempt=0부터)"""
+    return min(cap, base * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+
+def get(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+        timeout: Optional[float] = None, max_retries: int = 2, **kwargs) -> requests.Response:
+    """
+    GET 요청 (세션 재사용 + 속도 제한 + 재시도)
+
+    Args:
+        url: 요청 URL
+        params: 쿼리 파라미터
+        headers: 요청별 추가 헤더 (호스트 기본 헤더 위에 덮어씀)
+        timeout: 타임아웃 (기본: HOST_TIMEOUTS)
+        max_retries: 연결 오류/5xx/429 재시도 횟수
+        **kwargs: requests.Session.get에 그대로 전달 (stream, allow_redirects 등)
+
+    Raises:
+        requests.RequestException: 재시도 후에도 연결 오류/타임아웃일 때
+    """
+    host = urlparse(url).netloc
+    session = _session_for(host)
+    limiter = get_limiter(host)
+    if timeout is None:
+        timeout = HOST_TIMEOUTS.get(host, DEFAULT_TIMEOUT)
+
+    for attempt in range(max_retries + 1):
+        limiter.acquire()
+        _count(host, 'requests')
+        try:
+            resp = session.get(url, params=params, headers=headers, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+            _count(host, 'retries')
+            time.sleep(_backoff(attempt))
+            continue
+
+        throttled = limiter.report(resp.status_code, resp.headers.get('Retry-After'))
+        if resp.status_code not in RETRY_STATUSES or attempt == max_retries:
+            if not kwargs.get('stream'):
+                _count(host, 'bytes', len(resp.content))
+            return resp
+        _count(host, 'retries')
+        resp.close()
+        if not throttled:
+            # 429/503은 limiter가 Retry-After만큼 호스트 전체를 멈추므로 추가 대기 불필요
+            time.sleep(_backoff(attempt))
+    return resp
+
+
+def count_bytes(url: str, amount: int):
+    """stream=True로 직접 읽은 바이트 수 집계"""
+    host = urlparse(url).netloc
+    _session_for(host)
+    _count(host, 'bytes', amount)
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    """호스트별 {requests, retries, bytes, handshakes}"""
+    with _lock:
+        return {host: dict(values) for host, values in _stats.items()}
+
+
+def print_stats():
+    """호스트별 요청/바이트/연결 통계 출력"""
+    host_stats = stats()
+    if not host_stats:
+        return
+    print("\n🔌 HTTP 연결 통계 (호스트별)")
+    for host, values in sorted(host_stats.items(), key=lambda x: -x[1]['requests']):
+        reuse = values['requests'] - values['handshakes']
+        print(f"  {host}: 요청 {values['requests']}회 (재시도 {values['retries']}회) | "
+              f"수신 {values['bytes'] / 1024:,.0f}KB | 새 연결 {values['handshakes']}회 "
+              f"(재사용 {max(0, reuse)}회)")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+대표 이미지 후보 검증 (Range 요청으로 앞부분 바이트만 받아 형식 / 픽셀 크기 확인)
+
+URL 확장자만 보고 고르면 깨진 링크나 작은 로고/아이콘이 대표 이미지가 되므로,
+후보마다 `Range: bytes=0-4095` 요청을 보내 헤더 바이트에서 형식과 크기를 읽는다.
+
+- PNG / GIF / WebP / BMP: 고정 위치 헤더, JPEG: SOF 마커, SVG: width/height 또는 viewBox
+- 4xx/5xx, 접속 실패, HTML 응답, 알 수 없는 형식 → 깨진 링크로 제외
+- min_width × min_height보다 작은 이미지 → 아이콘으로 제외
+- 통과한 후보 중 면적이 가장 큰 이미지 선택 (같으면 후보 순서 = banner/main/logo 우선순위)
+- 크기를 못 읽은 이미지(SOF가 앞 4KB 밖인 JPEG, 크기 없는 SVG, 헤더가 잘린 응답)는 크기를 아는 후보가 없을 때만 사용
+- 홈페이지 하나당 후보 max_probes개까지, workers개씩 동시에 확인 (요청 속도는 http_client 호스트별 limiter)
+"""
+
+import re
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
+
+import http_client
+
+PROBE_BYTES = 4096
+MIN_WIDTH = 200
+MIN_HEIGHT = 100
+MAX_PROBES = 4    # 홈페이지 하나당 확인할 후보 수
+PROBE_WORKERS = 4
+
+_JPEG_SOF = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_SVG_TAG = re.compile(rb"<svg\b[^>]*>", re.I)
+_SVG_SIZE = re.compile(rb"\b(width|height)\s*=\s*[\"']?\s*(\d+(?:\.\d+)?)(px)?\s*[\"']", re.I)
+_SVG_VIEWBOX = re.compile(rb"\bviewBox\s*=\s*[\"']\s*[-\d.]+[\s,]+[-\d.]+[\s,]+([\d.]+)[\s,]+([\d.]+)", re.I)
+
+
+class ImageInfo(NamedTuple):
+    """확인된 이미지 (크기를 못 읽었으면 width/height None)"""
+    url: str
+    format: str
+    width: Optional[int]
+    height: Optional[int]
+
+
+def _jpeg_size(data: bytes) -> Tuple[Optional[int], Optional[int]]:
+    """JPEG 마커를 따라가며 SOF의 (가로, 세로), 범위 안에 없으면 (None, None)"""
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            break
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        if marker in _JPEG_SOF:
+            height, width = struct.unpack('>HH', data[i + 5:i + 9])
+            return width, height
+        i += 2 + struct.unpack('>H', data[i + 2:i + 4])[0]
+    return None, None
+
+
+def _svg_size(data: bytes) -> Tuple[Optional[int], Optional[int]]:
+    """<svg>의 width/height(px) 또는 viewBox 크기"""
+    tag = _SVG_TAG.search(data)
+    if not tag:
+        return None, None
+    sizes = {name.lower(): float(value) for name, value, _ in _SVG_SIZE.findall(tag.group(0))}
+    if b'width' in sizes and b'height' in sizes:
+        return int(sizes[b'width']), int(sizes[b'height'])
+    box = _SVG_VIEWBOX.search(tag.group(0))
+    if box:
+        try:
+            return int(float(box.group(1))), int(float(box.group(2)))
+        except ValueError:  # "1.2.3" 같은 잘못된 숫자
+            return None, None
+    return None, None
+
+
+def image_size(data: bytes) -> Optional[Tuple[str, Optional[int], Optional[int]]]:
+    """
+    앞부분 바이트 → (형식, 가로, 세로), 이미지가 아니면 None
+    형식은 알지만 헤더가 잘려 크기를 못 읽으면 (형식, None, None) — 깨진 링크가 아니라 크기 모름
+    """
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and data[12:16] == b'IHDR':
+        if len(data) < 24:
+            return 'png', None, None
+        return ('png',) + struct.unpack('>II', data[16:24])
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        if len(data) < 10:
+            return 'gif', None, None
+        return ('gif',) + struct.unpack('<HH', data[6:10])
+    if data[:3] == b'\xff\xd8\xff':
+        return ('jpeg',) + _jpeg_size(data)
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        if len(data) < 30:
+            return 'webp', None, None
+        chunk = data[12:16]
+        if chunk == b'VP8 ' and data[23:26] == b'\x9d\x01\x2a':
+            width, height = struct.unpack('<HH', data[26:30])
+            return 'webp', width & 0x3FFF, height & 0x3FFF
+        if chunk == b'VP8L' and data[20] == 0x2F:
+            bits = struct.unpack('<I', data[21:25])[0]
+            return 'webp', (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b'VP8X':
+            return 'webp', int.from_bytes(data[24:27], 'little') + 1, int.from_bytes(data[27:30], 'little') + 1
+        return 'webp', None, None
+    if data[:2] == b'BM' and len(data) >= 26:
+        width, height = struct.unpack('<ii', data[18:26])
+        return 'bmp', width, abs(height)
+    head = data[:1024].lstrip()
+    if head.startswith((b'<?xml', b'<svg', b'<!--')) and _SVG_TAG.search(data):
+        return ('svg',) + _svg_size(data)
+    return None
+
+
+def probe_image(url: str, probe_bytes: int = PROBE_BYTES) -> Optional[ImageInfo]:
+    """이미지 URL 앞부분만 받아 형식/크기 확인 (깨진 링크나 이미지가 아니면 None)"""
+    try:
+        resp = http_client.get(url, headers={'Range': f'bytes=0-{probe_bytes - 1}'},
+                               allow_redirects=True, stream=True, max_retries=1)
+        with resp:
+            if resp.status_code not in (200, 206):
+                return None
+            if resp.headers.get('Content-Type', '').startswith('text/html'):
+                return None  # 없는 이미지를 HTML 페이지로 돌려주는 사이트
+            # Range를 무시하고 200으로 전체를 보내는 서버도 앞부분만 읽고 끊음
+            data = b''
+            for chunk in resp.iter_content(probe_bytes):
+                data += chunk
+                if len(data) >= probe_bytes:
+                    break
+        http_client.count_bytes(url, len(data))
+    except Exception:
+        return None
+    size = image_size(data[:probe_bytes])
+    return ImageInfo(url, *size) if size else None
+
+
+class ImageValidator:
+    """후보 목록에서 살아 있고 충분히 큰 대표 이미지 선택 (thread-safe)"""
+
+    def __init__(self, min_width: int = MIN_WIDTH, min_height: int = MIN_HEIGHT,
+                 max_probes: int = MAX_PROBES, workers: int = PROBE_WORKERS):
+        """
+        Args:
+            min_width / min_height: 이보다 작으면 아이콘으로 보고 제외
+            max_probes: 홈페이지 하나당 확인할 후보 수 (우선순위 순)
+            workers: 후보 동시 확인 수
+        """
+        self.min_width = min_width
+        self.min_height = min_height
+        self.max_probes = max_probes
+        self.workers = workers
+        self.stats = {'probed': 0, 'dead': 0, 'small': 0, 'unsized': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def check(self, url: str) -> Optional[ImageInfo]:
+        """후보 하나 확인 → 통과하면 ImageInfo, 깨졌거나 작으면 None"""
+        self._count('probed')
+        info = probe_image(url)
+        if info is None:
+            self._count('dead')
+            return None
+        if info.width is None or info.height is None:
+            self._count('unsized')
+        elif info.width < self.min_width or info.height < self.min_height:
+            self._count('small')
+            return None
+        return info
+
+    def best(self, candidates: List[str]) -> str:
+        """우선순위 순 후보 → 크기를 아는 통과 이미지 중 가장 큰 것 (없으면 크기 모르는 첫 이미지, 그것도 없으면 '')"""
+        candidates = candidates[:self.max_probes]
+        if not candidates:
+            return ""
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(candidates))) as pool:
+            infos = [info for info in pool.map(self.check, candidates) if info]
+        sized = [info for info in infos if info.width is not None and info.height is not None]
+        if sized:
+            return max(sized, key=lambda info: info.width * info.height).url
+        return infos[0].url if infos else ""
+
+
+if __name__ == '__main__':
+    import sys
+
+    for image_url in sys.argv[1:]:
+        print(image_url, probe_image(image_url))
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+메모리 절약형 해외 대회 레코드
+
+parse_marathon 결과(필드 약 50개 dict)를 __slots__ 객체로 보관한다.
+- 국가/대륙/노면/난이도/종목 등 반복되는 문자열은 intern, 태그/거리 목록은 같은 내용끼리 튜플 공유
+- 다른 필드로 계산되는 중복 필드(coordinates, minPrice, thumbnail, location 등)는 저장하지 않고
+  get()/to_dict() 시점에 계산
+- dict처럼 get / [] / []= 로 접근 가능 (통계 출력, 비자 병합 코드 그대로 사용)
+"""
+
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# marathons_global.json 레코드 필드 순서 (parse_marathon과 동일)
+PARSED_FIELDS = (
+    'id', 'title',
+    'dateNextRace', 'strDateNextRace', 'strDateRangeNextRaceWeekDay', 'firstRaceDate', 'lastRaceDate',
+    'city', 'country', 'countryCode', 'location', 'continent', 'startPoint', 'coordinates',
+    'raceType', 'raceTypeLabel', 'distance', 'uniqueDistances', 'raceDistances', 'mainDistance',
+    'image', 'imageSmall', 'imageExtraSmall', 'thumbnail',
+    'minPriceEUR', 'minPriceKRW', 'minPrice', 'minPriceFormatted', 'earlyBirdDaysLeft', 'hasEarlyBird',
+    'surface', 'courseDifficulty',
+    'tags', 'participantsEstimate',
+    'rating', 'reviewsCount', 'hasReviews',
+    'selfLink', 'website',
+    'registerPossible', 'isSoldOut', 'isRaceDayPassed', 'isAvailable',
+    'isPremium', 'isBeginnerFriendly', 'isScenic',
+)
+
+
+def _coordinates(m: 'Marathon') -> Dict:
+    start_point = m.startPoint
+    return {'latitude': start_point[1] if len(start_point) > 1 else 0,
+            'longitude': start_point[0] if len(start_point) > 0 else 0}
+
+
+# 저장하지 않고 계산하는 필드
+DERIVED_FIELDS = {
+    'location': lambda m: f"{m.city}, {m.country}" if m.city and m.country else m.city or m.country,
+    'coordinates': _coordinates,
+    'mainDistance': lambda m: m.uniqueDistances[0] if m.uniqueDistances else m.distance,
+    'thumbnail': lambda m: m.imageSmall or m.imageExtraSmall or m.image,
+    'minPrice': lambda m: m.minPriceKRW,
+    'minPriceFormatted': lambda m: f"약 {m.minPriceKRW:,}원" if m.minPriceEUR else '',
+    'hasEarlyBird': lambda m: m.earlyBirdDaysLeft is not None and m.earlyBirdDaysLeft > 0,
+    'hasReviews': lambda m: m.reviewsCount > 0,
+    'isAvailable': lambda m: m.registerPossible and not m.isSoldOut and not m.isRaceDayPassed,
+}
+
+STORED_FIELDS = tuple(name for name in PARSED_FIELDS if name not in DERIVED_FIELDS)
+
+# 파싱 후 추가되는 필드 (merge_visa_data.apply_visa) — 값이 없으면 출력하지 않음
+OPTIONAL_FIELDS = ('visa',)
+_ABSENT = object()
+
+# intern할 문자열 필드 (값 종류가 적고 반복이 많음)
+_INTERNED = ('city', 'country', 'countryCode', 'continent', 'raceType', 'raceTypeLabel',
+             'distance', 'surface', 'courseDifficulty', 'participantsEstimate')
+# 같은 내용이면 하나의 튜플을 공유할 목록 필드 (직렬화 시 list로 복원)
+_SHARED_TUPLES = ('tags', 'uniqueDistances')
+
+_tuple_pool: Dict[Tuple, Tuple] = {}
+
+
+def _share(values) -> Tuple:
+    key = tuple(sys.intern(v) if isinstance(v, str) else v for v in values)
+    try:
+        return _tuple_pool.setdefault(key, key)
+    except TypeError:  # 해시 불가능한 원소 → 공유하지 않음
+        return key
+
+
+class Marathon:
+    """해외 대회 레코드 (__slots__, 중복 필드는 지연 계산)"""
+
+    __slots__ = STORED_FIELDS + OPTIONAL_FIELDS + ('_extra',)
+
+    def __init__(self, **fields):
+        self._extra: Optional[Dict[str, Any]] = None
+        for name in STORED_FIELDS:
+            setattr(self, name, fields.pop(name, None))
+        for name in OPTIONAL_FIELDS:
+            setattr(self, name, fields.pop(name, _ABSENT))
+        for name, value in fields.items():
+            self[name] = value
+
+    @classmethod
+    def from_parsed(cls, parsed: Dict) -> 'Marathon':
+        """
+        parse_marathon 결과 dict → Marathon
+        계산 필드 값이 계산 결과와 다르거나 알 수 없는 키는 따로 보관해 to_dict가 원본과 같게 함
+        """
+        m = cls.__new__(cls)
+        m._extra = None
+        for name in OPTIONAL_FIELDS:
+            setattr(m, name, parsed.get(name, _ABSENT))
+        for name in STORED_FIELDS:
+            value = parsed.get(name)
+            if name in _INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            elif name in _SHARED_TUPLES and isinstance(value, list):
+                value = _share(value)
+            setattr(m, name, value)
+        for name, value in parsed.items():
+            if name in DERIVED_FIELDS:
+                try:
+                    same = DERIVED_FIELDS[name](m) == value
+                except TypeError:
+                    same = False
+                if not same:
+                    m._set_extra(name, value)
+            elif name not in STORED_FIELDS and name not in OPTIONAL_FIELDS:
+                m._set_extra(name, value)
+        missing = [name for name in PARSED_FIELDS if name not in parsed]
+        if missing:
+            m._set_extra('_missing', missing)
+        return m
+
+    def _set_extra(self, name: str, value: Any):
+        if self._extra is None:
+            self._extra = {}
+        self._extra[name] = value
+
+    def get(self, name: str, default: Any = None) -> Any:
+        extra = self._extra
+        if extra is not None and name in extra:
+            return extra[name]
+        if extra is not None and name in extra.get('_missing', ()):
+            return default
+        if name in DERIVED_FIELDS:
+            return DERIVED_FIELDS[name](self)
+        if name in STORED_FIELDS:
+            value = getattr(self, name)
+            return list(value) if name in _SHARED_TUPLES and isinstance(value, tuple) else value
+        if name in OPTIONAL_FIELDS:
+            value = getattr(self, name)
+            return default if value is _ABSENT else value
+        return default
+
+    def __getitem__(self, name: str) -> Any:
+        sentinel = object()
+        value = self.get(name, sentinel)
+        if value is sentinel:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name: str, value: Any):
+        if (name in STORED_FIELDS or name in OPTIONAL_FIELDS) and not (self._extra and name in self._extra):
+            setattr(self, name, value)
+        else:
+            self._set_extra(name, value)
+
+    def __contains__(self, name: str) -> bool:
+        sentinel = object()
+        return self.get(name, sentinel) is not sentinel
+
+    def to_dict(self) -> Dict:
+        """marathons_global.json 레코드 dict (parse_marathon 필드 순서 + 추가 필드)"""
+        extra = self._extra or {}
+        missing = extra.get('_missing', ())
+        record = {}
+        for name in PARSED_FIELDS:
+            if name in extra:
+                record[name] = extra[name]
+            elif name not in missing:
+                record[name] = self.get(name)
+        for name in OPTIONAL_FIELDS:
+            value = getattr(self, name)
+            if value is not _ABSENT and name not in extra:
+                record[name] = value
+        for name, value in extra.items():
+            if name != '_missing' and name not in record:
+                record[name] = value
+        return record
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Marathon):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Marathon(id={self.id!r}, title={self.title!r})"
+
+
+def compact(records: Iterable[Dict]) -> List[Marathon]:
+    """dict 레코드 목록 → Marathon 목록"""
+    return [Marathon.from_parsed(record) for record in records]
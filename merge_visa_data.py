@@ -7,6 +7,8 @@ import re
 import sys
 import time
 
+from dataset_io import JsonlWriter, atomic_open, iter_jsonl, read_jsonl_manifest
+
 def parse_visa_period(gnrl_pspt_visa_cn):
     """
     비자 기간 텍스트를 파싱하여 숫자로 변환
@@ -79,60 +81,34 @@ def parse_visa_period(gnrl_pspt_visa_cn):
     # 단일 숫자인 경우
     return numbers[0]
 
-def main():
-    # 커맨드 라인 인자로 파일 이름 받기
-    if len(sys.argv) > 1:
-        filename = sys.argv[1]
-    else:
-        filename = 'marathons_global.json'
-
-    # 파일 경로 설정
-    data_dir = 'data'
-    input_file = f'{data_dir}/{filename}'
-    visa_file = f'{data_dir}/visa.json'
-    output_file = f'{data_dir}/{filename}'
-
-    start_time = time.time()
-
-    print(f"마라톤 데이터 로딩 중: {input_file}")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        marathons_json = json.load(f)
-
-    # 파일 구조에 따라 다르게 처리
-    if 'marathons' in marathons_json:
-        # marathons_global.json 구조
-        marathons_data = marathons_json.get('marathons', [])
-        metadata = marathons_json.get('metadata', {})
-        structure_type = 'marathons'
-    elif 'results' in marathons_json:
-        # marathons_global_raw.json 구조
-        marathons_data = marathons_json.get('results', [])
-        structure_type = 'results'
-    else:
-        print("오류: 알 수 없는 파일 구조입니다.")
-        return
-
-    print(f"총 {len(marathons_data)}개의 마라톤 데이터 로딩됨")
+def load_visa_index(visa_file='data/visa.json'):
+    """
+    visa.json을 country_iso_alp2(대문자)를 키로 하는 딕셔너리로 로드
 
-    print("비자 데이터 로딩 중...")
+    Returns:
+        dict: {국가코드: 비자 정보 항목}
+    """
     with open(visa_file, 'r', encoding='utf-8') as f:
         visa_json = json.load(f)
 
     # visa.json에서 실제 데이터 추출
     visa_data = visa_json.get('response', {}).get('body', {}).get('items', {}).get('item', [])
 
-    # visa.json을 country_iso_alp2를 키로 하는 딕셔너리로 변환
-    print("비자 데이터 인덱싱 중...")
     visa_dict = {}
     for entry in visa_data:
         country_code = entry.get('country_iso_alp2')
         if country_code:
             visa_dict[country_code.upper()] = entry
+    return visa_dict
 
-    print(f"총 {len(visa_dict)}개 국가의 비자 정보 로딩됨")
 
-    # 마라톤 데이터 처리
-    print("\n마라톤 데이터에 비자 정보 추가 중...")
+def apply_visa(marathons_data, visa_dict):
+    """
+    마라톤 목록 각 항목에 'visa' (무비자 체류 가능 일수 또는 None) 추가
+
+    Returns:
+        tuple: (매칭 수, 매칭 실패 수, 매칭되지 않은 국가 코드 set)
+    """
     matched_count = 0
     unmatched_count = 0
     unmatched_countries = set()
@@ -162,6 +138,60 @@ def main():
             unmatched_count += 1
             unmatched_countries.add(country_code)
 
+    return matched_count, unmatched_count, unmatched_countries
+
+
+def main():
+    # 커맨드 라인 인자로 파일 이름 받기
+    if len(sys.argv) > 1:
+        filename = sys.argv[1]
+    else:
+        filename = 'marathons_global.json'
+
+    # 파일 경로 설정
+    data_dir = 'data'
+    input_file = f'{data_dir}/{filename}'
+    visa_file = f'{data_dir}/visa.json'
+    output_file = f'{data_dir}/{filename}'
+
+    start_time = time.time()
+
+    print(f"마라톤 데이터 로딩 중: {input_file}")
+    if input_file.endswith('.jsonl'):
+        # JSON Lines 구조 (레코드 한 줄씩 + 마지막 줄 manifest)
+        marathons_json = {}
+        marathons_data = list(iter_jsonl(input_file))
+        manifest = read_jsonl_manifest(input_file) or {}
+        structure_type = 'jsonl'
+    else:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            marathons_json = json.load(f)
+
+        # 파일 구조에 따라 다르게 처리
+        if 'marathons' in marathons_json:
+            # marathons_global.json 구조
+            marathons_data = marathons_json.get('marathons', [])
+            metadata = marathons_json.get('metadata', {})
+            structure_type = 'marathons'
+        elif 'results' in marathons_json:
+            # marathons_global_raw.json 구조
+            marathons_data = marathons_json.get('results', [])
+            structure_type = 'results'
+        else:
+            print("오류: 알 수 없는 파일 구조입니다.")
+            return
+
+    print(f"총 {len(marathons_data)}개의 마라톤 데이터 로딩됨")
+
+    print("비자 데이터 로딩 및 인덱싱 중...")
+    visa_dict = load_visa_index(visa_file)
+
+    print(f"총 {len(visa_dict)}개 국가의 비자 정보 로딩됨")
+
+    # 마라톤 데이터 처리
+    print("\n마라톤 데이터에 비자 정보 추가 중...")
+    matched_count, unmatched_count, unmatched_countries = apply_visa(marathons_data, visa_dict)
+
     print(f"\n매칭 완료: {matched_count}개")
     print(f"매칭 실패: {unmatched_count}개")
 
@@ -175,8 +205,14 @@ def main():
     elif structure_type == 'results':
         marathons_json['results'] = marathons_data
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(marathons_json, f, ensure_ascii=False, indent=2)
+    if structure_type == 'jsonl':
+        with JsonlWriter(output_file) as writer:
+            for marathon in marathons_data:
+                writer.write(marathon)
+            writer.close({key: value for key, value in manifest.items() if key != 'count'})
+    else:
+        with atomic_open(output_file) as f:
+            json.dump(marathons_json, f, ensure_ascii=False, indent=2)
 
     end_time = time.time()
     elapsed_time = end_time - start_time
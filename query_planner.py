@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+검색 API 1,000개 제한을 우회하는 적응형 분할 쿼리 플래너
+
+응답의 count가 수신한 결과 수보다 클 때만 파티션을 분할한다.
+분할 순서: continent → raceType → country → 날짜 구간
+
+날짜 구간은 API가 dateFrom/dateTo를 실제로 반영하는지 먼저 확인한 뒤에만 분할하고,
+오늘부터 date_window_days 길이의 닫힌 구간 date_windows개만 이분할한다 (열린 앞뒤 구간은 분할하지 않음).
+자식 구간의 count가 부모와 같은데 형제 구간 합계가 부모를 넘으면 (날짜가 무시된 응답) 분할 불가로 기록하고,
+전체 요청 수는 max_requests로 제한한다.
+"""
+
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 날짜 구간 파라미터 (ISO 날짜, 양 끝 포함)
+DATE_FROM_PARAM = 'dateFrom'
+DATE_TO_PARAM = 'dateTo'
+# 날짜 파라미터 확인용 구간 (대회가 있을 수 없는 과거 하루 → 반영되면 count 0)
+PROBE_DATE = '1900-01-01'
+
+MAX_REQUESTS = 3000  # 플래너 한 번 실행의 요청 상한
+
+DIMENSIONS = ['continent', 'raceType', 'country', 'date']
+
+# fetch_many(queries) → [(results, count), ...]  (results가 None이면 요청 실패)
+FetchMany = Callable[[List[Tuple[Dict, str]]], List[Tuple[Optional[List[Dict]], int]]]
+
+
+def partition_label(params: Dict) -> str:
+    """파티션 파라미터를 로그용 라벨로 변환 (예: europe/half_marathon/France)"""
+    parts = [params[key] for key in ('continent', 'raceType', 'country') if params.get(key)]
+    if DATE_FROM_PARAM in params or DATE_TO_PARAM in params:
+        parts.append(f"{params.get(DATE_FROM_PARAM, '')}~{params.get(DATE_TO_PARAM, '')}")
+    return '/'.join(parts) or 'catch-all'
+
+
+class QueryPlanner:
+    """count 기반 재귀 분할 플래너 (레벨 단위로 fetch_many 호출)"""
+
+    def __init__(self, continents: List[str], race_types: List[str],
+                 countries_by_continent: Dict[str, List[str]],
+                 today: Optional[date] = None, date_window_days: int = 365, date_windows: int = 3,
+                 roots: Optional[List[Dict]] = None, max_requests: int = MAX_REQUESTS):
+        """
+        Args:
+            continents: 1단계 분할에 사용할 API continent 값
+            race_types: 2단계 분할에 사용할 API raceType 값
+            countries_by_continent: 결과에서 찾지 못한 국가를 보충할 대륙별 국가 목록
+            today: 날짜 분할 기준일 (기본: 오늘)
+            date_window_days: 날짜 분할 시 오늘부터 자르는 닫힌 구간 길이
+            date_windows: 닫힌 구간 수 (이 범위 밖의 열린 앞뒤 구간은 분할하지 않음)
+            roots: 시작 파티션 목록 (기본: 전체 쿼리 하나) — 수집 범위를 API 단계에서 좁힐 때 사용
+            max_requests: 요청 상한 (도달하면 남은 파티션은 요청하지 않음)
+        """
+        self.continents = continents
+        self.race_types = race_types
+        self.countries_by_continent = countries_by_continent
+        self.today = today or date.today()
+        self.date_window = timedelta(days=date_window_days)
+        self.date_windows = date_windows
+        self.roots = roots or [{}]
+        self.max_requests = max_requests
+        self.dates_narrow: Optional[bool] = None  # API가 날짜 파라미터를 반영하는지 (None: 아직 확인 안 함)
+        self.stats = {'requests': 0, 'complete': 0, 'split': 0, 'failed': 0, 'uncovered': 0,
+                      'unsplittable': 0, 'skipped': 0}
+
+    @staticmethod
+    def _depth(params: Dict) -> int:
+        """파티션에 설정된 가장 깊은 분할 차원의 인덱스 (-1: 분할 없음)"""
+        depth = -1
+        for i, dim in enumerate(DIMENSIONS):
+            if dim == 'date':
+                if DATE_FROM_PARAM in params or DATE_TO_PARAM in params:
+                    depth = i
+            elif dim in params:
+                depth = i
+        return depth
+
+    def _split_dates(self, params: Dict) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        날짜 구간 분할: 날짜 조건이 없으면 (과거, 오늘부터 date_window 단위 닫힌 구간들, 그 이후),
+        닫힌 구간은 이분할, 열린 구간은 더 이상 분할하지 않음
+        """
+        start = params.get(DATE_FROM_PARAM)
+        end = params.get(DATE_TO_PARAM)
+        one_day = timedelta(days=1)
+        if start is None and end is None:
+            windows = [(None, (self.today - one_day).isoformat())]
+            lo = self.today
+            for _ in range(self.date_windows):
+                hi = lo + self.date_window
+                windows.append((lo.isoformat(), hi.isoformat()))
+                lo = hi + one_day
+            return windows + [(lo.isoformat(), None)]
+        if start is None or end is None:
+            return []  # 열린 구간을 계속 자르면 날짜를 무시하는 API에서 끝없이 분할됨
+        lo, hi = date.fromisoformat(start), date.fromisoformat(end)
+        if lo >= hi:
+            return []  # 하루 단위 구간은 더 이상 분할 불가
+        mid = lo + (hi - lo) // 2
+        return [(start, mid.isoformat()), ((mid + one_day).isoformat(), end)]
+
+    def _known_countries(self, params: Dict) -> List[str]:
+        """파티션 대륙에 속하는 알려진 국가 목록 (대륙 미지정시 전체)"""
+        continent = params.get('continent')
+        if continent:
+            return self.countries_by_continent.get(continent, [])
+        return sorted({c for cs in self.countries_by_continent.values() for c in cs})
+
+    def _split(self, params: Dict, dim_index: int, results: Iterable[Dict]) -> List[Dict]:
+        """params를 dim_index 차원으로 분할한 자식 파티션 목록"""
+        dim = DIMENSIONS[dim_index]
+        if dim == 'continent':
+            values = self.continents
+        elif dim == 'raceType':
+            values = self.race_types
+        elif dim == 'country':
+            values = sorted({r.get('country', '') for r in results} - {''}) or self._known_countries(params)
+        else:
+            children = []
+            for start, end in self._split_dates(params):
+                child = {k: v for k, v in params.items() if k not in (DATE_FROM_PARAM, DATE_TO_PARAM)}
+                if start is not None:
+                    child[DATE_FROM_PARAM] = start
+                if end is not None:
+                    child[DATE_TO_PARAM] = end
+                children.append(child)
+            return children
+        return [{**params, dim: value} for value in values]
+
+    def _next_dim(self, params: Dict) -> int:
+        """다음 분할 차원 (날짜 구간은 반복 분할 가능)"""
+        depth = self._depth(params)
+        if depth >= 0 and DIMENSIONS[depth] == 'date':
+            return depth
+        return depth + 1
+
+    def _fill_gap(self, parent: Dict, dim_index: int, tried: List[Dict]) -> List[Dict]:
+        """
+        자식 count 합이 부모 count보다 작을 때 보충 파티션
+        1. country: 결과에서 못 본 알려진 국가 추가
+        2. 그 외 (또는 국가 보충 후에도 부족): 부모를 다음 차원으로 직접 분할
+        """
+        dim = DIMENSIONS[dim_index]
+        if dim == 'country':
+            tried_values = {child.get('country') for child in tried}
+            extra = [c for c in self._known_countries(parent) if c not in tried_values]
+            if extra:
+                return [{**parent, 'country': c} for c in extra]
+        if dim_index + 1 < len(DIMENSIONS):
+            return self._split(parent, dim_index + 1, [])
+        return []
+
+    def _check_dates(self, fetch_many: FetchMany, params: Dict) -> bool:
+        """
+        날짜 구간으로 분할하기 전에 API가 dateFrom/dateTo를 반영하는지 한 번만 확인
+        (대회가 없는 과거 하루 구간의 count가 0이 아니면 날짜 파라미터가 무시되는 것)
+        """
+        if self.dates_narrow is None:
+            probe = {**params, DATE_FROM_PARAM: PROBE_DATE, DATE_TO_PARAM: PROBE_DATE}
+            [(results, count)] = fetch_many([(probe, partition_label(probe))])
+            self.stats['requests'] += 1
+            if results is None:
+                return False  # 확인 실패 → 이번 파티션만 분할하지 않고 다음에 다시 확인
+            self.dates_narrow = count == 0
+            if not self.dates_narrow:
+                print(f"  ⚠️  API가 {DATE_FROM_PARAM}/{DATE_TO_PARAM}를 반영하지 않음 (count {count}) → 날짜 분할 안 함")
+        return self.dates_narrow
+
+    def _unsplittable(self, params: Dict, missing: int, reason: str):
+        self.stats['unsplittable'] += 1
+        self.stats['uncovered'] += missing
+        print(f"  ⚠️  {partition_label(params)}: {reason} ({missing}개 미수집)")
+
+    def plan(self, fetch_many: FetchMany) -> Dict[str, int]:
+        """
+        루트 쿼리(기본: 전체)부터 레벨 단위로 요청하며 필요한 파티션만 분할
+
+        Returns:
+            요청/완료/분할/실패/미수집/분할 불가/요청 생략 건수 통계
+        """
+        # (params, 부모 그룹 id) — 같은 부모의 자식은 같은 레벨에 있음
+        frontier: List[Tuple[Dict, Optional[int]]] = [(dict(root), None) for root in self.roots]
+        groups: Dict[int, Dict] = {}
+        group_seq = 0
+
+        while frontier:
+            remaining = self.max_requests - self.stats['requests']
+            if len(frontier) > remaining:
+                skipped = frontier[max(remaining, 0):]
+                frontier = frontier[:max(remaining, 0)]
+                self.stats['skipped'] += len(skipped)
+                for _, group_id in skipped:
+                    if group_id is not None:
+                        groups[group_id]['filled'] = True  # 일부 자식만 요청했으므로 보충 쿼리 안 함
+                print(f"  ⚠️  요청 상한 {self.max_requests}회 도달 → 파티션 {len(skipped)}개 요청 안 함")
+                if not frontier:
+                    break
+            responses = fetch_many([(params, partition_label(params)) for params, _ in frontier])
+            self.stats['requests'] += len(frontier)
+
+            # 그룹별 자식 count 합계 (날짜 무시 판정과 보충 쿼리에 사용)
+            child_counts: Dict[int, int] = {}
+            failed_groups = set()
+            for (params, group_id), (results, count) in zip(frontier, responses):
+                if results is None:
+                    failed_groups.add(group_id)
+                elif group_id is not None:
+                    child_counts[group_id] = child_counts.get(group_id, 0) + count
+
+            next_frontier: List[Tuple[Dict, Optional[int]]] = []
+            for (params, group_id), (results, count) in zip(frontier, responses):
+                if results is None:
+                    self.stats['failed'] += 1
+                    continue
+                if count <= len(results):
+                    self.stats['complete'] += 1
+                    continue
+
+                missing = count - len(results)
+                parent = groups.get(group_id)
+                if (parent and DIMENSIONS[parent['dim']] == 'date' and count >= parent['count']
+                        and child_counts[group_id] > parent['count']):
+                    # 서로 겹치지 않는 구간의 합계가 부모보다 큼 → 날짜 조건이 결과를 좁히지 못함
+                    self._unsplittable(params, missing, "날짜 구간이 부모와 같은 count")
+                    continue
+                dim_index = self._next_dim(params)
+                if DIMENSIONS[dim_index] == 'date' and not self._check_dates(fetch_many, params):
+                    self._unsplittable(params, missing, "날짜 분할 불가")
+                    continue
+                children = self._split(params, dim_index, results)
+                if not children:
+                    self._unsplittable(params, missing, "더 이상 분할 불가")
+                    continue
+                self.stats['split'] += 1
+                group_seq += 1
+                groups[group_seq] = {'parent': params, 'dim': dim_index, 'count': count,
+                                     'children': children, 'filled': False}
+                next_frontier.extend((child, group_seq) for child in children)
+
+            # 자식 count 합이 부모보다 작으면 (분류 누락) 보충 파티션 추가
+            for group_id, total in child_counts.items():
+                group = groups[group_id]
+                if group['filled'] or group_id in failed_groups or total >= group['count']:
+                    continue
+                group['filled'] = True
+                extra = self._fill_gap(group['parent'], group['dim'], group['children'])
+                if (any(DATE_FROM_PARAM in c or DATE_TO_PARAM in c for c in extra)
+                        and not self._check_dates(fetch_many, group['parent'])):
+                    extra = []
+                if extra:
+                    print(f"  🔎 {partition_label(group['parent'])}: 하위 합계 {total}/{group['count']}개 → "
+                          f"보충 쿼리 {len(extra)}개")
+                    next_frontier.extend((child, group_id) for child in extra)
+                    group['children'] = group['children'] + extra
+
+            frontier = next_frontier
+
+        return self.stats
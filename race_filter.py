@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+수집 범위 필터 (날짜 구간 / 대륙 / 종목 / 국가)
+
+- matches(raw): 원본 API 레코드 단위 판정 — 수집 직후, 번역/파싱/비자 병합 전에 적용
+- partition_roots(): 대륙/종목/국가 조건을 분할 쿼리의 시작 파티션으로 변환 (API 단계에서 범위 축소)
+"""
+
+from datetime import date, datetime
+from itertools import product
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+def parse_list(value: Optional[str]) -> Optional[List[str]]:
+    """'a,b' 형태 CLI 인자 → ['a', 'b'] (비어 있으면 None)"""
+    if not value:
+        return None
+    items = [item.strip() for item in value.split(',') if item.strip()]
+    return items or None
+
+
+class RaceFilter:
+    """원본 레코드 필터 (조건이 None이면 해당 차원은 제한 없음)"""
+
+    def __init__(self, date_from: Optional[date] = None, date_to: Optional[date] = None,
+                 continents: Optional[List[str]] = None, race_types: Optional[List[str]] = None,
+                 countries: Optional[List[str]] = None,
+                 continent_of: Optional[Callable[[Dict], str]] = None):
+        """
+        Args:
+            date_from: 이 날짜 이후 대회만 (기본: 오늘 — 지난 대회 제외)
+            date_to: 이 날짜까지의 대회만
+            continents: API continent 값 (예: 'europe', 'North America')
+            race_types: API raceType 값 (예: 'full_marathon')
+            countries: API country 값 (영문 국가명)
+            continent_of: 원본 레코드 → API continent 값 (대륙 조건 판정용, 모르면 '')
+        """
+        self.date_from = date_from or date.today()
+        self.date_to = date_to
+        self.continents = continents
+        self.race_types = race_types
+        self.countries = countries
+        self.continent_of = continent_of or (lambda raw: raw.get('continent', ''))
+        self.stats = {'kept': 0, 'dropped': 0}
+
+    def _in_date_window(self, date_next_race: str) -> bool:
+        if not date_next_race:
+            return True  # 날짜 없는 대회는 parse_marathon과 같이 유지
+        try:
+            race_date = datetime.fromisoformat(date_next_race).date()
+        except (ValueError, TypeError):
+            return True
+        if race_date < self.date_from:
+            return False
+        return self.date_to is None or race_date <= self.date_to
+
+    def matches(self, raw: Dict) -> bool:
+        """원본 레코드가 조건을 모두 만족하면 True"""
+        if self.race_types and raw.get('raceType', 'custom') not in self.race_types:
+            return False
+        if self.countries and raw.get('country', '') not in self.countries:
+            return False
+        if self.continents:
+            continent = self.continent_of(raw)
+            if continent and continent not in self.continents:
+                return False  # 대륙을 모르는 국가는 유지 (대륙 조건으로 좁힌 쿼리에서 온 레코드)
+        return self._in_date_window(raw.get('dateNextRace', ''))
+
+    def apply(self, raw_marathons: Iterable[Dict]) -> List[Dict]:
+        """조건을 만족하는 레코드만 반환 (입력 순서 유지, kept/dropped 집계)"""
+        kept = []
+        for raw in raw_marathons:
+            if self.matches(raw):
+                kept.append(raw)
+            else:
+                self.stats['dropped'] += 1
+        self.stats['kept'] += len(kept)
+        return kept
+
+    def partition_roots(self) -> List[Dict]:
+        """
+        분할 쿼리 시작 파티션 (대륙 × 종목 × 국가 조건의 조합)
+        국가 조건이 있으면 대륙은 국가로 정해지므로 조합에서 뺌 (대륙 판정은 matches에서)
+        조건이 없으면 [{}] — 전체 쿼리부터 시작
+        """
+        continents = None if self.countries else self.continents
+        dims = [(key, values) for key, values in (('continent', continents),
+                                                  ('raceType', self.race_types),
+                                                  ('country', self.countries)) if values]
+        if not dims:
+            return [{}]
+        keys = [key for key, _ in dims]
+        return [dict(zip(keys, combo)) for combo in product(*(values for _, values in dims))]
+
+    def describe(self) -> str:
+        """로그용 조건 요약"""
+        parts = [f"{self.date_from.isoformat()}~{self.date_to.isoformat() if self.date_to else ''}"]
+        for name, values in (('대륙', self.continents), ('종목', self.race_types), ('국가', self.countries)):
+            if values:
+                parts.append(f"{name} {', '.join(values)}")
+        return ' | '.join(parts)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+호스트별 토큰 버킷 요청 속도 제한 (스레드 / asyncio 공용)
+
+- 호스트마다 초당 요청 수(rate)와 순간 허용량(burst)을 설정
+- HTTP 429/503 수신 시 Retry-After 만큼 호스트 전체 요청을 멈추고 속도를 절반으로 낮춤
+- 이후 성공 응답마다 설정 속도로 조금씩 회복
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+# 호스트별 기본 (초당 요청 수, burst)
+HOST_LIMITS: Dict[str, Tuple[float, int]] = {
+    'worldsmarathons.com': (1 / 0.3, 1),
+    'api.mymemory.translated.net': (20.0, 15),
+    'www.roadrun.co.kr': (1 / 0.3, 1),
+}
+DEFAULT_LIMIT = (1.0, 2)  # 그 외 호스트 (대회 홈페이지 등)
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 대기 초"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class TokenBucket:
+    """토큰 버킷 속도 제한기 (thread-safe, 대기는 락 밖에서 수행)"""
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다")
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 16
+        self.burst = max(1, burst)
+        self.throttled = 0  # 429/503 수신 횟수
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._consecutive_throttles = 0
+        self._lock = threading.Lock()
+
+    def configure(self, rate: float, burst: Optional[int] = None):
+        """속도/burst 재설정"""
+        with self._lock:
+            self.max_rate = self.rate = rate
+            self.min_rate = rate / 16
+            if burst is not None:
+                self.burst = max(1, burst)
+                self._tokens = min(self._tokens, float(self.burst))
+
+    def _reserve(self) -> float:
+        """토큰 하나 예약 → 대기해야 할 초 (토큰은 음수까지 빌려 씀)"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(delay, self._blocked_until - now)
+
+    def acquire(self):
+        """요청 1회 허가까지 대기 (스레드용)"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """요청 1회 허가까지 대기 (asyncio용)"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def report(self, status_code: int, retry_after: Optional[str] = None) -> bool:
+        """
+        응답 상태 반영
+
+        Returns:
+            True면 서버가 속도 제한을 걸었음 (호출자는 재시도)
+        """
+        with self._lock:
+            if status_code not in THROTTLE_STATUSES:
+                # 성공 응답마다 설정 속도의 1/10씩 회복
+                self._consecutive_throttles = 0
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+                return False
+
+            self.throttled += 1
+            self._consecutive_throttles += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            wait = parse_retry_after(retry_after)
+            if wait is None:
+                wait = min(60.0, 2 ** self._consecutive_throttles / self.max_rate)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + wait)
+            self._tokens = min(self._tokens, 0.0)
+            return True
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+_default_limit = DEFAULT_LIMIT
+
+
+def get_limiter(host: str) -> TokenBucket:
+    """호스트별 공유 TokenBucket 반환 (최초 호출 시 HOST_LIMITS 기준으로 생성)"""
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            rate, burst = HOST_LIMITS.get(host, _default_limit)
+            limiter = TokenBucket(rate, burst)
+            _limiters[host] = limiter
+        return limiter
+
+
+def configure_host(host: str, rate: float, burst: Optional[int] = None) -> TokenBucket:
+    """호스트 속도 제한 설정 (이미 생성된 limiter도 갱신)"""
+    limiter = get_limiter(host)
+    limiter.configure(rate, burst)
+    return limiter
+
+
+def configure_default(rate: float, burst: Optional[int] = None):
+    """HOST_LIMITS에 없는 호스트의 기본 속도 제한 설정 (아직 limiter가 없는 호스트부터 적용)"""
+    global _default_limit
+    _default_limit = (rate, burst if burst is not None else _default_limit[1])
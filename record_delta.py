@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+레코드 단위 증분 처리 (콘텐츠 해시 비교)
+
+원본 레코드마다 id + 내용 해시를 저장해 두고, 다음 실행에서 해시가 같은 레코드는
+이전 실행의 파싱 결과를 그대로 재사용한다. 새로 생기거나 바뀐 레코드만 번역/파싱/비자 병합을 거친다.
+
+- 파서 버전, 변환 테이블, visa.json이 바뀌면 이전 결과 전체를 무효화 (파서 파일의 주석/로그 수정은 영향 없음)
+- 재사용 레코드도 대회 날짜는 다시 확인 (오늘 이전 대회 제외)
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from dataset_io import atomic_open, iter_records
+from marathon_record import Marathon
+
+
+def content_hash(raw: Dict) -> str:
+    """원본 레코드 내용 해시 (키 순서 무관)"""
+    body = json.dumps(raw, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+
+def file_fingerprint(*paths: str) -> str:
+    """파일 내용 해시 (없는 파일은 빈 내용으로 취급)"""
+    digest = hashlib.sha1()
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha1(f.read()).digest())
+        else:
+            digest.update(b'\0' * 20)
+    return digest.hexdigest()
+
+
+def data_fingerprint(values: Iterable, *paths: str) -> str:
+    """JSON 직렬화 가능한 값(파서 버전, 변환 테이블)과 파일 내용을 합친 해시"""
+    body = json.dumps(list(values), sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    digest = hashlib.sha1(body.encode('utf-8'))
+    digest.update(file_fingerprint(*paths).encode('ascii'))
+    return digest.hexdigest()
+
+
+def is_past_race(date_next_race: str) -> bool:
+    """dateNextRace가 오늘 이전이면 True (parse_marathon과 같은 기준)"""
+    if not date_next_race:
+        return False
+    try:
+        return datetime.fromisoformat(date_next_race).date() < datetime.now().date()
+    except (ValueError, TypeError):
+        return False
+
+
+class RecordDelta:
+    """이전 실행의 {id: 해시}와 파싱 결과를 들고 있다가 변경분만 골라냄"""
+
+    def __init__(self, hashes_path: str = 'data/marathons_global_hashes.json',
+                 parsed_path: str = 'data/marathons_global.json',
+                 fingerprint: str = '', incremental: bool = True):
+        """
+        Args:
+            hashes_path: {id: 해시} 저장 파일
+            parsed_path: 이전 실행의 파싱 결과 (재사용 원본, .json 또는 .jsonl)
+            fingerprint: 파서/보조 데이터 지문 — 이전 실행과 다르면 전체 재처리
+            incremental: False면 이전 결과를 무시하고 전체 재처리 (해시는 새로 저장)
+        """
+        self.hashes_path = hashes_path
+        self.parsed_path = parsed_path
+        self.fingerprint = fingerprint
+        self.previous_hashes: Dict[str, str] = {}
+        self.previous_parsed: Dict[str, Marathon] = {}  # 재사용 후보 (메모리 절약형 레코드)
+        self.hashes: Dict[str, str] = {}
+        self.stats = {'new': 0, 'changed': 0, 'unchanged': 0, 'expired': 0}
+        if incremental:
+            self._load()
+
+    def _load(self):
+        if not (os.path.exists(self.hashes_path) and os.path.exists(self.parsed_path)):
+            return
+        try:
+            with open(self.hashes_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('fingerprint') != self.fingerprint:
+                return  # 파서 코드나 visa.json이 바뀜 → 전부 재처리
+            # 이전 결과는 스트리밍으로 읽으며 바로 메모리 절약형 레코드로 변환
+            previous_parsed = {m.get('id'): Marathon.from_parsed(m)
+                               for m in iter_records(self.parsed_path, 'marathons')}
+        except (OSError, ValueError):
+            return
+        self.previous_hashes = saved.get('hashes', {})
+        self.previous_parsed = previous_parsed
+
+    def split(self, raw_marathons: Iterable[Dict],
+              known_city: Optional[Callable[[str], Optional[str]]] = None) -> Tuple[List[Dict], List[Marathon]]:
+        """
+        원본 레코드를 (처리 필요 원본, 재사용 파싱 결과)로 분리
+
+        Args:
+            raw_marathons: 이번 실행의 원본 레코드
+            known_city: 영문 도시명 → 파서가 지금 낼 한글 도시명 (사전 → 번역 캐시, 모르면 None)
+                — 이전 결과의 도시명과 다르면 (이전엔 번역 실패 등) 다시 처리
+
+        Returns:
+            (changed_raw, reused_parsed) — 둘 다 입력 순서 유지
+        """
+        changed, reused = [], []
+        for raw in raw_marathons:
+            marathon_id = raw.get('id', '')
+            digest = content_hash(raw)
+            self.hashes[marathon_id] = digest
+
+            previous = self.previous_hashes.get(marathon_id)
+            if previous is None:
+                self.stats['new'] += 1
+                changed.append(raw)
+                continue
+            if previous != digest:
+                self.stats['changed'] += 1
+                changed.append(raw)
+                continue
+
+            parsed = self.previous_parsed.get(marathon_id)
+            if parsed is None:
+                # 같은 내용인데 이전 결과에 없음 → 지난 대회로 제외된 것, 다시 파싱해도 동일
+                self.stats['unchanged'] += 1
+                continue
+            city = raw.get('city', '')
+            if city and known_city is not None and known_city(city) != parsed.get('city'):
+                self.stats['changed'] += 1
+                changed.append(raw)
+                continue
+            self.stats['unchanged'] += 1
+            if is_past_race(parsed.get('dateNextRace', '')):
+                self.stats['expired'] += 1
+                continue
+            reused.append(parsed)
+        return changed, reused
+
+    def save(self):
+        """이번 실행의 {id: 해시} 저장 (파싱 결과 저장 후 호출)"""
+        with atomic_open(self.hashes_path) as f:
+            json.dump({'fingerprint': self.fingerprint, 'hashes': self.hashes}, f)
+
+
+def merge_in_order(raw_marathons: Iterable[Dict], *parsed_groups: List[Dict]) -> List[Dict]:
+    """여러 파싱 결과 묶음을 원본 순서대로 합침"""
+    by_id = {}
+    for group in parsed_groups:
+        for parsed in group:
+            by_id[parsed.get('id')] = parsed
+    merged = []
+    for raw in raw_marathons:
+        parsed = by_id.pop(raw.get('id', ''), None)
+        if parsed is not None:
+            merged.append(parsed)
+    return merged
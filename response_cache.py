@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+HTTP 응답 디스크 캐시 (SQLite, 본문 zlib 압축)
+
+- 키: URL + 정규화된 params (정렬된 JSON)
+- TTL 이내: 네트워크 요청 없이 캐시 반환
+- TTL 경과: ETag / Last-Modified가 있으면 조건부 요청 (304면 캐시 재사용)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    """캐시된 응답 한 건"""
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class ResponseCache:
+    """params 기반 HTTP 응답 캐시 (thread-safe)"""
+
+    def __init__(self, path: str = 'data/http_cache.sqlite', ttl_seconds: float = 6 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.stats = {'hits': 0, 'revalidated': 0, 'stored': 0}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, url TEXT, params TEXT, body BLOB,"
+            " etag TEXT, last_modified TEXT, fetched_at REAL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def normalize_params(params: Optional[Dict]) -> str:
+        """params를 키 순서/타입에 무관한 문자열로 정규화"""
+        return json.dumps({str(k): str(v) for k, v in (params or {}).items()},
+                          sort_keys=True, ensure_ascii=False)
+
+    @classmethod
+    def make_key(cls, url: str, params: Optional[Dict]) -> str:
+        """URL + 정규화 params의 SHA-256"""
+        return hashlib.sha256(f"{url}?{cls.normalize_params(params)}".encode('utf-8')).hexdigest()
+
+    def get(self, url: str, params: Optional[Dict]) -> Optional[CachedResponse]:
+        """캐시 항목 조회 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?",
+                (self.make_key(url, params),)
+            ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, fetched_at = row
+        return CachedResponse(zlib.decompress(body), etag, last_modified, fetched_at)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """TTL 이내인지 확인"""
+        return time.time() - entry.fetched_at < self.ttl_seconds
+
+    def get_fresh(self, url: str, params: Optional[Dict]) -> Optional[CachedResponse]:
+        """TTL 이내 캐시 항목만 반환 (적중 횟수 집계)"""
+        entry = self.get(url, params)
+        if entry is None or not self.is_fresh(entry):
+            return None
+        with self._lock:
+            self.stats['hits'] += 1
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedResponse]) -> Dict[str, str]:
+        """재검증용 If-None-Match / If-Modified-Since 헤더"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def put(self, url: str, params: Optional[Dict], body: bytes,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """응답 본문 저장 (압축)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.make_key(url, params), url, self.normalize_params(params),
+                 zlib.compress(body, 6), etag, last_modified, time.time())
+            )
+            self._conn.commit()
+            self.stats['stored'] += 1
+
+    def touch(self, url: str, params: Optional[Dict]):
+        """304 Not Modified 수신 시 저장 시각만 갱신"""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?",
+                               (time.time(), self.make_key(url, params)))
+            self._conn.commit()
+            self.stats['revalidated'] += 1
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+해외 대회 데이터 샤드 내보내기 (대륙 × 대회 월)
+
+marathons_global.json 전체 대신 필요한 부분만 받을 수 있도록
+continent(get_continent_kr 한글 대륙명)와 대회 월(dateNextRace 기준)로 나눈 샤드 파일과
+manifest.json(샤드별 레코드 수 / 바이트 크기 / sha256)을 만든다.
+
+    data/shards/manifest.json
+    data/shards/asia/2027-04.json      # {"metadata": {"continent": "아시아", "month": "2027-04", "count": N}, "marathons": [...]}
+
+- 샤드 파일에는 실행 시각을 넣지 않음 → 내용이 같으면 해시도 같아 클라이언트가 다운로드를 건너뛸 수 있음
+- 해시가 이전 manifest와 같은 샤드는 다시 쓰지 않고, 더 이상 없는 샤드(지난 달 등)는 삭제
+- 모든 파일은 임시 파일 → rename, manifest는 샤드를 모두 쓴 뒤 마지막에 교체
+
+    python shard_export.py                                  # data/marathons_global.json → data/shards
+    python shard_export.py data/marathons_global.jsonl --output data/shards
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from dataset_io import atomic_open, iter_records
+
+MANIFEST_NAME = 'manifest.json'
+
+# 한글 대륙명 → 샤드 디렉터리명
+CONTINENT_SLUGS = {
+    '유럽': 'europe',
+    '북미': 'north-america',
+    '아시아': 'asia',
+    '아프리카': 'africa',
+    '남미': 'south-america',
+    '오세아니아': 'oceania',
+    '남극': 'antarctica',
+}
+UNKNOWN = 'unknown'  # 대륙을 모르는 국가 / 날짜 없는 대회
+
+_MONTH = re.compile(r'^(\d{4}-\d{2})')
+
+
+def shard_key(record: Dict) -> Tuple[str, str]:
+    """레코드 → (한글 대륙명, 'YYYY-MM') — 모르면 ''/'unknown'"""
+    match = _MONTH.match(record.get('dateNextRace') or '')
+    return record.get('continent') or '', match.group(1) if match else UNKNOWN
+
+
+def shard_path(continent: str, month: str) -> str:
+    """샤드 상대 경로 (manifest의 path)"""
+    return f"{CONTINENT_SLUGS.get(continent, UNKNOWN)}/{month}.json"
+
+
+def _encode_shard(continent: str, month: str, records: List[Dict], compact: bool) -> bytes:
+    """샤드 파일 내용 (write_json_array와 같은 형태, 실행마다 같은 바이트)"""
+    document = {'metadata': {'continent': continent, 'month': month, 'count': len(records)},
+                'marathons': records}
+    if compact:
+        text = json.dumps(document, ensure_ascii=False, separators=(',', ':'))
+    else:
+        text = json.dumps(document, ensure_ascii=False, indent=2)
+    return text.encode('utf-8')
+
+
+def load_manifest(output_dir: str) -> Dict:
+    """이전 manifest (없거나 깨졌으면 빈 dict)"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def export_shards(marathons: Iterable, output_dir: str = 'data/shards',
+                  fetched_at: str = '', compact: bool = False) -> Dict:
+    """
+    대륙 × 월 샤드와 manifest 저장 → manifest dict
+
+    Args:
+        marathons: 파싱된 레코드 (dict 또는 to_dict()가 있는 Marathon)
+        output_dir: 샤드 디렉터리
+        fetched_at: 원본 수집 시각 (manifest에 기록)
+        compact: 들여쓰기 없이 저장
+    """
+    groups: Dict[Tuple[str, str], List[Dict]] = {}
+    for marathon in marathons:
+        record = marathon.to_dict() if hasattr(marathon, 'to_dict') else marathon
+        groups.setdefault(shard_key(record), []).append(record)
+
+    previous = {shard['path']: shard for shard in load_manifest(output_dir).get('shards', [])}
+    shards = []
+    stats = {'written': 0, 'unchanged': 0, 'removed': 0}
+    for (continent, month), records in sorted(groups.items(), key=lambda item: shard_path(*item[0])):
+        path = shard_path(continent, month)
+        body = _encode_shard(continent, month, records, compact)
+        digest = hashlib.sha256(body).hexdigest()
+        full_path = os.path.join(output_dir, path)
+        old = previous.pop(path, None)
+        if old and old.get('sha256') == digest and os.path.exists(full_path):
+            stats['unchanged'] += 1
+        else:
+            with atomic_open(full_path, 'wb') as f:
+                f.write(body)
+            stats['written'] += 1
+        shards.append({'continent': continent, 'month': month, 'path': path,
+                       'count': len(records), 'bytes': len(body), 'sha256': digest})
+
+    manifest = {
+        'generated_at': datetime.now().isoformat(),
+        'fetched_at': fetched_at,
+        'total_count': sum(shard['count'] for shard in shards),
+        'shards': shards,
+    }
+    with atomic_open(os.path.join(output_dir, MANIFEST_NAME)) as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # 이번 실행에 없는 샤드 삭제 (manifest 교체 후 → 클라이언트는 항상 존재하는 샤드만 봄)
+    for path in previous:
+        try:
+            os.remove(os.path.join(output_dir, path))
+            stats['removed'] += 1
+        except FileNotFoundError:
+            pass
+    manifest['stats'] = stats
+    return manifest
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='해외 대회 데이터 대륙 × 월 샤드 내보내기')
+    arg_parser.add_argument('source', nargs='?', default='data/marathons_global.json',
+                            help='파싱된 데이터 (.json 또는 .jsonl, 기본 data/marathons_global.json)')
+    arg_parser.add_argument('--output', default='data/shards', help='샤드 디렉터리 (기본 data/shards)')
+    arg_parser.add_argument('--compact', action='store_true', help='들여쓰기 없이 저장')
+    args = arg_parser.parse_args()
+
+    manifest = export_shards(iter_records(args.source, 'marathons'), args.output, compact=args.compact,
+                             fetched_at=datetime.fromtimestamp(os.path.getmtime(args.source)).isoformat())
+    stats = manifest['stats']
+    print(f"✅ {args.output}/{MANIFEST_NAME}: 샤드 {len(manifest['shards'])}개, {manifest['total_count']}개 대회 "
+          f"(새로 씀 {stats['written']}개 | 변경 없음 {stats['unchanged']}개 | 삭제 {stats['removed']}개)")
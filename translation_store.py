@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+번역 결과 영구 저장소 (SQLite)
+
+- translations: 번역 성공 결과 (원문 → 번역문)
+- failures: API 오류/타임아웃 기록 (번역 결과로 저장하지 않음 → 다음 실행에서 재시도)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict
+
+
+class TranslationStore:
+    """번역 결과 write-through 저장소 (thread-safe)"""
+
+    def __init__(self, path: str = 'data/translations.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " source TEXT PRIMARY KEY, translated TEXT NOT NULL, updated_at REAL);"
+            "CREATE TABLE IF NOT EXISTS failures ("
+            " source TEXT PRIMARY KEY, error TEXT, attempts INTEGER NOT NULL DEFAULT 0,"
+            " last_failed_at REAL);"
+        )
+        self._conn.commit()
+
+    def load_all(self) -> Dict[str, str]:
+        """저장된 번역 전체 로드"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT source, translated FROM translations"))
+
+    def save(self, source: str, translated: str):
+        """번역 성공 결과 저장 (이전 실패 기록은 삭제)"""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO translations VALUES (?, ?, ?)",
+                               (source, translated, time.time()))
+            self._conn.execute("DELETE FROM failures WHERE source = ?", (source,))
+            self._conn.commit()
+
+    def record_failure(self, source: str, error: str):
+        """번역 실패 기록 (시도 횟수 누적)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO failures (source, error, attempts, last_failed_at) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT(source) DO UPDATE SET error = excluded.error,"
+                " attempts = attempts + 1, last_failed_at = excluded.last_failed_at",
+                (source, error, time.time())
+            )
+            self._conn.commit()
+
+    def failure_count(self) -> int:
+        """현재 실패 상태로 남아있는 원문 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM failures").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()